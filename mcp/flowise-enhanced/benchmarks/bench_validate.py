@@ -0,0 +1,95 @@
+"""Benchmark validate_workflow_local on synthetic graphs.
+
+Builds chatflow-shaped graphs where every node feeds a list anchor and a
+single anchor of later nodes, then times validation at increasing sizes.
+Time per element (node or edge) should stay roughly flat if validation
+scales linearly; expect a modest step once the indexes outgrow CPU caches.
+
+Usage (from mcp/flowise-enhanced; the package does not need to be installed):
+    python benchmarks/bench_validate.py [--sizes 100 1000 10000] [--repeat 5]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+# Run against the source tree next to this script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_flowise_enhanced.validators import validate_workflow_local
+
+
+def synthetic_workflow(node_count: int, seed: int = 0) -> dict[str, Any]:
+    """Build an acyclic, connected chatflow-shaped graph with ~2 edges per node."""
+    rng = random.Random(seed)
+    nodes = []
+    edges = []
+
+    for i in range(node_count):
+        node_id = f"node_{i}"
+        nodes.append({
+            "id": node_id,
+            "type": "customNode",
+            "position": {"x": i * 10, "y": 0},
+            "data": {
+                "id": node_id,
+                "name": "synthetic",
+                "inputAnchors": [
+                    {"id": f"{node_id}-input-tools-Tool", "name": "tools", "list": True},
+                    {"id": f"{node_id}-input-model-BaseChatModel", "name": "model"},
+                ],
+                "inputParams": [],
+                "outputAnchors": [{"id": f"{node_id}-output-synthetic-Tool"}],
+            },
+        })
+
+    # Edges only point forward (lower to higher index), so the graph is a DAG
+    for i in range(1, node_count):
+        target = f"node_{i}"
+        sources = {i - 1} | {rng.randrange(i) for _ in range(2)}
+        for j, source_index in enumerate(sorted(sources)):
+            source = f"node_{source_index}"
+            anchor = "model-BaseChatModel" if j == 0 else "tools-Tool"
+            edges.append({
+                "id": f"{source}-{target}-{j}",
+                "source": source,
+                "sourceHandle": f"{source}-output-synthetic-Tool",
+                "target": target,
+                "targetHandle": f"{target}-input-{anchor}",
+            })
+
+    return {"nodes": nodes, "edges": edges}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 10000, 20000, 40000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} {'edges':>8} {'best ms':>10} {'us/elem':>10}  valid")
+    for size in args.sizes:
+        workflow = synthetic_workflow(size)
+        elements = size + len(workflow["edges"])
+        # Keep the collector from repeatedly traversing the synthetic input
+        gc.collect()
+        gc.freeze()
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = validate_workflow_local(workflow)
+            timings.append(time.perf_counter() - started)
+        gc.unfreeze()
+        best = min(timings)
+        print(
+            f"{size:>8} {len(workflow['edges']):>8} {best * 1000:>10.2f} "
+            f"{best / elements * 1e6:>10.2f}  {result.valid}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
 """Flowise API client module."""
 
-from .client import FlowiseClient
+from .async_client import AsyncFlowiseClient
+from .cache import CacheConfig, ResponseCache
+from .client import FlowiseClient, PoolConfig
+from .resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
 
-__all__ = ["FlowiseClient"]
+__all__ = [
+    "AsyncFlowiseClient",
+    "CacheConfig",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "FlowiseClient",
+    "PoolConfig",
+    "ResponseCache",
+    "RetryPolicy",
+]
@@ -0,0 +1,430 @@
+"""Asyncio Flowise API client for use inside the MCP event loop."""
+
+import asyncio
+import json
+import os
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from ..converters.stream import (
+    DEFAULT_CHUNK_BYTES,
+    DEFAULT_CHUNK_ITEMS,
+    chunk_exportdata,
+    iter_exportdata,
+    iter_exportdata_dict,
+)
+from .client import PoolConfig
+from .cache import CacheConfig, ResponseCache
+from .resilience import CircuitBreaker, Resilience, RetryPolicy
+from .streaming import events_from_response, parse_sse_line
+
+
+class AsyncFlowiseClient:
+    """Async counterpart of FlowiseClient backed by a pooled httpx.AsyncClient.
+
+    Exposes the same method surface as FlowiseClient, but every call is a
+    coroutine so concurrent MCP tool calls overlap their network waits.
+    Retries and circuit breaking follow the same policy as FlowiseClient.
+    """
+
+    def __init__(
+        self,
+        endpoint: str | None = None,
+        api_key: str | None = None,
+        pool: PoolConfig | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        cache: CacheConfig | None = None,
+    ):
+        """Initialize async Flowise client.
+
+        Args:
+            endpoint: Flowise API endpoint URL (defaults to FLOWISE_API_ENDPOINT env)
+            api_key: Flowise API key (defaults to FLOWISE_API_KEY env)
+            pool: Connection pool settings (defaults to FLOWISE_POOL_* env)
+            retry: Retry and timeout settings (defaults to FLOWISE_RETRY_* env)
+            breaker: Circuit breaker (defaults to FLOWISE_CIRCUIT_* env)
+            cache: Response cache settings (defaults to FLOWISE_CACHE* env)
+        """
+        self.endpoint = (endpoint or os.environ.get("FLOWISE_API_ENDPOINT", "")).rstrip("/")
+        self.api_key = api_key or os.environ.get("FLOWISE_API_KEY", "")
+        self.pool = pool or PoolConfig.from_env()
+        self.resilience = Resilience(retry, breaker)
+        self.cache = ResponseCache(cache)
+
+        if not self.endpoint:
+            raise ValueError("FLOWISE_API_ENDPOINT must be set")
+
+        self._http = self._create_http_client()
+
+    def _headers(self) -> dict[str, str]:
+        """Get request headers with authentication."""
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Create a pooled httpx client with auth headers preset."""
+        limits = httpx.Limits(
+            max_connections=self.pool.pool_connections * self.pool.pool_maxsize,
+            max_keepalive_connections=self.pool.pool_maxsize if self.pool.keep_alive else 0,
+            keepalive_expiry=self.pool.keepalive_expiry,
+        )
+        return httpx.AsyncClient(
+            base_url=self.endpoint,
+            headers=self._headers(),
+            limits=limits,
+            timeout=httpx.Timeout(
+                self.resilience.policy.read_timeout,
+                connect=self.resilience.policy.connect_timeout,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncFlowiseClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request with retries and circuit breaking.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            path: API path (relative to endpoint)
+            stream: Leave the body unread and wait up to the stream read
+                   timeout between chunks instead of the read timeout; the
+                   caller must close the response
+            **kwargs: Passed to httpx (json, params, headers)
+
+        Returns:
+            Final response, whatever its status
+
+        Raises:
+            CircuitOpenError: If Flowise is known to be down
+            httpx.TransportError: If the last attempt failed to connect
+        """
+        if stream:
+            policy = self.resilience.policy
+            kwargs["timeout"] = httpx.Timeout(
+                policy.read_timeout,
+                connect=policy.connect_timeout,
+                read=policy.stream_read_timeout,
+            )
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self.resilience.before_request()
+            try:
+                request = self._http.build_request(method, path, **kwargs)
+                response = await self._http.send(request, stream=stream)
+            except httpx.TransportError as e:
+                self.resilience.after_error()
+                delay = self.resilience.retry_delay(
+                    method, attempt,
+                    connect_error=isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)),
+                )
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            self.resilience.after_response(response.status_code)
+            delay = self.resilience.retry_delay(
+                method, attempt, status=response.status_code,
+                retry_after=response.headers.get("Retry-After"),
+            ) if response.status_code >= 400 else None
+            if delay is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        data: dict | None = None,
+        params: dict | None = None,
+    ) -> dict[str, Any]:
+        """Make HTTP request to Flowise API.
+
+        GETs of chatflows and tools are served from the response cache
+        while fresh and revalidated with their ETag afterwards; writes drop
+        the cache entries they affect.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            path: API path (will be joined with endpoint)
+            data: Request body data
+            params: Query parameters
+
+        Returns:
+            JSON response as dict
+
+        Raises:
+            httpx.HTTPStatusError: If request fails
+            CircuitOpenError: If Flowise is known to be down
+        """
+        key = self.cache.key(method, path, params)
+        entry, headers = None, None
+        if key is not None:
+            entry, fresh = self.cache.lookup(key)
+            if fresh:
+                return entry.value()
+            if entry is not None and entry.etag:
+                headers = {"If-None-Match": entry.etag}
+
+        try:
+            response = await self._send(method, path, json=data, params=params, headers=headers)
+        finally:
+            # A failed write may still have been applied
+            self.cache.invalidate(method, path)
+        if response.status_code == 304 and entry is not None:
+            return self.cache.revalidated(key, entry)
+        response.raise_for_status()
+
+        if key is not None:
+            self.cache.store(key, response.content, response.headers.get("ETag"))
+
+        if response.content:
+            return response.json()
+        return {}
+
+    # Chatflow operations
+
+    async def list_chatflows(self) -> list[dict[str, Any]]:
+        """List all chatflows."""
+        return await self._request("GET", "/api/v1/chatflows")
+
+    async def get_chatflow(self, chatflow_id: str) -> dict[str, Any]:
+        """Get chatflow by ID."""
+        return await self._request("GET", f"/api/v1/chatflows/{chatflow_id}")
+
+    async def get_chatflow_if_changed(
+        self, chatflow_id: str, etag: str | None = None
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """Conditionally fetch a chatflow; (None, etag) on 304 Not Modified."""
+        headers = {"If-None-Match": etag} if etag else None
+        response = await self._send("GET", f"/api/v1/chatflows/{chatflow_id}", headers=headers)
+        if response.status_code == 304:
+            return None, etag
+        response.raise_for_status()
+        return response.json(), response.headers.get("ETag")
+
+    async def create_chatflow(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Create a new chatflow."""
+        return await self._request("POST", "/api/v1/chatflows", data=data)
+
+    async def update_chatflow(self, chatflow_id: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Update an existing chatflow."""
+        return await self._request("PUT", f"/api/v1/chatflows/{chatflow_id}", data=data)
+
+    async def delete_chatflow(self, chatflow_id: str) -> dict[str, Any]:
+        """Delete a chatflow."""
+        return await self._request("DELETE", f"/api/v1/chatflows/{chatflow_id}")
+
+    # Validation
+
+    async def validate_chatflow(self, chatflow_id: str) -> list[dict[str, Any]]:
+        """Run server-side validation on a saved chatflow."""
+        return await self._request("GET", f"/api/v1/validation/{chatflow_id}")
+
+    # Import/Export
+
+    async def import_data(self, exportdata: dict[str, Any]) -> dict[str, Any]:
+        """Import ExportData format (15-array structure)."""
+        return await self._request("POST", "/api/v1/export-import/import", data=exportdata)
+
+    async def import_data_chunked(
+        self,
+        source: str | dict[str, Any],
+        max_bytes: int = DEFAULT_CHUNK_BYTES,
+        max_items: int = DEFAULT_CHUNK_ITEMS,
+    ) -> dict[str, Any]:
+        """Import a large ExportData as several smaller import requests.
+
+        File parsing runs in a worker thread between requests, so the
+        event loop is not blocked while the next chunk is decoded.
+
+        Args:
+            source: Path to an ExportData JSON file, or an ExportData dict
+            max_bytes: Approximate maximum encoded size per request
+            max_items: Maximum items per request
+
+        Returns:
+            Dict with chunks sent, items per array, and per-chunk API responses
+        """
+        counts: dict[str, int] = {}
+        responses = []
+
+        f = None if isinstance(source, dict) else open(source, encoding="utf-8-sig")
+        try:
+            items = iter_exportdata_dict(source) if f is None else iter_exportdata(f)
+            chunks = chunk_exportdata(items, max_bytes=max_bytes, max_items=max_items)
+            while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                responses.append(await self.import_data(chunk))
+                for name, chunk_items in chunk.items():
+                    if chunk_items:
+                        counts[name] = counts.get(name, 0) + len(chunk_items)
+        finally:
+            if f is not None:
+                f.close()
+
+        return {"chunks": len(responses), "counts": counts, "responses": responses}
+
+    async def export_data(self) -> dict[str, Any]:
+        """Export all workspace data in ExportData format."""
+        return await self._request("POST", "/api/v1/export-import/export")
+
+    async def export_data_to_file(self, path: str) -> int:
+        """Stream a workspace export straight to disk.
+
+        File opens, writes and closes run in a worker thread so a slow disk
+        never stalls the event loop.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Number of bytes written
+        """
+        written = 0
+        response = await self._send("POST", "/api/v1/export-import/export", stream=True)
+        try:
+            response.raise_for_status()
+            f = await asyncio.to_thread(open, path, "wb")
+            try:
+                async for chunk in response.aiter_bytes(1 << 16):
+                    await asyncio.to_thread(f.write, chunk)
+                    written += len(chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+        finally:
+            await response.aclose()
+        return written
+
+    # Tools
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        """List all custom tools."""
+        return await self._request("GET", "/api/v1/tools")
+
+    async def get_tool(self, tool_id: str) -> dict[str, Any]:
+        """Get tool by ID."""
+        return await self._request("GET", f"/api/v1/tools/{tool_id}")
+
+    async def create_tool(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Create a custom tool."""
+        return await self._request("POST", "/api/v1/tools", data=data)
+
+    async def update_tool(self, tool_id: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Update an existing custom tool."""
+        return await self._request("PUT", f"/api/v1/tools/{tool_id}", data=data)
+
+    # Server info
+
+    async def get_version(self) -> dict[str, Any]:
+        """Get the Flowise server version (e.g. {"version": "2.2.0"})."""
+        return await self._request("GET", "/api/v1/version")
+
+    # Node schemas
+
+    async def list_nodes(self) -> list[dict[str, Any]]:
+        """List all available node types with their schemas."""
+        return await self._request("GET", "/api/v1/nodes")
+
+    async def get_node(self, name: str) -> dict[str, Any]:
+        """Get schema for a specific node type."""
+        return await self._request("GET", f"/api/v1/nodes/{name}")
+
+    async def get_nodes_by_category(self, category: str) -> list[dict[str, Any]]:
+        """Get all nodes in a specific category."""
+        return await self._request("GET", f"/api/v1/nodes/category/{category}")
+
+    # Predictions
+
+    async def create_prediction(
+        self,
+        chatflow_id: str,
+        question: str,
+        overrides: dict[str, Any] | None = None,
+        history: list[dict[str, str]] | None = None,
+    ) -> dict[str, Any]:
+        """Send a question to a chatflow and get a prediction.
+
+        Args:
+            chatflow_id: ID of the chatflow to query
+            question: The question or prompt to send
+            overrides: Optional config overrides (model, temperature, etc.)
+            history: Optional conversation history
+
+        Returns:
+            Prediction response with text and optional sourceDocuments
+        """
+        data: dict[str, Any] = {"question": question}
+        if overrides:
+            data["overrideConfig"] = overrides
+        if history:
+            data["history"] = history
+
+        return await self._request("POST", f"/api/v1/prediction/{chatflow_id}", data=data)
+
+    async def stream_prediction(
+        self,
+        chatflow_id: str,
+        question: str,
+        overrides: dict[str, Any] | None = None,
+        history: list[dict[str, str]] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Send a question with ``streaming: true`` and yield Flowise events.
+
+        Falls back to synthesized events when the chatflow answers with a
+        buffered JSON response instead of an event stream.
+
+        Args:
+            chatflow_id: ID of the chatflow to query
+            question: The question or prompt to send
+            overrides: Optional config overrides (model, temperature, etc.)
+            history: Optional conversation history
+
+        Yields:
+            Event dicts such as {"event": "token", "data": "Hel"}
+        """
+        data: dict[str, Any] = {"question": question, "streaming": True}
+        if overrides:
+            data["overrideConfig"] = overrides
+        if history:
+            data["history"] = history
+
+        response = await self._send(
+            "POST", f"/api/v1/prediction/{chatflow_id}", stream=True, json=data
+        )
+        try:
+            response.raise_for_status()
+
+            if "text/event-stream" not in response.headers.get("content-type", ""):
+                body = await response.aread()
+                for event in events_from_response(json.loads(body)):
+                    yield event
+                return
+
+            async for line in response.aiter_lines():
+                event = parse_sse_line(line)
+                if event is not None:
+                    yield event
+        finally:
+            await response.aclose()
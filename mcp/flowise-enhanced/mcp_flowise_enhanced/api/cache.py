@@ -0,0 +1,154 @@
+"""Read-through response cache for read-only Flowise endpoints.
+
+Chatflow and tool listings/lookups are served from memory for a short
+per-endpoint TTL. Once an entry expires it is revalidated with
+If-None-Match, so an unchanged resource costs a 304 instead of a full body
+and a database query. Any write a client sends (create, update, delete,
+import) drops the entries of the resources it can affect.
+
+Entries keep the raw response body and are decoded on every hit, so
+callers can modify what they get back without corrupting the cache.
+"""
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..config import env_bool, env_float
+
+# Cacheable GET paths and the TTL bucket each belongs to
+_CACHEABLE = re.compile(r"^/api/v1/(chatflows|tools)(/[^/]+)?$")
+_BUCKETS = {("chatflows", False): "chatflows", ("chatflows", True): "chatflow",
+            ("tools", False): "tools", ("tools", True): "tool"}
+
+# Write path prefix -> cached path prefixes it invalidates ("" drops everything)
+_INVALIDATES = {
+    "/api/v1/chatflows": "/api/v1/chatflows",
+    "/api/v1/tools": "/api/v1/tools",
+    "/api/v1/export-import/import": "",
+}
+
+DEFAULT_TTLS = {"chatflows": 10.0, "chatflow": 10.0, "tools": 30.0, "tool": 30.0}
+
+
+@dataclass
+class CacheConfig:
+    """Response cache settings.
+
+    Attributes:
+        enabled: Cache read-only endpoints at all
+        ttls: Seconds an entry is served without revalidation, per bucket
+            ('chatflows', 'chatflow', 'tools', 'tool'); 0 revalidates
+            every time
+    """
+
+    enabled: bool = True
+    ttls: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_TTLS))
+
+    @classmethod
+    def from_env(cls) -> "CacheConfig":
+        """Build settings from FLOWISE_CACHE and FLOWISE_CACHE_TTL[_<BUCKET>] variables."""
+        default = env_float("FLOWISE_CACHE_TTL", -1.0)
+        ttls = {
+            bucket: env_float(
+                f"FLOWISE_CACHE_TTL_{bucket.upper()}", default if default >= 0 else ttl
+            )
+            for bucket, ttl in DEFAULT_TTLS.items()
+        }
+        return cls(enabled=env_bool("FLOWISE_CACHE", True), ttls=ttls)
+
+
+@dataclass
+class CacheEntry:
+    """Cached response body with its validator."""
+
+    body: bytes
+    etag: str | None
+    expires: float
+
+    def value(self) -> Any:
+        """Decode a fresh copy of the cached JSON."""
+        return json.loads(self.body) if self.body else {}
+
+
+class ResponseCache:
+    """Thread-safe cache of GET responses keyed by API path."""
+
+    def __init__(self, config: CacheConfig | None = None):
+        """Initialize the cache.
+
+        Args:
+            config: Cache settings (defaults to FLOWISE_CACHE* env)
+        """
+        self.config = config or CacheConfig.from_env()
+        self._entries: dict[str, CacheEntry] = {}
+        self._counters = {"hits": 0, "revalidated": 0, "misses": 0, "invalidated": 0}
+        self._lock = threading.Lock()
+
+    def key(self, method: str, path: str, params: dict | None = None) -> str | None:
+        """Cache key for a request, or None if it is not cacheable."""
+        if not self.config.enabled or method != "GET" or params:
+            return None
+        return path if _CACHEABLE.match(path) else None
+
+    def _ttl(self, key: str) -> float:
+        match = _CACHEABLE.match(key)
+        return self.config.ttls.get(_BUCKETS[(match.group(1), bool(match.group(2)))], 0.0)
+
+    def lookup(self, key: str) -> tuple[CacheEntry | None, bool]:
+        """Find an entry.
+
+        Returns:
+            (entry, fresh): fresh entries are served directly; stale ones
+            are revalidated with their ETag
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = entry is not None and entry.expires > time.monotonic()
+            if fresh:
+                self._counters["hits"] += 1
+            return entry, fresh
+
+    def store(self, key: str, body: bytes, etag: str | None) -> None:
+        """Store a 200 response body."""
+        with self._lock:
+            self._counters["misses"] += 1
+            self._entries[key] = CacheEntry(body, etag, time.monotonic() + self._ttl(key))
+
+    def revalidated(self, key: str, entry: CacheEntry) -> Any:
+        """Extend an entry after a 304 and return its value."""
+        with self._lock:
+            self._counters["revalidated"] += 1
+            entry.expires = time.monotonic() + self._ttl(key)
+        return entry.value()
+
+    def invalidate(self, method: str, path: str) -> None:
+        """Drop entries a write request may have changed."""
+        if method == "GET":
+            return
+        for write_prefix, cached_prefix in _INVALIDATES.items():
+            if path.startswith(write_prefix):
+                with self._lock:
+                    stale = [k for k in self._entries if k.startswith(cached_prefix)]
+                    for k in stale:
+                        del self._entries[k]
+                    self._counters["invalidated"] += len(stale)
+                return
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        """Counters, entry count and TTLs."""
+        with self._lock:
+            return {
+                "enabled": self.config.enabled,
+                **self._counters,
+                "entries": len(self._entries),
+                "ttls": dict(self.config.ttls),
+            }
@@ -1,32 +1,118 @@
 """Flowise API client for interacting with Flowise REST endpoints."""
 
-import json
 import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import env_bool, env_float, env_int
+from ..converters.stream import (
+    DEFAULT_CHUNK_BYTES,
+    DEFAULT_CHUNK_ITEMS,
+    chunk_exportdata,
+    iter_exportdata,
+    iter_exportdata_dict,
+)
+from .cache import CacheConfig, ResponseCache
+from .resilience import CircuitBreaker, Resilience, RetryPolicy
+from .streaming import events_from_response, parse_sse_line
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings for Flowise HTTP clients.
+
+    Attributes:
+        pool_connections: Number of per-host pools to keep
+        pool_maxsize: Maximum connections kept open per host
+        keep_alive: Reuse connections between requests
+        keepalive_expiry: Seconds an idle connection stays in the pool
+            (honoured by transports that support idle expiry)
+    """
+
+    pool_connections: int = 4
+    pool_maxsize: int = 10
+    keep_alive: bool = True
+    keepalive_expiry: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """Build pool settings from FLOWISE_POOL_* environment variables."""
+        return cls(
+            pool_connections=env_int("FLOWISE_POOL_CONNECTIONS", cls.pool_connections),
+            pool_maxsize=env_int("FLOWISE_POOL_MAXSIZE", cls.pool_maxsize),
+            keep_alive=env_bool("FLOWISE_KEEP_ALIVE", cls.keep_alive),
+            keepalive_expiry=env_float("FLOWISE_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+        )
 
 
 class FlowiseClient:
-    """Client for Flowise REST API operations."""
+    """Client for Flowise REST API operations.
+
+    Requests go through a persistent ``requests.Session`` so TCP/TLS
+    connections are reused across calls. Create one client and share it.
+    Transient failures are retried and a circuit breaker fails fast while
+    Flowise is down (see api.resilience).
+    """
 
     def __init__(
         self,
         endpoint: str | None = None,
         api_key: str | None = None,
+        pool: PoolConfig | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        cache: CacheConfig | None = None,
     ):
         """Initialize Flowise client.
 
         Args:
             endpoint: Flowise API endpoint URL (defaults to FLOWISE_API_ENDPOINT env)
             api_key: Flowise API key (defaults to FLOWISE_API_KEY env)
+            pool: Connection pool settings (defaults to FLOWISE_POOL_* env)
+            retry: Retry and timeout settings (defaults to FLOWISE_RETRY_* env)
+            breaker: Circuit breaker (defaults to FLOWISE_CIRCUIT_* env)
+            cache: Response cache settings (defaults to FLOWISE_CACHE* env)
         """
         self.endpoint = (endpoint or os.environ.get("FLOWISE_API_ENDPOINT", "")).rstrip("/")
         self.api_key = api_key or os.environ.get("FLOWISE_API_KEY", "")
+        self.pool = pool or PoolConfig.from_env()
+        self.resilience = Resilience(retry, breaker)
+        self.cache = ResponseCache(cache)
 
         if not self.endpoint:
             raise ValueError("FLOWISE_API_ENDPOINT must be set")
 
+        self._session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """Create a pooled session with auth headers preset."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool.pool_connections,
+            pool_maxsize=self.pool.pool_maxsize,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self._headers())
+        if not self.pool.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "FlowiseClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _headers(self) -> dict[str, str]:
         """Get request headers with authentication."""
         headers = {"Content-Type": "application/json"}
@@ -34,6 +120,63 @@ class FlowiseClient:
             headers["Authorization"] = f"Bearer {self.api_key}"
         return headers
 
+    def _send(
+        self,
+        method: str,
+        path: str,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request with retries and circuit breaking.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            path: API path (will be joined with endpoint)
+            stream: Stream the response body (stream read timeout between chunks)
+            **kwargs: Passed to requests (json, params, headers)
+
+        Returns:
+            Final response, whatever its status
+
+        Raises:
+            CircuitOpenError: If Flowise is known to be down
+            requests.RequestException: If the last attempt failed to connect
+        """
+        policy = self.resilience.policy
+        timeout = (
+            policy.connect_timeout,
+            policy.stream_read_timeout if stream else policy.read_timeout,
+        )
+        url = f"{self.endpoint}{path}"
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self.resilience.before_request()
+            try:
+                response = self._session.request(
+                    method=method, url=url, stream=stream, timeout=timeout, **kwargs
+                )
+            except requests.RequestException as e:
+                self.resilience.after_error()
+                delay = self.resilience.retry_delay(
+                    method, attempt, connect_error=isinstance(e, requests.ConnectTimeout)
+                )
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            self.resilience.after_response(response.status_code)
+            delay = self.resilience.retry_delay(
+                method, attempt, status=response.status_code,
+                retry_after=response.headers.get("Retry-After"),
+            ) if response.status_code >= 400 else None
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+
     def _request(
         self,
         method: str,
@@ -43,6 +186,10 @@ class FlowiseClient:
     ) -> dict[str, Any]:
         """Make HTTP request to Flowise API.
 
+        GETs of chatflows and tools are served from the response cache
+        while fresh and revalidated with their ETag afterwards; writes drop
+        the cache entries they affect.
+
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             path: API path (will be joined with endpoint)
@@ -54,19 +201,29 @@ class FlowiseClient:
 
         Raises:
             requests.HTTPError: If request fails
+            CircuitOpenError: If Flowise is known to be down
         """
-        url = f"{self.endpoint}{path}"
-
-        response = requests.request(
-            method=method,
-            url=url,
-            headers=self._headers(),
-            json=data,
-            params=params,
-            timeout=30,
-        )
+        key = self.cache.key(method, path, params)
+        entry, headers = None, None
+        if key is not None:
+            entry, fresh = self.cache.lookup(key)
+            if fresh:
+                return entry.value()
+            if entry is not None and entry.etag:
+                headers = {"If-None-Match": entry.etag}
+
+        try:
+            response = self._send(method, path, json=data, params=params, headers=headers)
+        finally:
+            # A failed write may still have been applied
+            self.cache.invalidate(method, path)
+        if response.status_code == 304 and entry is not None:
+            return self.cache.revalidated(key, entry)
         response.raise_for_status()
 
+        if key is not None:
+            self.cache.store(key, response.content, response.headers.get("ETag"))
+
         if response.content:
             return response.json()
         return {}
@@ -81,6 +238,26 @@ class FlowiseClient:
         """Get chatflow by ID."""
         return self._request("GET", f"/api/v1/chatflows/{chatflow_id}")
 
+    def get_chatflow_if_changed(
+        self, chatflow_id: str, etag: str | None = None
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """Conditionally fetch a chatflow using If-None-Match.
+
+        Args:
+            chatflow_id: Chatflow ID
+            etag: ETag from a previous fetch
+
+        Returns:
+            (chatflow, etag), or (None, etag) if the server answered
+            304 Not Modified and the cached copy is still current
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        response = self._send("GET", f"/api/v1/chatflows/{chatflow_id}", headers=headers)
+        if response.status_code == 304:
+            return None, etag
+        response.raise_for_status()
+        return response.json(), response.headers.get("ETag")
+
     def create_chatflow(self, data: dict[str, Any]) -> dict[str, Any]:
         """Create a new chatflow.
 
@@ -134,10 +311,69 @@ class FlowiseClient:
         """
         return self._request("POST", "/api/v1/export-import/import", data=exportdata)
 
+    def import_data_chunked(
+        self,
+        source: str | dict[str, Any],
+        max_bytes: int = DEFAULT_CHUNK_BYTES,
+        max_items: int = DEFAULT_CHUNK_ITEMS,
+    ) -> dict[str, Any]:
+        """Import a large ExportData as several smaller import requests.
+
+        Items are streamed from disk and sent in file order, so only one
+        payload is held in memory at a time.
+
+        Args:
+            source: Path to an ExportData JSON file, or an ExportData dict
+            max_bytes: Approximate maximum encoded size per request
+            max_items: Maximum items per request
+
+        Returns:
+            Dict with chunks sent, items per array, and per-chunk API responses
+        """
+        counts: dict[str, int] = {}
+        responses = []
+
+        def import_chunks(items: Iterator[tuple[str, Any]]) -> None:
+            for chunk in chunk_exportdata(items, max_bytes=max_bytes, max_items=max_items):
+                responses.append(self.import_data(chunk))
+                for name, chunk_items in chunk.items():
+                    if chunk_items:
+                        counts[name] = counts.get(name, 0) + len(chunk_items)
+
+        if isinstance(source, dict):
+            import_chunks(iter_exportdata_dict(source))
+        else:
+            with open(source, encoding="utf-8-sig") as f:
+                import_chunks(iter_exportdata(f))
+
+        return {"chunks": len(responses), "counts": counts, "responses": responses}
+
     def export_data(self) -> dict[str, Any]:
         """Export all workspace data in ExportData format."""
         return self._request("POST", "/api/v1/export-import/export")
 
+    def export_data_to_file(self, path: str) -> int:
+        """Stream a workspace export straight to disk.
+
+        The response body is written in chunks and never parsed, so large
+        exports do not need to fit in memory. Read the file back with
+        converters.stream.iter_exportdata.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Number of bytes written
+        """
+        written = 0
+        with self._send("POST", "/api/v1/export-import/export", stream=True) as response:
+            response.raise_for_status()
+            with open(path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1 << 16):
+                    f.write(chunk)
+                    written += len(chunk)
+        return written
+
     # Tools
 
     def list_tools(self) -> list[dict[str, Any]]:
@@ -148,6 +384,35 @@ class FlowiseClient:
         """Get tool by ID."""
         return self._request("GET", f"/api/v1/tools/{tool_id}")
 
+    def create_tool(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Create a custom tool.
+
+        Args:
+            data: Tool data with name, description, schema, func, etc.
+
+        Returns:
+            Created tool with ID
+        """
+        return self._request("POST", "/api/v1/tools", data=data)
+
+    def update_tool(self, tool_id: str, data: dict[str, Any]) -> dict[str, Any]:
+        """Update an existing custom tool.
+
+        Args:
+            tool_id: Tool ID to update
+            data: Updated tool data
+
+        Returns:
+            Updated tool
+        """
+        return self._request("PUT", f"/api/v1/tools/{tool_id}", data=data)
+
+    # Server info
+
+    def get_version(self) -> dict[str, Any]:
+        """Get the Flowise server version (e.g. {"version": "2.2.0"})."""
+        return self._request("GET", "/api/v1/version")
+
     # Node schemas
 
     def list_nodes(self) -> list[dict[str, Any]]:
@@ -207,3 +472,42 @@ class FlowiseClient:
             data["history"] = history
 
         return self._request("POST", f"/api/v1/prediction/{chatflow_id}", data=data)
+
+    def stream_prediction(
+        self,
+        chatflow_id: str,
+        question: str,
+        overrides: dict[str, Any] | None = None,
+        history: list[dict[str, str]] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Send a question with ``streaming: true`` and yield Flowise events.
+
+        Args:
+            chatflow_id: ID of the chatflow to query
+            question: The question or prompt to send
+            overrides: Optional config overrides (model, temperature, etc.)
+            history: Optional conversation history
+
+        Yields:
+            Event dicts such as {"event": "token", "data": "Hel"}
+        """
+        data: dict[str, Any] = {"question": question, "streaming": True}
+        if overrides:
+            data["overrideConfig"] = overrides
+        if history:
+            data["history"] = history
+
+        with self._send(
+            "POST", f"/api/v1/prediction/{chatflow_id}", stream=True, json=data
+        ) as response:
+            response.raise_for_status()
+
+            if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                yield from events_from_response(response.json())
+                return
+
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    event = parse_sse_line(line)
+                    if event is not None:
+                        yield event
@@ -0,0 +1,276 @@
+"""Retry policy and circuit breaker shared by the Flowise clients.
+
+Transient failures (Flowise restarting behind its reverse proxy, a dropped
+connection) are retried with jittered exponential backoff. Only idempotent
+methods are retried after the request may have reached Flowise; POSTs are
+retried only when the connection was never established. A circuit breaker
+stops hammering Flowise while it is down and fails fast instead.
+
+Both clients use the same policy objects; only the transport calls and the
+sleep differ.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from ..config import env_float, env_int
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Statuses worth retrying, and the subset meaning Flowise itself is unreachable
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+UNAVAILABLE_STATUSES = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+@dataclass
+class RetryPolicy:
+    """Retry and timeout settings for Flowise requests.
+
+    Attributes:
+        max_attempts: Attempts per request, including the first
+        backoff_base: Backoff before the first retry, doubled per retry (seconds)
+        backoff_max: Upper bound for a single backoff (seconds)
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait for response data
+        stream_read_timeout: Seconds to wait between chunks of a streamed
+            response; streams have no total deadline
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    stream_read_timeout: float = 300.0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build retry settings from FLOWISE_RETRY_* and FLOWISE_*_TIMEOUT variables."""
+        return cls(
+            max_attempts=env_int("FLOWISE_RETRY_ATTEMPTS", cls.max_attempts),
+            backoff_base=env_float("FLOWISE_RETRY_BACKOFF", cls.backoff_base),
+            backoff_max=env_float("FLOWISE_RETRY_BACKOFF_MAX", cls.backoff_max),
+            connect_timeout=env_float("FLOWISE_CONNECT_TIMEOUT", cls.connect_timeout),
+            read_timeout=env_float("FLOWISE_READ_TIMEOUT", cls.read_timeout),
+            stream_read_timeout=env_float(
+                "FLOWISE_STREAM_READ_TIMEOUT", cls.stream_read_timeout
+            ),
+        )
+
+    def backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to wait before retry number `attempt` (1-based).
+
+        Uses full jitter, so clients retrying after the same outage spread
+        out instead of arriving together. A numeric Retry-After header
+        takes precedence, capped at backoff_max.
+        """
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Closed: requests flow. After `failure_threshold` consecutive failures
+    the circuit opens and requests fail fast for `reset_timeout` seconds.
+    Then one probe request is let through (half-open); success closes the
+    circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 disables)
+            reset_timeout: Seconds the circuit stays open before a probe
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._open_count = 0
+        self._open_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """Build a breaker from FLOWISE_CIRCUIT_* environment variables."""
+        return cls(
+            failure_threshold=env_int("FLOWISE_CIRCUIT_THRESHOLD", 5),
+            reset_timeout=env_float("FLOWISE_CIRCUIT_RESET", 30.0),
+        )
+
+    def before_request(self) -> None:
+        """Check the circuit before sending.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self._state == self.OPEN and remaining <= 0:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+        raise CircuitOpenError(
+            f"Flowise unavailable: circuit open after {self._failures} consecutive failures"
+            + (f", next probe in {remaining:.1f}s" if remaining > 0 else "")
+        )
+
+    def record_success(self) -> None:
+        """Close the circuit after a request that reached a healthy Flowise."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                self._open_seconds += time.monotonic() - self._opened_at
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN:
+                # Failed probe: open again, keeping the outage clock running
+                self._state = self.OPEN
+                self._probing = False
+                self._open_seconds += now - self._opened_at
+                self._opened_at = now
+            elif (
+                self._state == self.CLOSED
+                and self.failure_threshold
+                and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = now
+                self._open_count += 1
+
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half_open'."""
+        return self._state
+
+    def metrics(self) -> dict[str, Any]:
+        """Snapshot of the breaker state and counters."""
+        with self._lock:
+            open_seconds = self._open_seconds
+            if self._state != self.CLOSED:
+                open_seconds += time.monotonic() - self._opened_at
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "times_opened": self._open_count,
+                "open_seconds": round(open_seconds, 3),
+            }
+
+
+class Resilience:
+    """Retry decisions, circuit breaker and counters for one client."""
+
+    def __init__(self, policy: RetryPolicy | None = None, breaker: CircuitBreaker | None = None):
+        """Initialize resilience settings.
+
+        Args:
+            policy: Retry and timeout settings (defaults to environment)
+            breaker: Circuit breaker (defaults to environment)
+        """
+        self.policy = policy or RetryPolicy.from_env()
+        self.breaker = breaker or CircuitBreaker.from_env()
+        self._counters = {"requests": 0, "retries": 0, "failures": 0, "short_circuited": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def before_request(self) -> None:
+        """Count an attempt and check the circuit.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        try:
+            self.breaker.before_request()
+        except CircuitOpenError:
+            self._count("short_circuited")
+            raise
+        self._count("requests")
+
+    def after_response(self, status: int) -> None:
+        """Record a response in the circuit breaker."""
+        if status in UNAVAILABLE_STATUSES:
+            self._count("failures")
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def after_error(self) -> None:
+        """Record a transport error (refused, reset, timed out)."""
+        self._count("failures")
+        self.breaker.record_failure()
+
+    def retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        status: int | None = None,
+        connect_error: bool = False,
+        retry_after: str | None = None,
+    ) -> float | None:
+        """Decide whether to retry a failed attempt.
+
+        Args:
+            method: HTTP method of the request
+            attempt: Attempts made so far (1 after the first)
+            status: Response status, or None for a transport error
+            connect_error: Transport error before the request was sent
+            retry_after: Retry-After header of the response, if any
+
+        Returns:
+            Seconds to sleep before retrying, or None to give up
+        """
+        if attempt >= self.policy.max_attempts:
+            return None
+        if status is not None and status not in RETRY_STATUSES:
+            return None
+        if not connect_error and method.upper() not in IDEMPOTENT_METHODS:
+            return None
+        self._count("retries")
+        return self.policy.backoff(attempt, retry_after)
+
+    def metrics(self) -> dict[str, Any]:
+        """Counters, circuit state and effective policy."""
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "circuit": self.breaker.metrics(),
+            "policy": {
+                "max_attempts": self.policy.max_attempts,
+                "connect_timeout": self.policy.connect_timeout,
+                "read_timeout": self.policy.read_timeout,
+                "stream_read_timeout": self.policy.stream_read_timeout,
+            },
+        }
@@ -0,0 +1,110 @@
+"""Server-sent event helpers for Flowise streaming predictions.
+
+Flowise streams predictions (``"streaming": true``) as SSE messages of the form::
+
+    message:
+    data:{"event":"token","data":"Hel"}
+
+Event names include start, token, sourceDocuments, usedTools, agentReasoning,
+metadata, error and end.
+"""
+
+import json
+from typing import Any
+
+
+def parse_sse_line(line: str) -> dict[str, Any] | None:
+    """Parse one SSE line into a Flowise event.
+
+    Args:
+        line: Raw line from the event stream (without trailing newline)
+
+    Returns:
+        Event dict with 'event' and 'data' keys, or None for non-data lines
+    """
+    if not line.startswith("data:"):
+        return None
+
+    # Only the one optional space after the colon is framing; anything
+    # else is part of the token ("data:  world" carries " world")
+    payload = line[5:].rstrip("\r\n")
+    if payload.startswith(" "):
+        payload = payload[1:]
+    if not payload:
+        return None
+
+    try:
+        event = json.loads(payload)
+    except json.JSONDecodeError:
+        # Older Flowise versions stream bare tokens
+        return {"event": "token", "data": payload}
+
+    if isinstance(event, dict) and "event" in event:
+        return event
+    if isinstance(event, str):
+        # JSON-encoded bare token: 'data: "Hel"' carries Hel
+        return {"event": "token", "data": event}
+    return {"event": "token", "data": payload}
+
+
+def events_from_response(response: dict[str, Any] | str) -> list[dict[str, Any]]:
+    """Convert a buffered (non-streaming) prediction into equivalent events.
+
+    Used when a chatflow does not support streaming and Flowise answers
+    with plain JSON instead of an event stream.
+    """
+    if not isinstance(response, dict):
+        return [{"event": "token", "data": str(response)}, {"event": "end", "data": "[DONE]"}]
+
+    events = [{"event": "token", "data": response.get("text", response.get("response", ""))}]
+    for key in ("sourceDocuments", "usedTools", "agentReasoning"):
+        if key in response:
+            events.append({"event": key, "data": response[key]})
+    events.append({"event": "end", "data": "[DONE]"})
+    return events
+
+
+class PredictionAggregator:
+    """Accumulates streamed prediction events into the final response."""
+
+    def __init__(self) -> None:
+        self.tokens: list[str] = []
+        self.extras: dict[str, Any] = {}
+        self.error: str | None = None
+        self.done = False
+
+    def add(self, event: dict[str, Any]) -> str | None:
+        """Record one event.
+
+        Args:
+            event: Parsed Flowise event
+
+        Returns:
+            Token text if the event carried a token, else None
+        """
+        name = event.get("event")
+        data = event.get("data")
+
+        if name == "token":
+            token = data if isinstance(data, str) else json.dumps(data)
+            self.tokens.append(token)
+            return token
+        if name == "error":
+            self.error = data if isinstance(data, str) else json.dumps(data)
+        elif name == "end":
+            self.done = True
+        elif name in ("sourceDocuments", "usedTools", "agentReasoning", "metadata", "artifacts"):
+            self.extras[name] = data
+        return None
+
+    @property
+    def text(self) -> str:
+        """Text aggregated so far."""
+        return "".join(self.tokens)
+
+    def to_response(self) -> dict[str, Any]:
+        """Build a response shaped like a buffered prediction."""
+        response: dict[str, Any] = {"text": self.text, **self.extras}
+        if self.error:
+            response["error"] = self.error
+        return response
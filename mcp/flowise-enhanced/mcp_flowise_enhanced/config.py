@@ -0,0 +1,23 @@
+"""Environment-variable helpers for optional server settings."""
+
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer from the environment, falling back to default."""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a float from the environment, falling back to default."""
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment, falling back to default."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
@@ -1,10 +1,20 @@
 """Converters for Flowise workflow formats."""
 
+from .bulk import wrap_directory, wrap_file
+from .hashing import canonical_json, content_hash, flow_data_hash, tool_hash
+from .stream import (
+    DEFAULT_CHUNK_BYTES,
+    ExportDataWriter,
+    chunk_exportdata,
+    iter_exportdata,
+    iter_exportdata_dict,
+)
 from .types import FlowType, detect_flow_type, is_raw_flow_file, is_tool_file
 from .wrapper import (
     convert_flow_to_export_format,
     convert_tool_to_export_format,
     create_empty_exportdata,
+    encode_flow_data,
     wrap_workflow,
 )
 
@@ -16,5 +26,17 @@ __all__ = [
     "convert_flow_to_export_format",
     "convert_tool_to_export_format",
     "create_empty_exportdata",
+    "encode_flow_data",
     "wrap_workflow",
+    "wrap_directory",
+    "wrap_file",
+    "canonical_json",
+    "content_hash",
+    "flow_data_hash",
+    "tool_hash",
+    "DEFAULT_CHUNK_BYTES",
+    "ExportDataWriter",
+    "chunk_exportdata",
+    "iter_exportdata",
+    "iter_exportdata_dict",
 ]
@@ -0,0 +1,249 @@
+"""Bulk directory wrapping of Flowise flows and tools.
+
+Python counterpart of running wrap_flowise.ps1 on a directory: every JSON
+file is detected, validated and wrapped in worker processes, and the results
+are merged into one ExportData for a single import_data call.
+
+Usage:
+    flowise-bulk-wrap flowise/ --output flowise/flowise-import.json [--import]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from ..validators.local import validate_workflow_local
+from .stream import ExportDataWriter
+from .types import FlowType, is_raw_flow_file, is_tool_file
+from .wrapper import create_empty_exportdata, wrap_workflow
+
+# Outputs of earlier runs, skipped like wrap_flowise.ps1 does
+PROCESSED_FILE_RE = re.compile(r"-(wrapped|exportdata)\.json$", re.IGNORECASE)
+
+# ExportData array each detected type is merged into
+EXPORT_ARRAYS = {
+    FlowType.TOOL.value: "Tool",
+    FlowType.AGENTFLOW.value: "AgentFlowV2",
+    FlowType.CHATFLOW.value: "ChatFlow",
+}
+
+
+def wrap_file(path: str, validate: bool = True, compact: bool = False) -> dict[str, Any]:
+    """Detect, validate and wrap one JSON file.
+
+    Runs in a worker process, so it takes and returns plain data only.
+
+    Args:
+        path: Path to a raw flow or tool JSON file
+        validate: Run validate_workflow_local on raw flows
+        compact: Encode flowData without indentation
+
+    Returns:
+        Report dict with file, status ('wrapped', 'skipped', 'invalid' or
+        'error'), name, detected_type, and content_hash and wrapped item
+        when successful
+    """
+    report: dict[str, Any] = {"file": path, "name": Path(path).stem}
+
+    try:
+        # Files saved by PowerShell often carry a UTF-8 BOM
+        with open(path, encoding="utf-8-sig") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return {**report, "status": "error", "error": f"Could not read JSON: {e}"}
+
+    if not isinstance(data, dict) or not (is_tool_file(data) or is_raw_flow_file(data)):
+        return {**report, "status": "skipped", "error": "Not a raw flow or tool definition"}
+
+    if validate and is_raw_flow_file(data):
+        validation = validate_workflow_local(data)
+        report["validation"] = {
+            "errors": validation.local_errors,
+            "warnings": validation.local_warnings,
+        }
+        if not validation.valid:
+            return {**report, "status": "invalid", "detected_type": validation.flow_type}
+
+    name = None if is_tool_file(data) else report["name"]
+    result = wrap_workflow(data, name=name, compact=compact)
+    if not result.get("success"):
+        return {**report, "status": "error", "error": result.get("error")}
+
+    return {
+        **report,
+        "status": "wrapped",
+        "name": result["wrapped"]["name"],
+        "detected_type": result["detected_type"],
+        "content_hash": result["content_hash"],
+        "wrapped": result["wrapped"],
+    }
+
+
+def find_workflow_files(directory: str | Path, pattern: str = "*.json") -> list[Path]:
+    """List candidate files in a directory, skipping earlier wrap outputs."""
+    return sorted(
+        p for p in Path(directory).glob(pattern)
+        if p.is_file() and not PROCESSED_FILE_RE.search(p.name)
+    )
+
+
+def _iter_reports(
+    paths: list[str], workers: int, validate: bool, compact: bool
+) -> Iterator[dict[str, Any]]:
+    """Wrap files in worker processes, yielding reports in input order."""
+    if workers <= 1:
+        for path in paths:
+            yield wrap_file(path, validate, compact)
+        return
+    # spawn keeps worker start-up safe when called from a threaded server
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        yield from pool.map(
+            wrap_file, paths, [validate] * len(paths), [compact] * len(paths)
+        )
+
+
+def wrap_directory(
+    directory: str | Path,
+    pattern: str = "*.json",
+    workers: int | None = None,
+    validate: bool = True,
+    compact: bool = False,
+    output: str | Path | None = None,
+    keep_exportdata: bool | None = None,
+) -> dict[str, Any]:
+    """Wrap every flow and tool in a directory into one ExportData.
+
+    With an output path, wrapped items are streamed to the file through
+    ExportDataWriter as workers finish, so the merged ExportData is never
+    held in memory unless keep_exportdata asks for it. The file is only
+    created if at least one item was wrapped.
+
+    Args:
+        directory: Directory to scan (e.g. 'flowise/')
+        pattern: Glob for candidate files
+        workers: Worker processes (defaults to CPU count; 1 runs in-process)
+        validate: Validate raw flows before wrapping; invalid flows are left out
+        compact: Encode flowData without indentation
+        output: Write the merged ExportData to this file
+        keep_exportdata: Also return the merged ExportData (defaults to True
+               without an output path, False with one)
+
+    Returns:
+        Dict with:
+            - success: True if at least one item was wrapped and none failed
+            - exportdata: Merged 15-array ExportData (if kept)
+            - output_file: Path written (if output was given and not empty)
+            - counts: Items per ExportData array
+            - files: Per-file reports (without the wrapped payload)
+    """
+    paths = [str(p) for p in find_workflow_files(directory, pattern)]
+    workers = min(workers or os.cpu_count() or 1, max(len(paths), 1))
+    if keep_exportdata is None:
+        keep_exportdata = output is None
+
+    exportdata = create_empty_exportdata() if keep_exportdata else None
+    counts = dict.fromkeys(EXPORT_ARRAYS.values(), 0)
+    reports: list[dict[str, Any]] = []
+
+    def collect(writer: ExportDataWriter | None) -> None:
+        for report in _iter_reports(paths, workers, validate, compact):
+            wrapped = report.pop("wrapped", None)
+            if wrapped is not None:
+                array = EXPORT_ARRAYS[report["detected_type"]]
+                counts[array] += 1
+                if writer is not None:
+                    writer.add(array, wrapped)
+                if exportdata is not None:
+                    exportdata[array].append(wrapped)
+            reports.append(report)
+
+    output_file = None
+    if output is None:
+        collect(None)
+    else:
+        # Written beside the target and renamed, so a failed or empty run
+        # leaves any earlier output in place
+        output = Path(output)
+        partial = output.with_name(output.name + ".partial")
+        try:
+            with open(partial, "w", encoding="utf-8") as f, ExportDataWriter(f) as writer:
+                collect(writer)
+            if sum(counts.values()):
+                os.replace(partial, output)
+                output_file = str(output)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    failed = [r for r in reports if r["status"] in ("invalid", "error")]
+    result: dict[str, Any] = {"success": sum(counts.values()) > 0 and not failed}
+    if exportdata is not None:
+        result["exportdata"] = exportdata
+    if output_file:
+        result["output_file"] = output_file
+    result["counts"] = counts
+    result["files"] = reports
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Wrap all Flowise flows and tools in a directory into one ExportData file."
+    )
+    parser.add_argument("directory", help="Directory containing flow/tool JSON files")
+    parser.add_argument("--output", "-o", help="Output file (default: <directory>/flowise-import.json)")
+    parser.add_argument("--pattern", default="*.json", help="Glob for candidate files")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-validate", action="store_true", help="Skip local validation")
+    parser.add_argument(
+        "--compact", action="store_true", help="Encode flowData without indentation"
+    )
+    parser.add_argument(
+        "--import", dest="do_import", action="store_true",
+        help="Import the merged ExportData via the Flowise API (FLOWISE_API_ENDPOINT)",
+    )
+    args = parser.parse_args(argv)
+
+    output = args.output or str(Path(args.directory) / "flowise-import.json")
+    result = wrap_directory(
+        args.directory,
+        pattern=args.pattern,
+        workers=args.workers,
+        validate=not args.no_validate,
+        compact=args.compact,
+        output=output,
+        keep_exportdata=args.do_import,
+    )
+
+    for report in result["files"]:
+        detail = report.get("detected_type") or report.get("error", "")
+        print(f"{report['status']:>8}  {Path(report['file']).name}  {detail}", file=sys.stderr)
+        for error in report.get("validation", {}).get("errors", []):
+            print(f"          - {error}", file=sys.stderr)
+
+    if not sum(result["counts"].values()):
+        print("No valid files to convert.", file=sys.stderr)
+        return 1
+
+    print(f"Wrote {output}: {result['counts']}", file=sys.stderr)
+
+    if args.do_import:
+        from ..api.client import FlowiseClient
+
+        with FlowiseClient() as client:
+            client.import_data(result["exportdata"])
+        print("Imported via Flowise API", file=sys.stderr)
+
+    return 0 if result["success"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
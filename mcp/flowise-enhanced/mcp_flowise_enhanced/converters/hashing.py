@@ -0,0 +1,52 @@
+"""Canonical JSON encoding and content hashes for flows and tools.
+
+The hash depends only on the JSON content, not on key order or whitespace,
+so a flow pretty-printed by wrap_flowise.ps1 and the same flow stored
+compactly by Flowise hash to the same value.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+
+def canonical_json(data: Any) -> str:
+    """Encode data with sorted keys and no insignificant whitespace."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def content_hash(data: Any) -> str:
+    """SHA-256 hex digest of the canonical JSON encoding of data."""
+    return hashlib.sha256(canonical_json(data).encode("utf-8")).hexdigest()
+
+
+# Tool fields that define its behaviour; ids and timestamps are ignored
+TOOL_HASH_FIELDS = ("name", "description", "color", "iconSrc", "schema", "func")
+
+
+def tool_hash(tool: dict[str, Any]) -> str:
+    """Content hash of a custom tool over TOOL_HASH_FIELDS.
+
+    Missing and null fields hash like empty strings, so a wrapped tool and
+    the same tool as returned by the Flowise API compare equal.
+    """
+    return content_hash({key: tool.get(key) or "" for key in TOOL_HASH_FIELDS})
+
+
+def flow_data_hash(flow_data: str | dict[str, Any]) -> str:
+    """Content hash of a flowData value, independent of its formatting.
+
+    Args:
+        flow_data: Stringified workflow JSON as stored in Flowise (an
+                  already-parsed workflow dict is accepted too)
+
+    Returns:
+        Same digest as content_hash of the parsed workflow; text that is
+        not valid JSON is hashed as a plain string
+    """
+    if isinstance(flow_data, str):
+        try:
+            flow_data = json.loads(flow_data)
+        except ValueError:
+            pass
+    return content_hash(flow_data)
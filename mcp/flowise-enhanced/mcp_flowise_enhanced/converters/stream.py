@@ -0,0 +1,264 @@
+"""Incremental ExportData reading and writing.
+
+Workspace exports with chat history and document store chunks can run to
+hundreds of MB. These helpers parse and emit the 15 ExportData arrays item
+by item, so only one item (plus a read buffer) is held in memory at a time,
+and split a stream of items into import payloads of bounded size.
+"""
+
+import json
+import shutil
+import tempfile
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+from .wrapper import create_empty_exportdata
+
+# Array order used when writing; matches create_empty_exportdata
+EXPORT_ARRAY_NAMES = tuple(create_empty_exportdata())
+
+# Characters read per refill of the parse buffer
+READ_SIZE = 1 << 16
+
+# Defaults for chunked import payloads
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+DEFAULT_CHUNK_ITEMS = 500
+
+_WHITESPACE = " \t\r\n"
+
+ExportItem = tuple[str, Any]
+
+
+class _Reader:
+    """Buffered cursor over a text stream for incremental JSON decoding."""
+
+    def __init__(self, fp: IO[str], read_size: int):
+        self._fp = fp
+        self._read_size = read_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        """Append up to size characters, dropping consumed text. False at EOF."""
+        if self._eof:
+            return False
+        chunk = self._fp.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of input)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                if self._pos == 0 and self._buffer.startswith("\ufeff"):
+                    self._pos = 1
+                    continue
+                return self._buffer[self._pos]
+            if not self._fill(self._read_size):
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume char, raising ValueError if something else comes next."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in ExportData, found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next JSON value, reading more input until it is complete."""
+        self.peek()
+        size = self._read_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete value at the end of the buffer: read more, growing
+                # the read so very large items are not re-parsed many times
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            # A number may continue past the buffer end (e.g. '12' of '123')
+            if end == len(self._buffer) and not self._eof and self._fill(self._read_size):
+                continue
+            self._pos = end
+            return value
+
+
+def iter_exportdata(fp: IO[str], read_size: int = READ_SIZE) -> Iterator[ExportItem]:
+    """Yield (array name, item) pairs from an ExportData JSON stream.
+
+    Items are decoded one at a time, so memory use is bounded by the largest
+    single item rather than the whole export.
+
+    Args:
+        fp: Text stream positioned at the ExportData object
+        read_size: Characters read per buffer refill
+
+    Yields:
+        (array name, item) in file order
+
+    Raises:
+        ValueError: If the stream is not an object of arrays
+    """
+    reader = _Reader(fp, read_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        name = reader.value()
+        if not isinstance(name, str):
+            raise ValueError("ExportData keys must be strings")
+        reader.expect(":")
+        reader.expect("[")
+
+        if reader.peek() == "]":
+            reader.expect("]")
+        else:
+            while True:
+                yield name, reader.value()
+                if reader.peek() == "]":
+                    reader.expect("]")
+                    break
+                reader.expect(",")
+
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
+
+
+def iter_exportdata_dict(exportdata: dict[str, Any]) -> Iterator[ExportItem]:
+    """Yield (array name, item) pairs from an in-memory ExportData dict."""
+    for name, items in exportdata.items():
+        for item in items or []:
+            yield name, item
+
+
+class ExportDataWriter:
+    """Writes ExportData incrementally, one item at a time.
+
+    Items may be added in any order. Each array is spooled to its own
+    temporary file and the arrays are stitched together on close, so the
+    output always has all 15 arrays and memory use stays flat.
+
+    Example:
+        with open("export.json", "w") as f, ExportDataWriter(f) as writer:
+            for name, item in items:
+                writer.add(name, item)
+    """
+
+    def __init__(self, fp: IO[str]):
+        """Initialize the writer.
+
+        Args:
+            fp: Text stream the finished ExportData is written to
+        """
+        self._fp = fp
+        self._spools: dict[str, IO[str]] = {}
+        self._counts: dict[str, int] = dict.fromkeys(EXPORT_ARRAY_NAMES, 0)
+        self._closed = False
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Items written per array."""
+        return dict(self._counts)
+
+    def add(self, name: str, item: Any) -> None:
+        """Append one item to an ExportData array.
+
+        Args:
+            name: Array name (e.g. 'ChatFlow', 'ChatMessage')
+            item: JSON-serializable item
+        """
+        if self._closed:
+            raise ValueError("ExportDataWriter is closed")
+        spool = self._spools.get(name)
+        if spool is None:
+            spool = self._spools[name] = tempfile.TemporaryFile("w+", encoding="utf-8")
+        if self._counts.get(name):
+            spool.write(",")
+        json.dump(item, spool, separators=(",", ":"), ensure_ascii=False)
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def add_all(self, items: Iterable[ExportItem]) -> None:
+        """Append (array name, item) pairs."""
+        for name, item in items:
+            self.add(name, item)
+
+    def close(self) -> None:
+        """Write the ExportData object to the output stream."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._fp.write("{")
+            for index, name in enumerate(self._counts):
+                self._fp.write(("," if index else "") + json.dumps(name) + ":[")
+                spool = self._spools.get(name)
+                if spool is not None:
+                    spool.seek(0)
+                    shutil.copyfileobj(spool, self._fp)
+                self._fp.write("]")
+            self._fp.write("}")
+        finally:
+            for spool in self._spools.values():
+                spool.close()
+
+    def __enter__(self) -> "ExportDataWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Leave the output untouched rather than writing a partial export
+            self._closed = True
+            for spool in self._spools.values():
+                spool.close()
+
+
+def chunk_exportdata(
+    items: Iterable[ExportItem],
+    max_bytes: int = DEFAULT_CHUNK_BYTES,
+    max_items: int = DEFAULT_CHUNK_ITEMS,
+) -> Iterator[dict[str, list]]:
+    """Group (array name, item) pairs into ExportData payloads of bounded size.
+
+    Item order is preserved, so flows are imported before the chat messages
+    that reference them when the source follows the standard array order.
+    An item larger than max_bytes is sent in a payload of its own.
+
+    Args:
+        items: (array name, item) pairs, e.g. from iter_exportdata
+        max_bytes: Approximate maximum encoded size of one payload
+        max_items: Maximum items per payload
+
+    Yields:
+        Full 15-array ExportData dicts
+    """
+    chunk = create_empty_exportdata()
+    size = 0
+    count = 0
+
+    for name, item in items:
+        item_size = len(json.dumps(item, separators=(",", ":"), ensure_ascii=False)) + 1
+        if count and (size + item_size > max_bytes or count >= max_items):
+            yield chunk
+            chunk = create_empty_exportdata()
+            size = 0
+            count = 0
+        chunk.setdefault(name, []).append(item)
+        size += item_size
+        count += 1
+
+    if count:
+        yield chunk
@@ -28,9 +28,8 @@ def detect_flow_type(workflow: dict[str, Any]) -> FlowType:
     nodes = workflow.get("nodes", [])
 
     for node in nodes:
-        node_type = node.get("type", "")
         # AgentFlow nodes have type="agentFlow" or type="iteration"
-        if node_type in ("agentFlow", "iteration"):
+        if isinstance(node, dict) and node.get("type") in ("agentFlow", "iteration"):
             return FlowType.AGENTFLOW
 
     return FlowType.CHATFLOW
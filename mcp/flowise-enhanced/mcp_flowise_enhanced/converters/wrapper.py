@@ -4,6 +4,7 @@ import json
 import uuid
 from typing import Any
 
+from .hashing import content_hash, flow_data_hash, tool_hash
 from .types import FlowType, detect_flow_type, is_raw_flow_file, is_tool_file
 
 
@@ -34,10 +35,27 @@ def create_empty_exportdata() -> dict[str, list]:
     }
 
 
+def encode_flow_data(workflow: dict[str, Any], compact: bool = False) -> str:
+    """Stringify a workflow for the flowData field.
+
+    Args:
+        workflow: Raw workflow JSON with nodes/edges
+        compact: Omit indentation and spaces (roughly halves the size, and
+                the size again once the string is escaped inside JSON)
+
+    Returns:
+        Workflow JSON string
+    """
+    if compact:
+        return json.dumps(workflow, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(workflow, indent=2)
+
+
 def convert_flow_to_export_format(
     workflow: dict[str, Any],
     name: str,
     generate_id: bool = True,
+    compact: bool = False,
 ) -> dict[str, Any]:
     """Convert raw workflow to wrapped format for ExportData.
 
@@ -47,6 +65,8 @@ def convert_flow_to_export_format(
         workflow: Raw workflow JSON with nodes/edges
         name: Workflow name
         generate_id: Whether to generate new UUID (default True)
+        compact: Encode flowData without indentation (default False,
+                matching wrap_flowise.ps1)
 
     Returns:
         Wrapped flow dict with id, name, flowData, type
@@ -54,7 +74,7 @@ def convert_flow_to_export_format(
     flow_type = detect_flow_type(workflow)
 
     # flowData is the stringified JSON of the workflow
-    flow_data = json.dumps(workflow, indent=2)
+    flow_data = encode_flow_data(workflow, compact)
 
     return {
         "id": str(uuid.uuid4()) if generate_id else workflow.get("id", str(uuid.uuid4())),
@@ -89,6 +109,7 @@ def wrap_workflow(
     workflow: dict[str, Any],
     name: str | None = None,
     generate_id: bool = True,
+    compact: bool = False,
 ) -> dict[str, Any]:
     """Wrap a workflow or tool into ExportData format.
 
@@ -98,11 +119,13 @@ def wrap_workflow(
         workflow: Raw workflow JSON or tool JSON
         name: Workflow/tool name (auto-detected from tool if not provided)
         generate_id: Whether to generate new UUID
+        compact: Encode flowData of raw flows without indentation
 
     Returns:
         Dict with:
             - success: bool
             - detected_type: FlowType string
+            - content_hash: SHA-256 of the canonical flow or tool content
             - exportdata: Full 15-array ExportData structure
             - wrapped: The wrapped item (flow or tool)
             - error: Error message if success=False
@@ -120,6 +143,7 @@ def wrap_workflow(
         return {
             "success": True,
             "detected_type": FlowType.TOOL.value,
+            "content_hash": tool_hash(wrapped),
             "exportdata": exportdata,
             "wrapped": wrapped,
         }
@@ -128,7 +152,7 @@ def wrap_workflow(
         # Raw flow file (CHATFLOW or AGENTFLOW)
         flow_name = name or "Unnamed Workflow"
         flow_type = detect_flow_type(workflow)
-        wrapped = convert_flow_to_export_format(workflow, flow_name, generate_id)
+        wrapped = convert_flow_to_export_format(workflow, flow_name, generate_id, compact)
 
         if flow_type == FlowType.AGENTFLOW:
             exportdata["AgentFlowV2"].append(wrapped)
@@ -138,6 +162,7 @@ def wrap_workflow(
         return {
             "success": True,
             "detected_type": flow_type.value,
+            "content_hash": content_hash(workflow),
             "exportdata": exportdata,
             "wrapped": wrapped,
         }
@@ -163,6 +188,7 @@ def wrap_workflow(
         return {
             "success": True,
             "detected_type": detected.value,
+            "content_hash": flow_data_hash(wrapped["flowData"]),
             "exportdata": exportdata,
             "wrapped": wrapped,
         }
@@ -0,0 +1,153 @@
+"""Bounded thread-pool offload for blocking tool work.
+
+Handlers that do blocking HTTP (the sync schema cache) or heavy JSON work
+(wrapping, validating, building large graphs) run on a shared thread pool so
+the MCP event loop stays responsive. Each tool class has its own concurrency
+limit, so a burst of slow imports cannot starve quick catalogue lookups.
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from .config import env_int
+
+T = TypeVar("T")
+
+# Default concurrent jobs per tool class
+DEFAULT_CLASS_LIMITS = {
+    "cpu": 2,
+    "schema": 4,
+}
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass
+class ClassStats:
+    """Queue and run counters for one tool class."""
+
+    limit: int
+    queued: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    max_queue_depth: int = 0
+    total_wait: float = 0.0
+    total_run: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        finished = self.completed + self.failed
+        return {
+            "limit": self.limit,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_wait_ms": round(self.total_wait / finished * 1000, 2) if finished else 0.0,
+            "avg_run_ms": round(self.total_run / finished * 1000, 2) if finished else 0.0,
+        }
+
+
+class ToolExecutor:
+    """Runs blocking callables off the event loop with per-class limits."""
+
+    def __init__(
+        self,
+        limits: dict[str, int] | None = None,
+        max_workers: int | None = None,
+    ):
+        """Initialize the executor.
+
+        Args:
+            limits: Concurrency limit per tool class (defaults to
+                   FLOWISE_MCP_LIMIT_<CLASS> env, then DEFAULT_CLASS_LIMITS)
+            max_workers: Thread pool size (defaults to FLOWISE_MCP_WORKERS env)
+        """
+        if limits is None:
+            limits = {
+                name: env_int(f"FLOWISE_MCP_LIMIT_{name.upper()}", default)
+                for name, default in DEFAULT_CLASS_LIMITS.items()
+            }
+        self.max_workers = max_workers or env_int("FLOWISE_MCP_WORKERS", DEFAULT_MAX_WORKERS)
+        self._stats = {name: ClassStats(limit=limit) for name, limit in limits.items()}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._pool: ThreadPoolExecutor | None = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the thread pool on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="flowise-tool"
+            )
+        return self._pool
+
+    def _semaphore(self, tool_class: str) -> asyncio.Semaphore:
+        """Get the limit semaphore for a tool class, creating it in the running loop."""
+        if tool_class not in self._stats:
+            raise ValueError(f"Unknown tool class: {tool_class}")
+        if tool_class not in self._semaphores:
+            self._semaphores[tool_class] = asyncio.Semaphore(self._stats[tool_class].limit)
+        return self._semaphores[tool_class]
+
+    async def run(self, tool_class: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run func in the thread pool under the tool class's limit.
+
+        Context variables (e.g. per-call output options) are propagated
+        to the worker thread.
+
+        Args:
+            tool_class: Limit bucket (e.g. 'cpu', 'schema')
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            func's return value
+        """
+        semaphore = self._semaphore(tool_class)
+        stats = self._stats[tool_class]
+
+        queued_at = time.monotonic()
+        stats.queued += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            stats.queued -= 1
+
+        started = time.monotonic()
+        stats.total_wait += started - queued_at
+        stats.running += 1
+        try:
+            ctx = contextvars.copy_context()
+            call = functools.partial(ctx.run, func, *args, **kwargs)
+            result = await asyncio.get_running_loop().run_in_executor(self._get_pool(), call)
+            stats.completed += 1
+            return result
+        except BaseException:
+            stats.failed += 1
+            raise
+        finally:
+            stats.running -= 1
+            stats.total_run += time.monotonic() - started
+            semaphore.release()
+
+    def metrics(self) -> dict[str, Any]:
+        """Per-class queue depth, concurrency and timing counters."""
+        return {
+            "max_workers": self.max_workers,
+            "classes": {name: stats.to_dict() for name, stats in self._stats.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Stop the thread pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -4,9 +4,18 @@ This module provides:
 - NodeSchemaCache: Cached access to Flowise node schemas
 - create_node_instance: Build properly structured nodes from schemas
 - create_edge: Build edges between nodes with proper handle IDs
+- build_workflow: Build a whole graph from a compact declarative spec
+- CompatibilityGraph: Precomputed anchor-to-anchor connection lookups
 """
 
-from .builder import create_edge, create_node_instance
+from .builder import build_workflow, create_edge, create_node_instance
+from .compat import CompatibilityGraph
 from .schema import NodeSchemaCache
 
-__all__ = ["NodeSchemaCache", "create_node_instance", "create_edge"]
+__all__ = [
+    "NodeSchemaCache",
+    "CompatibilityGraph",
+    "build_workflow",
+    "create_node_instance",
+    "create_edge",
+]
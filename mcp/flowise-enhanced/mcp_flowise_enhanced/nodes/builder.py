@@ -5,6 +5,8 @@ with full configuration panels.
 """
 
 import uuid
+from collections.abc import Callable
+from functools import lru_cache
 from typing import Any
 
 
@@ -96,7 +98,41 @@ def _is_anchor_type(type_str: str) -> bool:
     return type_str.lower() not in PRIMITIVE_TYPES
 
 
-def _split_inputs(schema: dict[str, Any]) -> tuple[list[dict], list[dict]]:
+@lru_cache(maxsize=4096)
+def parse_anchor_types(type_str: str) -> frozenset[str]:
+    """Parse an anchor type string like 'ChatOllama | BaseChatModel'.
+
+    Args:
+        type_str: Pipe-separated type string from an anchor
+
+    Returns:
+        Frozen set of individual type names (cached per distinct string)
+    """
+    return frozenset(t for t in type_str.replace("|", " ").split() if t)
+
+
+def output_anchor_types(anchor: dict[str, Any]) -> frozenset[str]:
+    """Collect the types an output anchor produces.
+
+    Handles workflow-format anchors ('type': 'A | B'), option anchors
+    ('type': 'options' with per-option types) and API-format outputs
+    ('baseClasses': [...]).
+
+    Args:
+        anchor: Output anchor or API output definition
+
+    Returns:
+        Frozen set of produced type names
+    """
+    if anchor.get("type") == "options":
+        types: frozenset[str] = frozenset()
+        for option in anchor.get("options", []):
+            types |= parse_anchor_types(option.get("type", ""))
+        return types
+    return parse_anchor_types(anchor.get("type", "")) | frozenset(anchor.get("baseClasses", []))
+
+
+def split_inputs(schema: dict[str, Any]) -> tuple[list[dict], list[dict]]:
     """Split the combined 'inputs' array into inputParams and inputAnchors.
 
     The Flowise API returns a single 'inputs' array, but the workflow JSON
@@ -187,7 +223,7 @@ def create_node_instance(
         node_type = "customNode"
 
     # Split combined inputs array into params and anchors
-    schema_params, schema_anchors = _split_inputs(schema)
+    schema_params, schema_anchors = split_inputs(schema)
 
     # Build inputParams with proper IDs
     input_params = []
@@ -385,64 +421,274 @@ def validate_connection(
     Returns:
         Validation result with 'valid', 'error', and compatibility info
     """
+    # compat builds on this module's anchor helpers, so import it here
+    from .compat import CompatibilityGraph
+
     result: dict[str, Any] = {"valid": False}
 
     source_data = source_node.get("data", {})
     target_data = target_node.get("data", {})
+    source_name = source_data.get("name", "")
+    target_name = target_data.get("name", "")
+
+    graph = CompatibilityGraph([source_data, target_data])
 
     # Find source output anchor
-    source_anchors = source_data.get("outputAnchors", [])
-    if not source_anchors:
+    outputs = graph.output_anchors(source_name)
+    if not outputs:
         result["error"] = "Source node has no output anchors"
         return result
 
     if source_output:
-        source_anchor = next(
-            (a for a in source_anchors if a.get("name") == source_output), None
-        )
-        if not source_anchor:
+        if source_output not in outputs:
             result["error"] = f"Source output '{source_output}' not found"
             return result
     else:
-        source_anchor = source_anchors[0]
+        source_output = outputs[0]
 
     # Find target input anchor
-    target_anchors = target_data.get("inputAnchors", [])
-    target_anchor = next(
-        (a for a in target_anchors if a.get("name") == target_input), None
-    )
-    if not target_anchor:
+    if target_input not in graph.input_anchors(target_name):
         result["error"] = f"Target input '{target_input}' not found"
         return result
 
-    # Get types
-    source_type = source_anchor.get("type", "")
-    target_type = target_anchor.get("type", "")
-
-    # Parse types (can be "Type1 | Type2 | Type3")
-    source_types = set(t.strip() for t in source_type.replace("|", " ").split())
-    target_types = set(t.strip() for t in target_type.replace("|", " ").split())
-
-    # Check compatibility: source must provide a type that target accepts
-    # In Flowise, target type is usually a base class that source should extend
-    compatible = bool(source_types & target_types)
-
-    # Also check baseClasses from source node
-    source_base = set(source_data.get("baseClasses", []))
-    if source_base & target_types:
-        compatible = True
+    source_types = graph.output_types(source_name, source_output)
+    target_types = graph.input_types(target_name, target_input)
+    compatible = graph.is_compatible(source_name, source_output, target_name, target_input)
 
     result["valid"] = compatible
-    result["source_output"] = source_anchor.get("name")
-    result["source_types"] = list(source_types | source_base)
+    result["source_output"] = source_output
+    result["source_types"] = sorted(source_types)
     result["target_input"] = target_input
-    result["target_types"] = list(target_types)
+    result["target_types"] = sorted(target_types)
     result["compatible"] = compatible
 
     if not compatible:
         result["error"] = (
-            f"Type mismatch: source provides {list(source_types | source_base)}, "
-            f"target expects {list(target_types)}"
+            f"Type mismatch: source provides {sorted(source_types)}, "
+            f"target expects {sorted(target_types)}"
         )
 
     return result
+
+
+def _resolve_ref(ref: str, nodes: dict[str, Any]) -> tuple[str, str] | None:
+    """Split a 'node[.anchor]' reference against the known node IDs.
+
+    Node IDs may themselves contain dots, so the longest ID that equals the
+    reference or prefixes it (followed by '.') wins.
+
+    Args:
+        ref: Reference from a connection spec
+        nodes: Built nodes keyed by ID
+
+    Returns:
+        (node ID, anchor name or '') or None if no node matches
+    """
+    if ref in nodes:
+        return ref, ""
+    head = ref
+    while "." in head:
+        head = head.rpartition(".")[0]
+        if head in nodes:
+            return head, ref[len(head) + 1:]
+    return None
+
+
+# Auto-layout spacing for build_workflow (pixels)
+LAYOUT_X_SPACING = 350
+LAYOUT_Y_SPACING = 250
+
+
+def handle_anchor(handle: Any, node_id: str, direction: str) -> str | None:
+    """Anchor name from a handle ID like 'chatOllama_0-input-cache-BaseCache'.
+
+    Args:
+        handle: sourceHandle or targetHandle of an edge
+        node_id: ID of the node the handle belongs to
+        direction: 'input' or 'output'
+
+    Returns:
+        Anchor name, or None if the handle does not belong to the node
+    """
+    prefix = f"{node_id}-{direction}-"
+    if not isinstance(handle, str) or not handle.startswith(prefix):
+        return None
+    return handle[len(prefix):].split("-", 1)[0]
+
+
+def _instance_reference(source_id: str) -> str:
+    return f"{{{{{source_id}.data.instance}}}}"
+
+
+def link_input(target_node: dict[str, Any], target_input: str, source_id: str) -> None:
+    """Record a connection in the target's inputs the way the Flowise UI does.
+
+    Connected anchors hold '{{sourceId.data.instance}}'; list anchors hold a
+    list of such references. Flowise wires nodes at runtime from these
+    references, not from the edges.
+    """
+    data = target_node.setdefault("data", {})
+    inputs = data.setdefault("inputs", {})
+    reference = _instance_reference(source_id)
+    anchor = next(
+        (a for a in data.get("inputAnchors", []) if a.get("name") == target_input), {}
+    )
+    if anchor.get("list"):
+        current = inputs.get(target_input)
+        values = current if isinstance(current, list) else []
+        if reference not in values:
+            inputs[target_input] = [*values, reference]
+    else:
+        inputs[target_input] = reference
+
+
+def unlink_input(target_node: dict[str, Any], target_input: str, source_id: str) -> None:
+    """Remove a connection recorded by link_input from the target's inputs."""
+    inputs = (target_node.get("data") or {}).get("inputs")
+    if not isinstance(inputs, dict):
+        return
+    reference = _instance_reference(source_id)
+    current = inputs.get(target_input)
+    if isinstance(current, list):
+        inputs[target_input] = [value for value in current if value != reference]
+    elif current == reference:
+        inputs[target_input] = ""
+
+
+def _layout_layers(node_ids: list[str], links: list[tuple[str, str]]) -> dict[str, int]:
+    """Assign each node a column: the longest path from any source node.
+
+    Cycles are tolerated; nodes on a cycle keep the depth reached when the
+    relaxation stops.
+    """
+    depth = {node_id: 0 for node_id in node_ids}
+    for _ in range(len(node_ids)):
+        changed = False
+        for source, target in links:
+            if depth[target] < depth[source] + 1:
+                depth[target] = depth[source] + 1
+                changed = True
+        if not changed:
+            break
+    return depth
+
+
+def build_workflow(
+    spec: dict[str, Any],
+    get_schema: Callable[[str], dict[str, Any] | None],
+) -> dict[str, Any]:
+    """Build a complete workflow graph from a compact declarative spec.
+
+    Spec format::
+
+        {
+            "nodes": [
+                {"name": "chatOllama", "id": "llm", "inputs": {"modelName": "qwen2.5"}},
+                {"name": "toolAgent", "id": "agent"}
+            ],
+            "connections": [
+                {"from": "llm", "to": "agent.model"}
+            ]
+        }
+
+    Node 'id' is optional (defaults to name_index) and is used verbatim as
+    the Flowise node ID. 'from' may name an output as 'node.output'.
+    References are matched against the spec's node IDs, so IDs containing
+    dots resolve the same way on both sides.
+    Nodes without a 'position' are laid out left-to-right by dependency.
+
+    Args:
+        spec: Declarative workflow spec
+        get_schema: Lookup returning a node schema by name (e.g. NodeSchemaCache.get_schema)
+
+    Returns:
+        Dict with 'nodes', 'edges' and 'errors' (empty when every node and
+        connection was built)
+    """
+    errors: list[str] = []
+    nodes: dict[str, dict[str, Any]] = {}
+    type_counts: dict[str, int] = {}
+    explicit_positions: set[str] = set()
+
+    for i, node_spec in enumerate(spec.get("nodes", [])):
+        name = node_spec.get("name")
+        if not name:
+            errors.append(f"Node spec at index {i} missing 'name'")
+            continue
+
+        schema = get_schema(name)
+        if not schema:
+            errors.append(f"Node '{name}' not found")
+            continue
+
+        index = type_counts.get(name, 0)
+        type_counts[name] = index + 1
+        node_id = node_spec.get("id") or _generate_node_id(name, index)
+        if node_id in nodes:
+            errors.append(f"Duplicate node ID: {node_id}")
+            continue
+
+        nodes[node_id] = create_node_instance(
+            schema=schema,
+            node_id=node_id,
+            position=node_spec.get("position"),
+            inputs=node_spec.get("inputs"),
+            index=index,
+        )
+        if node_spec.get("position"):
+            explicit_positions.add(node_id)
+
+    edges: list[dict[str, Any]] = []
+    links: list[tuple[str, str]] = []
+
+    for i, connection in enumerate(spec.get("connections", [])):
+        source_ref = connection.get("from", "")
+        target_ref = connection.get("to", "")
+        if not source_ref or not target_ref:
+            errors.append(
+                f"Connection at index {i} needs 'from': 'node[.output]' and 'to': 'node.input'"
+            )
+            continue
+
+        source = _resolve_ref(source_ref, nodes)
+        target = _resolve_ref(target_ref, nodes)
+        if source is None or target is None:
+            missing = source_ref if source is None else target_ref
+            errors.append(f"Connection at index {i} references unknown node: {missing}")
+            continue
+
+        source_id, source_output = source
+        target_id, target_input = target
+        if not target_input:
+            errors.append(f"Connection at index {i} 'to' must name an input: '{target_id}.<input>'")
+            continue
+
+        source_node = nodes[source_id]
+        target_node = nodes[target_id]
+        validation = validate_connection(
+            source_node, target_node, target_input, source_output or None
+        )
+        if not validation.get("valid"):
+            errors.append(f"Connection {source_ref} -> {target_ref}: {validation.get('error')}")
+            continue
+
+        edges.append(
+            create_edge(source_node, target_node, target_input, source_output or None)
+        )
+        link_input(target_node, target_input, source_id)
+        links.append((source_id, target_id))
+
+    # Lay out nodes without explicit positions in dependency columns
+    depth = _layout_layers(list(nodes), links)
+    rows: dict[int, int] = {}
+    for node_id, node in nodes.items():
+        if node_id in explicit_positions:
+            continue
+        column = depth[node_id]
+        row = rows.get(column, 0)
+        rows[column] = row + 1
+        position = {"x": 100 + column * LAYOUT_X_SPACING, "y": 100 + row * LAYOUT_Y_SPACING}
+        node["position"] = position
+        node["positionAbsolute"] = position
+
+    return {"nodes": list(nodes.values()), "edges": edges, "errors": errors}
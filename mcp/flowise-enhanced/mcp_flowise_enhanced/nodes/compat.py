@@ -0,0 +1,145 @@
+"""Precomputed anchor compatibility graph over node schemas.
+
+Answers "which (node, output) pairs can feed toolAgent.model" and "is this
+edge valid" with dictionary lookups instead of re-parsing anchor type
+strings on every call.
+"""
+
+from typing import Any
+
+from .builder import output_anchor_types, parse_anchor_types, split_inputs
+
+# (node name, anchor name)
+AnchorRef = tuple[str, str]
+
+
+def _schema_outputs(schema: dict[str, Any]) -> list[tuple[str, frozenset[str]]]:
+    """List a schema's outputs as (anchor name, produced types).
+
+    Option anchors expose one output per option. Nodes without declared
+    outputs get the builder's default output, named after the node and
+    typed by its baseClasses.
+    """
+    name = schema.get("name", "")
+    base_classes = frozenset(schema.get("baseClasses", []))
+    outputs: list[tuple[str, frozenset[str]]] = []
+
+    for anchor in schema.get("outputAnchors") or schema.get("outputs") or []:
+        if anchor.get("type") == "options":
+            for option in anchor.get("options", []):
+                types = parse_anchor_types(option.get("type", "")) or base_classes
+                outputs.append((option.get("name", name), types))
+        else:
+            outputs.append((anchor.get("name", name), output_anchor_types(anchor) or base_classes))
+
+    if not outputs and base_classes:
+        outputs.append((name, base_classes))
+    return outputs
+
+
+class CompatibilityGraph:
+    """Maps every input and output anchor in a catalogue to its types.
+
+    Built once per catalogue; each type points at the anchors producing or
+    accepting it, so candidate lookups never scan the whole catalogue.
+    """
+
+    def __init__(self, schemas: list[dict[str, Any]]):
+        """Build the graph.
+
+        Args:
+            schemas: Node schemas in API or workflow format
+        """
+        self._inputs: dict[AnchorRef, frozenset[str]] = {}
+        self._outputs: dict[AnchorRef, frozenset[str]] = {}
+        self._producers: dict[str, list[AnchorRef]] = {}
+        self._consumers: dict[str, list[AnchorRef]] = {}
+        self._node_inputs: dict[str, list[str]] = {}
+        self._node_outputs: dict[str, list[str]] = {}
+
+        for schema in schemas:
+            name = schema.get("name", "")
+            if not name:
+                continue
+
+            _, anchors = split_inputs(schema)
+            for anchor in anchors:
+                ref = (name, anchor.get("name", ""))
+                types = parse_anchor_types(anchor.get("type", ""))
+                self._inputs[ref] = types
+                self._node_inputs.setdefault(name, []).append(ref[1])
+                for type_name in types:
+                    self._consumers.setdefault(type_name, []).append(ref)
+
+            for output_name, types in _schema_outputs(schema):
+                ref = (name, output_name)
+                self._outputs[ref] = types
+                self._node_outputs.setdefault(name, []).append(output_name)
+                for type_name in types:
+                    self._producers.setdefault(type_name, []).append(ref)
+
+    def input_anchors(self, node_name: str) -> list[str]:
+        """Names of a node's input anchors."""
+        return self._node_inputs.get(node_name, [])
+
+    def output_anchors(self, node_name: str) -> list[str]:
+        """Names of a node's outputs."""
+        return self._node_outputs.get(node_name, [])
+
+    def input_types(self, node_name: str, input_name: str) -> frozenset[str]:
+        """Types an input anchor accepts (empty if the anchor is unknown)."""
+        return self._inputs.get((node_name, input_name), frozenset())
+
+    def output_types(self, node_name: str, output_name: str) -> frozenset[str]:
+        """Types an output produces (empty if the output is unknown)."""
+        return self._outputs.get((node_name, output_name), frozenset())
+
+    def sources_for(self, node_name: str, input_name: str) -> list[AnchorRef]:
+        """All (node, output) pairs that can connect to an input anchor.
+
+        Args:
+            node_name: Target node type (e.g. 'toolAgent')
+            input_name: Target input anchor (e.g. 'model')
+
+        Returns:
+            Sorted, de-duplicated source anchor references
+        """
+        refs: set[AnchorRef] = set()
+        for type_name in self._inputs.get((node_name, input_name), ()):
+            refs.update(self._producers.get(type_name, ()))
+        return sorted(refs)
+
+    def targets_for(self, node_name: str, output_name: str | None = None) -> list[AnchorRef]:
+        """All (node, input) pairs an output can connect to.
+
+        Args:
+            node_name: Source node type
+            output_name: Source output (defaults to the node's first output)
+
+        Returns:
+            Sorted, de-duplicated target anchor references
+        """
+        if output_name is None:
+            outputs = self.output_anchors(node_name)
+            if not outputs:
+                return []
+            output_name = outputs[0]
+
+        refs: set[AnchorRef] = set()
+        for type_name in self._outputs.get((node_name, output_name), ()):
+            refs.update(self._consumers.get(type_name, ()))
+        return sorted(refs)
+
+    def is_compatible(
+        self,
+        source_node: str,
+        source_output: str,
+        target_node: str,
+        target_input: str,
+    ) -> bool:
+        """Check whether an edge between two anchors is type-compatible."""
+        produced = self._outputs.get((source_node, source_output))
+        accepted = self._inputs.get((target_node, target_input))
+        if not produced or not accepted:
+            return False
+        return not produced.isdisjoint(accepted)
@@ -4,56 +4,205 @@ Provides cached access to Flowise node schemas to avoid repeated API calls
 and enable efficient node discovery and search.
 """
 
+import logging
+import threading
+import time
+from pathlib import Path
 from typing import Any
 
 from ..api.client import FlowiseClient
+from ..config import env_bool, env_float
+from .builder import output_anchor_types, parse_anchor_types, split_inputs
+from .compat import CompatibilityGraph
+from .search import NodeSearchIndex
+from .store import SchemaStore
+
+logger = logging.getLogger(__name__)
+
+# Seconds a fetched catalogue is considered fresh
+DEFAULT_SCHEMA_TTL = 3600.0
+# Extra seconds a stale catalogue may still be served while revalidating
+DEFAULT_STALE_TTL = 7 * 24 * 3600.0
 
 
 class NodeSchemaCache:
     """Caches node schemas to avoid repeated API calls.
 
+    Schemas are persisted to disk (see SchemaStore) so a new process can
+    serve them immediately. Within ``ttl`` they are served as-is; within
+    ``ttl + stale_ttl`` they are served while a background thread
+    revalidates them; older catalogues are refetched synchronously.
+
     Attributes:
         client: FlowiseClient instance for API requests
     """
 
-    def __init__(self, client: FlowiseClient | None = None):
+    def __init__(
+        self,
+        client: FlowiseClient | None = None,
+        persist: bool | None = None,
+        cache_dir: Path | None = None,
+        ttl: float | None = None,
+        stale_ttl: float | None = None,
+    ):
         """Initialize the schema cache.
 
         Args:
             client: Optional FlowiseClient instance. If not provided,
                    a new client will be created using environment variables.
+            persist: Keep a cache file on disk (defaults to FLOWISE_SCHEMA_CACHE env, on)
+            cache_dir: Directory for the cache file (defaults to FLOWISE_SCHEMA_CACHE_DIR)
+            ttl: Seconds schemas stay fresh (defaults to FLOWISE_SCHEMA_CACHE_TTL)
+            stale_ttl: Seconds stale schemas may be served while revalidating
+                   (defaults to FLOWISE_SCHEMA_CACHE_STALE_TTL)
         """
         self.client = client or FlowiseClient()
+        self.ttl = ttl if ttl is not None else env_float("FLOWISE_SCHEMA_CACHE_TTL", DEFAULT_SCHEMA_TTL)
+        self.stale_ttl = (
+            stale_ttl
+            if stale_ttl is not None
+            else env_float("FLOWISE_SCHEMA_CACHE_STALE_TTL", DEFAULT_STALE_TTL)
+        )
+        if persist is None:
+            persist = env_bool("FLOWISE_SCHEMA_CACHE", True)
+        self._store = SchemaStore(self.client.endpoint, cache_dir) if persist else None
+
         self._cache: dict[str, dict[str, Any]] = {}
         self._all_schemas: list[dict[str, Any]] = []
         self._categories: list[str] = []
+        self._by_category: dict[str, list[str]] = {}
+        self._by_base_class: dict[str, list[str]] = {}
+        self._by_input_type: dict[str, list[str]] = {}
+        self._by_output_type: dict[str, list[str]] = {}
+        self._search_index = NodeSearchIndex([])
+        self._compatibility = CompatibilityGraph([])
         self._loaded = False
+        self._fetched_at = 0.0
+        self._flowise_version: str | None = None
+
+        self._lock = threading.Lock()
+        self._revalidating = False
+        # Serializes catalogue downloads; reentrant for _ensure_loaded -> _refresh
+        self._load_lock = threading.RLock()
 
     def _ensure_loaded(self, force_refresh: bool = False) -> None:
-        """Ensure schemas are loaded from API.
+        """Ensure schemas are loaded, from memory, disk, or the API.
 
         Args:
-            force_refresh: Force reload even if already cached
+            force_refresh: Force reload from the API even if cached
         """
-        if self._loaded and not force_refresh:
+        if force_refresh:
+            self._refresh()
             return
 
-        self._all_schemas = self.client.list_nodes()
-
-        # Build cache indexed by node name
-        self._cache = {}
-        categories_set: set[str] = set()
+        if not self._loaded:
+            with self._load_lock:
+                # Another thread may have finished the cold load while we waited
+                if not self._loaded and self._store:
+                    stored = self._store.load()
+                    if stored and stored.age < self.ttl + self.stale_ttl:
+                        self._apply_schemas(
+                            stored.schemas, stored.flowise_version, stored.fetched_at
+                        )
+                if not self._loaded:
+                    self._refresh()
+                    return
+
+        if time.time() - self._fetched_at >= self.ttl:
+            self._start_revalidation()
+
+    def _refresh(self) -> None:
+        """Fetch the full catalogue from the API and persist it."""
+        with self._load_lock:
+            version = self._fetch_version()
+            schemas = self.client.list_nodes()
+            self._apply_schemas(schemas, version, time.time())
+            if self._store:
+                self._store.save(schemas, version, self._fetched_at)
+
+    def _fetch_version(self) -> str | None:
+        """Get the Flowise version, or None if the server does not report it."""
+        try:
+            return self.client.get_version().get("version")
+        except Exception:
+            return None
 
-        for schema in self._all_schemas:
+    def _revalidate(self) -> None:
+        """Revalidate cached schemas, refetching only if Flowise changed version."""
+        try:
+            version = self._fetch_version()
+            if version is not None and version == self._flowise_version:
+                self._fetched_at = time.time()
+                if self._store:
+                    self._store.save(self._all_schemas, version, self._fetched_at)
+            else:
+                self._refresh()
+        except Exception:
+            logger.warning("Background node schema revalidation failed", exc_info=True)
+        finally:
+            self._revalidating = False
+
+    def _start_revalidation(self) -> None:
+        """Revalidate in a background thread (stale-while-revalidate)."""
+        with self._lock:
+            if self._revalidating:
+                return
+            self._revalidating = True
+        threading.Thread(
+            target=self._revalidate, name="node-schema-revalidate", daemon=True
+        ).start()
+
+    def _apply_schemas(
+        self,
+        schemas: list[dict[str, Any]],
+        flowise_version: str | None,
+        fetched_at: float,
+    ) -> None:
+        """Install a catalogue and rebuild the lookup structures.
+
+        Lookups are built first and swapped in together so a background
+        revalidation never exposes a half-built cache.
+        """
+        # Build cache indexed by node name, plus name lists per attribute
+        cache: dict[str, dict[str, Any]] = {}
+        by_category: dict[str, list[str]] = {}
+        by_base_class: dict[str, list[str]] = {}
+        by_input_type: dict[str, list[str]] = {}
+        by_output_type: dict[str, list[str]] = {}
+
+        for schema in schemas:
             name = schema.get("name", "")
-            if name:
-                self._cache[name] = schema
-            # Collect categories
+            if not name:
+                continue
+            cache[name] = schema
+
             category = schema.get("category", "")
             if category:
-                categories_set.add(category)
-
-        self._categories = sorted(categories_set)
+                by_category.setdefault(category, []).append(name)
+
+            for base_class in schema.get("baseClasses", []):
+                by_base_class.setdefault(base_class, []).append(name)
+
+            for type_name in self._input_types(schema):
+                by_input_type.setdefault(type_name, []).append(name)
+
+            for type_name in self._output_types(schema):
+                by_output_type.setdefault(type_name, []).append(name)
+
+        search_index = NodeSearchIndex(schemas)
+        compatibility = CompatibilityGraph(schemas)
+
+        self._all_schemas = schemas
+        self._cache = cache
+        self._categories = sorted(by_category)
+        self._by_category = by_category
+        self._by_base_class = by_base_class
+        self._by_input_type = by_input_type
+        self._by_output_type = by_output_type
+        self._search_index = search_index
+        self._compatibility = compatibility
+        self._flowise_version = flowise_version
+        self._fetched_at = fetched_at
         self._loaded = True
 
     def get_all_schemas(self, force_refresh: bool = False) -> list[dict[str, Any]]:
@@ -94,6 +243,18 @@ class NodeSchemaCache:
 
         return None
 
+    def get_cached_schema(self, node_name: str) -> dict[str, Any] | None:
+        """Get a schema from the loaded catalogue only, never fetching single nodes.
+
+        Args:
+            node_name: Node name (e.g., 'chatOllama')
+
+        Returns:
+            Node schema, or None if the catalogue has no such node
+        """
+        self._ensure_loaded()
+        return self._cache.get(node_name)
+
     def get_categories(self) -> list[str]:
         """Get list of available node categories.
 
@@ -103,6 +264,10 @@ class NodeSchemaCache:
         self._ensure_loaded()
         return self._categories
 
+    def _lookup(self, index: dict[str, list[str]], key: str) -> list[dict[str, Any]]:
+        """Resolve node names from an index to their schemas."""
+        return [self._cache[name] for name in index.get(key, [])]
+
     def get_by_category(self, category: str) -> list[dict[str, Any]]:
         """Get all nodes in a specific category.
 
@@ -113,34 +278,68 @@ class NodeSchemaCache:
             List of nodes in that category
         """
         self._ensure_loaded()
-        return [s for s in self._all_schemas if s.get("category") == category]
+        return self._lookup(self._by_category, category)
 
-    def search(self, query: str) -> list[dict[str, Any]]:
-        """Search nodes by name, label, or description.
+    def get_by_base_class(self, base_class: str) -> list[dict[str, Any]]:
+        """Get all nodes that list a base class (e.g. 'BaseChatModel').
 
         Args:
-            query: Search query (case-insensitive)
+            base_class: Base class name
+
+        Returns:
+            List of nodes whose baseClasses include it
+        """
+        self._ensure_loaded()
+        return self._lookup(self._by_base_class, base_class)
+
+    def get_by_input_type(self, type_name: str) -> list[dict[str, Any]]:
+        """Get all nodes with an input anchor accepting a type.
+
+        Args:
+            type_name: Anchor type (e.g. 'BaseChatModel', 'Tool')
 
         Returns:
-            List of matching node schemas
+            List of nodes that can consume that type
         """
         self._ensure_loaded()
-        query_lower = query.lower()
+        return self._lookup(self._by_input_type, type_name)
+
+    def get_by_output_type(self, type_name: str) -> list[dict[str, Any]]:
+        """Get all nodes with an output anchor producing a type.
 
-        results = []
-        for schema in self._all_schemas:
-            name = schema.get("name", "").lower()
-            label = schema.get("label", "").lower()
-            description = schema.get("description", "").lower()
+        Args:
+            type_name: Anchor type (e.g. 'BaseChatModel', 'Tool')
 
-            if (
-                query_lower in name
-                or query_lower in label
-                or query_lower in description
-            ):
-                results.append(schema)
+        Returns:
+            List of nodes that can produce that type
+        """
+        self._ensure_loaded()
+        return self._lookup(self._by_output_type, type_name)
 
-        return results
+    def get_compatibility_graph(self) -> CompatibilityGraph:
+        """Get the anchor compatibility graph for the loaded catalogue.
+
+        Returns:
+            CompatibilityGraph built when the schemas were loaded
+        """
+        self._ensure_loaded()
+        return self._compatibility
+
+    def search(self, query: str, limit: int | None = None) -> list[dict[str, Any]]:
+        """Search nodes by name, label, category, or description.
+
+        Uses the inverted index built at load time; results are ranked by
+        BM25 relevance and tolerate prefixes and single-character typos.
+
+        Args:
+            query: Search query (case-insensitive)
+            limit: Maximum number of results (all matches if None)
+
+        Returns:
+            List of matching node schemas, most relevant first
+        """
+        self._ensure_loaded()
+        return [schema for schema, _ in self._search_index.search(query, limit)]
 
     def get_summary(
         self,
@@ -163,7 +362,7 @@ class NodeSchemaCache:
             return {"error": "Node not found"}
 
         # Split combined inputs array if needed (API format vs workflow format)
-        input_params, input_anchors = self._split_inputs(schema)
+        input_params, input_anchors = split_inputs(schema)
 
         return {
             "name": schema.get("name"),
@@ -203,33 +402,23 @@ class NodeSchemaCache:
         }
 
     @staticmethod
-    def _split_inputs(schema: dict[str, Any]) -> tuple[list[dict], list[dict]]:
-        """Split combined 'inputs' array into params and anchors.
-
-        The Flowise API returns a single 'inputs' array, but we need
-        separate inputParams (primitives) and inputAnchors (connections).
-        """
-        # Primitive types that are inputParams (not anchors)
-        primitive_types = {
-            "string", "number", "boolean", "password", "json", "code",
-            "date", "file", "folder", "options", "multiOptions",
-            "asyncOptions", "credential",
-        }
-
-        # If schema already has separate arrays, use them
-        if "inputParams" in schema and schema.get("inputParams"):
-            return schema.get("inputParams", []), schema.get("inputAnchors", [])
-
-        # Split the combined inputs array
-        inputs = schema.get("inputs", [])
-        params = []
-        anchors = []
+    def _input_types(schema: dict[str, Any]) -> set[str]:
+        """Collect the types accepted by a schema's input anchors."""
+        _, anchors = split_inputs(schema)
+        types: set[str] = set()
+        for anchor in anchors:
+            types |= parse_anchor_types(anchor.get("type", ""))
+        return types
 
-        for item in inputs:
-            item_type = item.get("type", "string")
-            if item_type.lower() in primitive_types:
-                params.append(item)
-            else:
-                anchors.append(item)
+    @staticmethod
+    def _output_types(schema: dict[str, Any]) -> set[str]:
+        """Collect the types produced by a schema's output anchors.
 
-        return params, anchors
+        Nodes without explicit output anchors expose a single default
+        output typed by their baseClasses.
+        """
+        anchors = schema.get("outputAnchors") or schema.get("outputs") or []
+        types: set[str] = set()
+        for anchor in anchors:
+            types |= output_anchor_types(anchor)
+        return types or set(schema.get("baseClasses", []))
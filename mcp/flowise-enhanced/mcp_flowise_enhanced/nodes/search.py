@@ -0,0 +1,147 @@
+"""Ranked full-text search over node schemas.
+
+Builds a token inverted index once per catalogue load and scores matches
+with BM25. Query tokens also match indexed terms by prefix and, for longer
+tokens, within one edit (symmetric-delete lookup), at a reduced weight.
+"""
+
+import bisect
+import math
+import re
+from collections import defaultdict
+from typing import Any
+
+# Field weights: a hit in the node name counts more than one in the description
+FIELD_WEIGHTS = {"name": 3.0, "label": 2.0, "category": 1.0, "description": 1.0}
+
+# Relative weight of non-exact matches
+PREFIX_WEIGHT = 0.7
+TYPO_WEIGHT = 0.5
+
+# Shortest token eligible for typo-tolerant matching
+MIN_TYPO_LENGTH = 4
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lower-case search tokens.
+
+    camelCase identifiers yield both their parts and the whole word, so
+    'chatOllama' is found by 'ollama' as well as 'chatollama'.
+    """
+    tokens: list[str] = []
+    for word in _WORD_RE.findall(text):
+        parts = _CAMEL_RE.split(word)
+        tokens.extend(p.lower() for p in parts)
+        if len(parts) > 1:
+            tokens.append(word.lower())
+    return tokens
+
+
+def _deletes(term: str) -> set[str]:
+    """All strings one character deletion away from term."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+class NodeSearchIndex:
+    """Inverted index over node name, label, category and description."""
+
+    def __init__(self, schemas: list[dict[str, Any]]):
+        """Build the index.
+
+        Args:
+            schemas: Node schemas to index (kept by reference)
+        """
+        self._schemas = schemas
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._doc_lengths: list[float] = []
+
+        for doc_id, schema in enumerate(schemas):
+            length = 0.0
+            for field_name, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(str(schema.get(field_name) or "")):
+                    postings = self._postings[token]
+                    postings[doc_id] = postings.get(doc_id, 0.0) + weight
+                    length += weight
+            self._doc_lengths.append(length)
+
+        self._avg_length = (
+            sum(self._doc_lengths) / len(self._doc_lengths) if self._doc_lengths else 0.0
+        )
+        self._vocabulary = sorted(self._postings)
+
+        self._typo_map: dict[str, set[str]] = defaultdict(set)
+        for term in self._vocabulary:
+            if len(term) >= MIN_TYPO_LENGTH:
+                self._typo_map[term].add(term)
+                for deleted in _deletes(term):
+                    self._typo_map[deleted].add(term)
+
+    def _expand(self, token: str) -> dict[str, float]:
+        """Map a query token to matching index terms and their weights."""
+        matches: dict[str, float] = {}
+
+        if len(token) >= MIN_TYPO_LENGTH:
+            candidates = set(self._typo_map.get(token, ()))
+            for deleted in _deletes(token):
+                candidates.update(self._typo_map.get(deleted, ()))
+            for term in candidates:
+                matches[term] = TYPO_WEIGHT
+
+        # Prefix matches are contiguous in the sorted vocabulary; walk them
+        # by index rather than slicing off a copy of the tail
+        vocabulary = self._vocabulary
+        for i in range(bisect.bisect_left(vocabulary, token), len(vocabulary)):
+            term = vocabulary[i]
+            if not term.startswith(token):
+                break
+            matches[term] = PREFIX_WEIGHT
+
+        if token in self._postings:
+            matches[token] = 1.0
+        return matches
+
+    def _idf(self, term: str) -> float:
+        """BM25 inverse document frequency."""
+        n = len(self._doc_lengths)
+        df = len(self._postings[term])
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, limit: int | None = None) -> list[tuple[dict[str, Any], float]]:
+        """Rank schemas against a free-text query.
+
+        Args:
+            query: Search text (case-insensitive)
+            limit: Maximum number of results (all matches if None)
+
+        Returns:
+            (schema, score) pairs, best first
+        """
+        scores: dict[int, float] = defaultdict(float)
+
+        for token in set(tokenize(query)):
+            # Per token, each document keeps its best-scoring expansion
+            best: dict[int, float] = {}
+            for term, weight in self._expand(token).items():
+                idf = self._idf(term)
+                for doc_id, tf in self._postings[term].items():
+                    norm = 1 - BM25_B + BM25_B * self._doc_lengths[doc_id] / self._avg_length
+                    score = weight * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] += score
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (-item[1], self._schemas[item[0]].get("name", "")),
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self._schemas[doc_id], score) for doc_id, score in ranked]
@@ -0,0 +1,108 @@
+"""Persistent on-disk storage for the node schema catalogue.
+
+One JSON file per Flowise endpoint holds the last fetched ``/api/v1/nodes``
+response together with the Flowise version it came from, so a cold-started
+MCP server can answer schema queries without a network round trip.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Bump when the file layout changes; older files are ignored
+SCHEMA_STORE_FORMAT = 1
+
+
+def default_cache_dir() -> Path:
+    """Resolve the cache directory (FLOWISE_SCHEMA_CACHE_DIR or XDG cache)."""
+    configured = os.environ.get("FLOWISE_SCHEMA_CACHE_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "mcp-flowise-enhanced"
+
+
+@dataclass
+class StoredSchemas:
+    """A schema catalogue loaded from disk."""
+
+    schemas: list[dict[str, Any]]
+    flowise_version: str | None
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the catalogue was last fetched or revalidated."""
+        return time.time() - self.fetched_at
+
+
+class SchemaStore:
+    """Reads and writes the schema catalogue file for one Flowise endpoint."""
+
+    def __init__(self, endpoint: str, cache_dir: Path | None = None):
+        """Initialize the store.
+
+        Args:
+            endpoint: Flowise endpoint URL the catalogue belongs to
+            cache_dir: Directory for cache files (defaults to default_cache_dir())
+        """
+        self.endpoint = endpoint
+        digest = hashlib.sha256(endpoint.encode("utf-8")).hexdigest()[:16]
+        self.path = (cache_dir or default_cache_dir()) / f"nodes-{digest}.json"
+
+    def load(self) -> StoredSchemas | None:
+        """Load the stored catalogue.
+
+        Returns:
+            StoredSchemas, or None if missing, unreadable, from another
+            endpoint, or written by an incompatible format version
+        """
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            not isinstance(payload, dict)
+            or payload.get("format") != SCHEMA_STORE_FORMAT
+            or payload.get("endpoint") != self.endpoint
+            or not isinstance(payload.get("schemas"), list)
+        ):
+            return None
+
+        return StoredSchemas(
+            schemas=payload["schemas"],
+            flowise_version=payload.get("flowise_version"),
+            fetched_at=float(payload.get("fetched_at", 0)),
+        )
+
+    def save(
+        self,
+        schemas: list[dict[str, Any]],
+        flowise_version: str | None,
+        fetched_at: float | None = None,
+    ) -> None:
+        """Atomically write the catalogue to disk.
+
+        Write failures are swallowed; the cache is an optimisation only.
+        """
+        payload = {
+            "format": SCHEMA_STORE_FORMAT,
+            "endpoint": self.endpoint,
+            "flowise_version": flowise_version,
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "schemas": schemas,
+        }
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
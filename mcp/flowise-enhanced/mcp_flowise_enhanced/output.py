@@ -0,0 +1,275 @@
+"""Output shaping for MCP tool results.
+
+Tool results are often dominated by full node schemas and flowData blobs.
+These helpers render results as pretty or compact JSON, optionally keep only
+selected fields (dotted paths or a small JSONPath subset), and cap the size
+of the rendered text with explicit truncation markers. Large results can
+instead be written to a file, with only its path and hash returned.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .config import env_int
+
+# Marker appended to shortened strings and lists
+TRUNCATION_MARKER = "...[truncated {count} {unit}]"
+
+# Smallest caps tried before falling back to a plain-text preview
+MIN_STRING_CAP = 64
+MIN_LIST_CAP = 3
+
+# Tool argument names reserved for output control on every tool
+OUTPUT_PROPERTIES: dict[str, dict[str, Any]] = {
+    "output_format": {
+        "type": "string",
+        "enum": ["pretty", "compact"],
+        "description": "JSON formatting of the result (default: server setting)",
+    },
+    "output_fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": (
+            "Keep only these dotted field paths, e.g. ['success', 'nodes.name']; "
+            "lists are traversed element-wise"
+        ),
+    },
+    "output_select": {
+        "type": "string",
+        "description": "JSONPath subset to return instead of the full result, e.g. '$.nodes[*].id'",
+    },
+    "output_max_chars": {
+        "type": "integer",
+        "description": "Cap the result size; long strings and lists are truncated with markers",
+    },
+    "output_file": {
+        "type": "string",
+        "description": (
+            "Write the full result to this file and return only its path, size and "
+            "sha256 instead of inlining it (avoids escaping large flowData blobs)"
+        ),
+    },
+}
+
+
+@dataclass(frozen=True)
+class OutputOptions:
+    """How a tool result is rendered.
+
+    Attributes:
+        compact: Use compact separators instead of indent=2
+        fields: Dotted paths to keep (None keeps everything)
+        select: JSONPath expression selecting part of the result
+        max_chars: Maximum rendered length (None for unlimited)
+        file: Path the rendered result is written to instead of being returned
+    """
+
+    compact: bool = False
+    fields: tuple[str, ...] | None = None
+    select: str | None = None
+    max_chars: int | None = None
+    file: str | None = None
+
+    @classmethod
+    def from_env(cls) -> "OutputOptions":
+        """Server-wide defaults from FLOWISE_MCP_OUTPUT and FLOWISE_MCP_MAX_CHARS."""
+        max_chars = env_int("FLOWISE_MCP_MAX_CHARS", 0)
+        return cls(
+            compact=os.environ.get("FLOWISE_MCP_OUTPUT", "pretty").lower() == "compact",
+            max_chars=max_chars or None,
+        )
+
+    def with_arguments(self, arguments: dict[str, Any]) -> "OutputOptions":
+        """Overlay per-call output_* arguments, removing them from arguments."""
+        output_format = arguments.pop("output_format", None)
+        fields = arguments.pop("output_fields", None)
+        select = arguments.pop("output_select", None)
+        max_chars = arguments.pop("output_max_chars", None)
+        file = arguments.pop("output_file", None)
+
+        options = self
+        if output_format:
+            options = replace(options, compact=output_format == "compact")
+        if fields:
+            options = replace(options, fields=tuple(fields))
+        if select:
+            options = replace(options, select=select)
+        if max_chars:
+            options = replace(options, max_chars=int(max_chars))
+        if file:
+            options = replace(options, file=file)
+        return options
+
+
+def project(data: Any, fields: tuple[str, ...] | list[str]) -> Any:
+    """Keep only the given dotted paths of data.
+
+    Lists are traversed element-wise, so 'nodes.name' keeps the name of
+    every node. Missing paths are skipped.
+    """
+    tree: dict[str, Any] = {}
+    for path in fields:
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+    return _project_tree(data, tree)
+
+
+def _project_tree(data: Any, tree: dict[str, Any]) -> Any:
+    if not tree:
+        return data
+    if isinstance(data, list):
+        return [_project_tree(item, tree) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {key: _project_tree(data[key], sub) for key, sub in tree.items() if key in data}
+
+
+_PATH_TOKEN_RE = re.compile(r"\.([^.\[\]]+)|\[(\*|-?\d+|'[^']*'|\"[^\"]*\")\]")
+
+
+def select_path(data: Any, path: str) -> Any:
+    """Evaluate a small JSONPath subset against data.
+
+    Supports '$', '.key', '[n]', '[*]', '.*' and "['key']". Paths that
+    contain a wildcard return a list of matches; others return the single
+    match (or None).
+    """
+    expression = path.strip()
+    if expression.startswith("$"):
+        expression = expression[1:]
+    if expression and expression[0] not in ".[":
+        expression = "." + expression
+
+    matches = [data]
+    wildcard = False
+    position = 0
+    while position < len(expression):
+        match = _PATH_TOKEN_RE.match(expression, position)
+        if not match:
+            raise ValueError(f"Unsupported path syntax at '{expression[position:]}' in {path!r}")
+        position = match.end()
+        key, index = match.group(1), match.group(2)
+
+        selected: list[Any] = []
+        if key == "*" or index == "*":
+            wildcard = True
+            for value in matches:
+                if isinstance(value, dict):
+                    selected.extend(value.values())
+                elif isinstance(value, list):
+                    selected.extend(value)
+        elif key is not None or index[0] in "'\"":
+            name = key if key is not None else index[1:-1]
+            selected = [v[name] for v in matches if isinstance(v, dict) and name in v]
+        else:
+            i = int(index)
+            selected = [v[i] for v in matches if isinstance(v, list) and -len(v) <= i < len(v)]
+        matches = selected
+
+    if wildcard:
+        return matches
+    return matches[0] if matches else None
+
+
+def _dumps(data: Any, compact: bool) -> str:
+    if compact:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _shorten(data: Any, string_cap: int, list_cap: int) -> Any:
+    """Shorten long strings and lists, appending truncation markers."""
+    if isinstance(data, str) and len(data) > string_cap:
+        extra = len(data) - string_cap
+        return data[:string_cap] + TRUNCATION_MARKER.format(count=extra, unit="chars")
+    if isinstance(data, list):
+        items = [_shorten(item, string_cap, list_cap) for item in data[:list_cap]]
+        if len(data) > list_cap:
+            items.append(TRUNCATION_MARKER.format(count=len(data) - list_cap, unit="items"))
+        return items
+    if isinstance(data, dict):
+        return {key: _shorten(value, string_cap, list_cap) for key, value in data.items()}
+    return data
+
+
+def write_output_file(text: str, path: str, compact: bool) -> str:
+    """Write rendered text to path and describe it instead.
+
+    Args:
+        text: Rendered result
+        path: File to write
+        compact: Render the descriptor compactly
+
+    Returns:
+        JSON with output_file, bytes and sha256, or an error if the write failed
+    """
+    encoded = text.encode("utf-8")
+    try:
+        with open(path, "wb") as f:
+            f.write(encoded)
+    except OSError as e:
+        return _dumps({"success": False, "error": f"Could not write output_file: {e}"}, compact)
+    return _dumps(
+        {
+            "output_file": path,
+            "bytes": len(encoded),
+            "sha256": hashlib.sha256(encoded).hexdigest(),
+        },
+        compact,
+    )
+
+
+def render(data: Any, options: OutputOptions) -> str:
+    """Render a tool result according to the output options.
+
+    Args:
+        data: Result object
+        options: Formatting, projection and size options
+
+    Returns:
+        JSON text no longer than options.max_chars when set (a limit
+        smaller than the truncation envelope itself cannot be honoured),
+        or a short file descriptor when options.file is set
+    """
+    if options.select:
+        try:
+            data = {"select": options.select, "result": select_path(data, options.select)}
+        except ValueError as e:
+            data = {"select": options.select, "error": str(e)}
+    elif options.fields:
+        data = project(data, options.fields)
+
+    text = _dumps(data, options.compact)
+    if options.file:
+        # The file always holds the full result; max_chars does not apply
+        return write_output_file(text, options.file, options.compact)
+
+    limit = options.max_chars
+    if not limit or len(text) <= limit:
+        return text
+
+    # Shrink the largest strings and lists first, halving caps until it fits
+    string_cap = max(limit // 2, MIN_STRING_CAP)
+    list_cap = 50
+    while string_cap >= MIN_STRING_CAP:
+        shortened = _dumps(_shorten(data, string_cap, list_cap), options.compact)
+        if len(shortened) <= limit:
+            return shortened
+        string_cap //= 2
+        list_cap = max(list_cap // 2, MIN_LIST_CAP)
+
+    # Still too large: return a plain-text preview instead of broken JSON
+    preview = {"truncated": True, "original_chars": len(text), "preview": ""}
+    budget = max(limit - len(_dumps(preview, options.compact)), 0)
+    while True:
+        preview["preview"] = text[:budget]
+        rendered = _dumps(preview, options.compact)
+        # Escaping can grow the preview; trim by the overshoot and retry
+        if len(rendered) <= limit or budget == 0:
+            return rendered
+        budget = max(budget - (len(rendered) - limit), 0)
@@ -2,60 +2,195 @@
 
 Provides tools for:
 - validate_workflow: Local + server-side validation
+- validate_many: Validate many workflows in parallel
 - wrap_workflow: Convert raw workflow to ExportData format
+- wrap_directory: Wrap a whole directory of flows and tools into one ExportData
 - create_chatflow: Create workflow via Flowise API
 - import_workflow: Import ExportData via Flowise API
+- export_workspace: Export all workspace data to a file
 - list_chatflows: List all chatflows
 - get_chatflow: Get chatflow details
+- patch_chatflow: Apply node/edge operations to an existing chatflow
 - create_prediction: Send questions to chatflows and get AI responses
+- list_node_types / get_node_schema: Browse the node catalogue
+- find_nodes_by_type: Find nodes that accept or produce a type
+- suggest_connections: Suggest compatible anchors for a node
+- create_node / create_edge: Build single nodes and edges from schemas
+- build_workflow: Build (and optionally create) a whole graph from a compact spec
+- get_server_metrics: Executor, request and cache metrics
 """
 
+import asyncio
+import contextvars
 import json
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from .api.async_client import AsyncFlowiseClient
 from .api.client import FlowiseClient
+from .api.streaming import PredictionAggregator
+from .converters import (
+    DEFAULT_CHUNK_BYTES,
+    content_hash,
+    encode_flow_data,
+    iter_exportdata,
+    wrap_directory,
+)
 from .converters import wrap_workflow as do_wrap_workflow
-from .nodes import NodeSchemaCache, create_edge, create_node_instance
-from .validators import validate_workflow_local
-
-# Global schema cache (initialized on first use)
+from .executor import ToolExecutor
+from .nodes import NodeSchemaCache, build_workflow, create_edge, create_node_instance
+from .output import OUTPUT_PROPERTIES, OutputOptions, render, write_output_file
+from .sync import Manifest, apply_patch, diff_workflows, sync_exportdata
+from .sync.deploy import SYNC_ARRAYS
+from .sync.manifest import KIND_CHATFLOW
+from .validators import (
+    ValidationResult,
+    expand_paths,
+    validate_many,
+    validate_on_server,
+    validate_workflow_local,
+)
+from .validators.batch import DEFAULT_SERVER_CONCURRENCY, DEFAULT_SERVER_RATE, worker_pool
+
+# Global clients and schema cache (initialized on first use)
+_client: FlowiseClient | None = None
+_async_client: AsyncFlowiseClient | None = None
 _schema_cache: NodeSchemaCache | None = None
 
 
+# Thread pool for blocking handlers, limited per tool class
+_executor = ToolExecutor()
+
+# Worker processes for validate_many, started on first large batch
+_validation_pool: ProcessPoolExecutor | None = None
+
+
+def _get_client() -> FlowiseClient:
+    """Get or initialize the shared, connection-pooled Flowise client."""
+    global _client
+    if _client is None:
+        _client = FlowiseClient()
+    return _client
+
+
+def _get_async_client() -> AsyncFlowiseClient:
+    """Get or initialize the shared async Flowise client used by handlers."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncFlowiseClient()
+    return _async_client
+
+
+def _get_validation_pool() -> ProcessPoolExecutor:
+    """Get or start the validate_many worker pool kept for the server's lifetime."""
+    global _validation_pool
+    if _validation_pool is None:
+        _validation_pool = worker_pool()
+    return _validation_pool
+
+
+async def _get_manifest(refresh: bool = True) -> Manifest:
+    """Load the deployment manifest, rebuilding it from the server listing.
+
+    Args:
+        refresh: List chatflows and tools again instead of reusing the
+                stored manifest (a listing downloads every flowData)
+    """
+    client = _get_async_client()
+    if not refresh:
+        manifest = await _executor.run("cpu", Manifest.load, client.endpoint)
+        if manifest is not None:
+            return manifest
+
+    chatflows, tools = await asyncio.gather(client.list_chatflows(), client.list_tools())
+    return await _executor.run("cpu", Manifest.from_server, client.endpoint, chatflows, tools)
+
+
+def _read_syncable(path: str) -> tuple[dict[str, list], dict[str, int]]:
+    """Stream an ExportData file, keeping only the arrays sync deploys.
+
+    Returns:
+        (ExportData with flows and tools, item counts of the skipped arrays)
+    """
+    exportdata: dict[str, list] = {array: [] for array in SYNC_ARRAYS}
+    ignored: dict[str, int] = {}
+    with open(path, encoding="utf-8-sig") as f:
+        for name, item in iter_exportdata(f):
+            if name in exportdata:
+                exportdata[name].append(item)
+            else:
+                ignored[name] = ignored.get(name, 0) + 1
+    return exportdata, ignored
+
+
 def _get_schema_cache() -> NodeSchemaCache:
     """Get or initialize the global schema cache."""
     global _schema_cache
     if _schema_cache is None:
-        _schema_cache = NodeSchemaCache()
+        _schema_cache = NodeSchemaCache(_get_client())
     return _schema_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 # Initialize MCP server
 server = Server("flowise-enhanced")
 
+# Minimum seconds between streamed-token progress notifications
+STREAM_PROGRESS_INTERVAL = 0.1
+
+
+# Server-wide output defaults (FLOWISE_MCP_OUTPUT, FLOWISE_MCP_MAX_CHARS),
+# overridden per call by the output_* arguments accepted by every tool
+_default_output = OutputOptions.from_env()
+_output_options: contextvars.ContextVar[OutputOptions] = contextvars.ContextVar(
+    "output_options", default=_default_output
+)
+
 
 def _json_result(data: dict[str, Any]) -> list[TextContent]:
-    """Format result as JSON text content."""
-    return [TextContent(type="text", text=json.dumps(data, indent=2))]
+    """Format result as JSON text content using the current output options."""
+    return [TextContent(type="text", text=render(data, _output_options.get()))]
+
+
+def _write_result_file(content: list[TextContent], options: OutputOptions) -> list[TextContent]:
+    """Write a rendered result to options.file and return its descriptor instead."""
+    text = write_output_file(content[0].text, options.file, options.compact)
+    return [TextContent(type="text", text=text)]
+
+
+def _compact_flow_data(args: dict[str, Any]) -> bool:
+    """Whether wrapped flowData should be compact (defaults to the output format)."""
+    return args.get("compact_flowdata", _output_options.get().compact)
+
+
+def _with_output_properties(tools: list[Tool]) -> list[Tool]:
+    """Advertise the shared output_* arguments on every tool."""
+    for tool in tools:
+        tool.inputSchema.setdefault("properties", {}).update(OUTPUT_PROPERTIES)
+    return tools
 
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools."""
-    return [
+    return _with_output_properties([
         Tool(
             name="validate_workflow",
             description=(
-                "Validate a Flowise workflow. Performs local structural validation "
-                "(nodes, edges, references) and optionally server-side validation if chatflow_id provided."
+                "Validate a Flowise workflow. Performs local structural and graph validation "
+                "(nodes, edges, references, anchor handles, fan-in, cycles, reachability), "
+                "optional offline checks against cached node schemas, and "
+                "optionally server-side validation if chatflow_id provided."
             ),
             inputSchema={
                 "type": "object",
@@ -73,10 +208,88 @@ async def list_tools() -> list[Tool]:
                         "description": "Enable strict mode for additional checks",
                         "default": False,
                     },
+                    "max_fan_in": {
+                        "type": "integer",
+                        "description": "Maximum connections into any one list input anchor (e.g. tools)",
+                    },
+                    "check_schemas": {
+                        "type": "boolean",
+                        "description": (
+                            "Check node names, versions, required inputs and anchor "
+                            "compatibility against the cached node schemas"
+                        ),
+                        "default": False,
+                    },
                 },
                 "required": ["workflow"],
             },
         ),
+        Tool(
+            name="validate_many",
+            description=(
+                "Validate many workflows at once: files matched by paths/globs and/or inline "
+                "workflows are validated locally in parallel worker processes, then optionally "
+                "on the server with rate-limited concurrent requests. Returns per-workflow "
+                "reports with timings."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Files, directories or glob patterns (e.g. 'flowise/**/*.json')",
+                    },
+                    "workflows": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string"},
+                                "workflow": {"type": "object"},
+                                "chatflow_id": {"type": "string"},
+                            },
+                            "required": ["workflow"],
+                        },
+                        "description": "Inline workflows, each with an optional name and chatflow_id",
+                    },
+                    "strict": {
+                        "type": "boolean",
+                        "description": "Enable strict mode for additional checks",
+                        "default": False,
+                    },
+                    "max_fan_in": {
+                        "type": "integer",
+                        "description": "Maximum connections into any one list input anchor",
+                    },
+                    "workers": {
+                        "type": "integer",
+                        "description": (
+                            "Worker processes for this call (default: the server's shared "
+                            "pool; small batches always run in-process)"
+                        ),
+                    },
+                    "server_validation": {
+                        "type": "boolean",
+                        "description": (
+                            "Also run server-side validation for locally valid workflows, "
+                            "matched by chatflow_id or by chatflow name"
+                        ),
+                        "default": False,
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Server validation requests in flight",
+                        "default": DEFAULT_SERVER_CONCURRENCY,
+                    },
+                    "rate": {
+                        "type": "number",
+                        "description": "Server validation requests per second (0 for unlimited)",
+                        "default": DEFAULT_SERVER_RATE,
+                    },
+                },
+            },
+        ),
         Tool(
             name="wrap_workflow",
             description=(
@@ -99,10 +312,67 @@ async def list_tools() -> list[Tool]:
                         "description": "Generate new UUID for workflow",
                         "default": True,
                     },
+                    "compact_flowdata": {
+                        "type": "boolean",
+                        "description": (
+                            "Encode flowData without indentation (default: follows output_format). "
+                            "Combine with output_file to avoid inlining the escaped flowData"
+                        ),
+                    },
                 },
                 "required": ["workflow"],
             },
         ),
+        Tool(
+            name="wrap_directory",
+            description=(
+                "Bulk-wrap every raw flow and tool JSON file in a directory (e.g. flowise/) "
+                "into one ExportData, validating and wrapping files in parallel worker processes. "
+                "Optionally writes the merged file and/or imports it in a single API call."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "directory": {
+                        "type": "string",
+                        "description": "Directory to scan",
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "description": "Glob for candidate files",
+                        "default": "*.json",
+                    },
+                    "validate": {
+                        "type": "boolean",
+                        "description": "Validate raw flows first; invalid flows are left out",
+                        "default": True,
+                    },
+                    "workers": {
+                        "type": "integer",
+                        "description": "Worker processes (default: CPU count)",
+                    },
+                    "output_path": {
+                        "type": "string",
+                        "description": "Write the merged ExportData to this file",
+                    },
+                    "import_data": {
+                        "type": "boolean",
+                        "description": "Import the merged ExportData via the Flowise API",
+                        "default": False,
+                    },
+                    "include_exportdata": {
+                        "type": "boolean",
+                        "description": "Include the merged ExportData in the result",
+                        "default": False,
+                    },
+                    "compact_flowdata": {
+                        "type": "boolean",
+                        "description": "Encode flowData without indentation (default: follows output_format)",
+                    },
+                },
+                "required": ["directory"],
+            },
+        ),
         Tool(
             name="create_chatflow",
             description=(
@@ -130,6 +400,14 @@ async def list_tools() -> list[Tool]:
                         "description": "Run local validation before creating",
                         "default": True,
                     },
+                    "sync": {
+                        "type": "boolean",
+                        "description": (
+                            "Idempotent deploy: skip if an identical flow exists, update the "
+                            "flow with the same name if it changed, otherwise create"
+                        ),
+                        "default": False,
+                    },
                 },
                 "required": ["workflow", "name"],
             },
@@ -138,7 +416,8 @@ async def list_tools() -> list[Tool]:
             name="import_workflow",
             description=(
                 "Import workflows/tools via Flowise API using ExportData format. "
-                "Use wrap_workflow first if you have raw workflow JSON."
+                "Use wrap_workflow first if you have raw workflow JSON. "
+                "Large exports can be imported from a file path in several smaller requests."
             ),
             inputSchema={
                 "type": "object",
@@ -147,8 +426,51 @@ async def list_tools() -> list[Tool]:
                         "type": "object",
                         "description": "Full ExportData structure with 15 arrays (ChatFlow, AgentFlowV2, Tool, etc.)",
                     },
+                    "path": {
+                        "type": "string",
+                        "description": "ExportData JSON file to stream instead of passing exportdata inline",
+                    },
+                    "sync": {
+                        "type": "boolean",
+                        "description": (
+                            "Idempotent deploy of ChatFlow/AgentFlowV2/Tool items: unchanged items "
+                            "are skipped, changed ones updated in place, new ones created"
+                        ),
+                        "default": False,
+                    },
+                    "dry_run": {
+                        "type": "boolean",
+                        "description": "With sync, only report the planned create/update/skip actions",
+                        "default": False,
+                    },
+                    "refresh_manifest": {
+                        "type": "boolean",
+                        "description": "With sync, re-list the server instead of reusing the stored manifest",
+                        "default": True,
+                    },
+                    "max_chunk_bytes": {
+                        "type": "integer",
+                        "description": "Split the import into requests of about this many bytes (default: one request for inline data, 8MB for files)",
+                    },
                 },
-                "required": ["exportdata"],
+            },
+        ),
+        Tool(
+            name="export_workspace",
+            description=(
+                "Export the whole Flowise workspace (flows, tools, chat history, document "
+                "store chunks) to an ExportData file on disk, streamed without loading it "
+                "into memory. Returns item counts per array."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Destination file for the ExportData JSON",
+                    },
+                },
+                "required": ["path"],
             },
         ),
         Tool(
@@ -173,6 +495,41 @@ async def list_tools() -> list[Tool]:
                 "required": ["chatflow_id"],
             },
         ),
+        Tool(
+            name="patch_chatflow",
+            description=(
+                "Apply node/edge operations to an existing chatflow instead of resending a "
+                "hand-edited flowData. The current flow is fetched (revalidated with its ETag), "
+                "patched locally, re-validated, and only updated if the content changed. "
+                "Ops: set_input {node, input, value}, set {node, path, value}, add_node {node}, "
+                "replace_node {node}, remove_node {node}, add_edge {edge}, remove_edge {edge}."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "chatflow_id": {
+                        "type": "string",
+                        "description": "The chatflow ID to patch",
+                    },
+                    "operations": {
+                        "type": "array",
+                        "items": {"type": "object"},
+                        "description": "Patch operations, e.g. [{op: 'set_input', node: 'chatOpenAI_0', input: 'temperature', value: 0.2}]",
+                    },
+                    "validate": {
+                        "type": "boolean",
+                        "description": "Reject the patch if the result fails local validation",
+                        "default": True,
+                    },
+                    "dry_run": {
+                        "type": "boolean",
+                        "description": "Report the diff without updating the chatflow",
+                        "default": False,
+                    },
+                },
+                "required": ["chatflow_id", "operations"],
+            },
+        ),
         Tool(
             name="create_prediction",
             description=(
@@ -201,6 +558,14 @@ async def list_tools() -> list[Tool]:
                             },
                         },
                     },
+                    "stream": {
+                        "type": "boolean",
+                        "description": (
+                            "Stream tokens via Flowise SSE and report them as progress "
+                            "notifications; the full text is still returned at the end"
+                        ),
+                        "default": False,
+                    },
                 },
                 "required": ["question", "chatflow_id"],
             },
@@ -220,7 +585,14 @@ async def list_tools() -> list[Tool]:
                     },
                     "search": {
                         "type": "string",
-                        "description": "Search nodes by name, label, or description",
+                        "description": (
+                            "Search nodes by name, label, or description "
+                            "(ranked; prefix and typo tolerant)"
+                        ),
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of nodes to return",
                     },
                     "refresh": {
                         "type": "boolean",
@@ -230,6 +602,57 @@ async def list_tools() -> list[Tool]:
                 },
             },
         ),
+        Tool(
+            name="find_nodes_by_type",
+            description=(
+                "Find node types by what they are or connect to, using precomputed indexes. "
+                "E.g. output_type='BaseChatModel' lists every node that can feed a model input."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "base_class": {
+                        "type": "string",
+                        "description": "Nodes whose baseClasses include this (e.g., 'BaseChatModel')",
+                    },
+                    "input_type": {
+                        "type": "string",
+                        "description": "Nodes with an input anchor accepting this type (e.g., 'Tool')",
+                    },
+                    "output_type": {
+                        "type": "string",
+                        "description": "Nodes with an output anchor producing this type",
+                    },
+                },
+            },
+        ),
+        Tool(
+            name="suggest_connections",
+            description=(
+                "Suggest compatible connections for a node type using the precomputed "
+                "compatibility graph. For an input anchor (e.g. toolAgent + 'model') lists "
+                "nodes/outputs that can feed it; for an output lists inputs it can connect to."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "node_name": {
+                        "type": "string",
+                        "description": "Node type name (e.g., 'toolAgent')",
+                    },
+                    "anchor": {
+                        "type": "string",
+                        "description": "Input or output anchor name (default: all anchors of the node)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum suggestions per anchor",
+                        "default": 25,
+                    },
+                },
+                "required": ["node_name"],
+            },
+        ),
         Tool(
             name="get_node_schema",
             description=(
@@ -290,6 +713,51 @@ async def list_tools() -> list[Tool]:
                 "required": ["node_name"],
             },
         ),
+        Tool(
+            name="build_workflow",
+            description=(
+                "Build a complete workflow (all nodes and edges) from a compact spec in one call. "
+                "Nodes are built from cached schemas, connections are type-checked, inputs are linked "
+                "and nodes are auto-laid out. Optionally creates the chatflow directly so the graph "
+                "never has to round-trip through the conversation."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "nodes": {
+                        "type": "array",
+                        "description": (
+                            "Node specs: {name, id?, inputs?, position?}, e.g. "
+                            "{name: 'chatOllama', id: 'llm', inputs: {modelName: 'qwen2.5:latest'}}"
+                        ),
+                        "items": {"type": "object"},
+                    },
+                    "connections": {
+                        "type": "array",
+                        "description": (
+                            "Connections: {from: 'nodeId[.output]', to: 'nodeId.input'}, "
+                            "e.g. {from: 'llm', to: 'agent.model'}"
+                        ),
+                        "items": {"type": "object"},
+                    },
+                    "name": {
+                        "type": "string",
+                        "description": "Workflow name (required when create is true)",
+                    },
+                    "create": {
+                        "type": "boolean",
+                        "description": "Create the chatflow in Flowise and return only its ID",
+                        "default": False,
+                    },
+                    "deployed": {
+                        "type": "boolean",
+                        "description": "Deploy immediately when creating",
+                        "default": False,
+                    },
+                },
+                "required": ["nodes"],
+            },
+        ),
         Tool(
             name="create_edge",
             description=(
@@ -324,40 +792,48 @@ async def list_tools() -> list[Tool]:
                 "required": ["source_node", "target_node", "target_input"],
             },
         ),
-    ]
+        Tool(
+            name="get_server_metrics",
+            description=(
+                "Report server internals: executor queue depth, concurrency and timings per tool "
+                "class, Flowise request retries, failures and circuit breaker state, and "
+                "response cache hits."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {},
+            },
+        ),
+    ])
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
+    arguments = dict(arguments or {})
     try:
-        if name == "validate_workflow":
-            return await handle_validate_workflow(arguments)
-        elif name == "wrap_workflow":
-            return await handle_wrap_workflow(arguments)
-        elif name == "create_chatflow":
-            return await handle_create_chatflow(arguments)
-        elif name == "import_workflow":
-            return await handle_import_workflow(arguments)
-        elif name == "list_chatflows":
-            return await handle_list_chatflows(arguments)
-        elif name == "get_chatflow":
-            return await handle_get_chatflow(arguments)
-        elif name == "create_prediction":
-            return await handle_create_prediction(arguments)
-        elif name == "list_node_types":
-            return await handle_list_node_types(arguments)
-        elif name == "get_node_schema":
-            return await handle_get_node_schema(arguments)
-        elif name == "create_node":
-            return await handle_create_node(arguments)
-        elif name == "create_edge":
-            return await handle_create_edge(arguments)
+        options = _default_output.with_arguments(arguments)
+    except (TypeError, ValueError) as e:
+        return _json_result({"error": f"Invalid output options: {e}", "tool": name})
+    # Handlers render the full result; an output_file is written afterwards
+    # in a worker thread so large results do not block the event loop
+    _output_options.set(replace(options, file=None, max_chars=None) if options.file else options)
+
+    try:
+        if name in _BLOCKING_HANDLERS:
+            handler, tool_class = _BLOCKING_HANDLERS[name]
+            content = await _executor.run(tool_class, handler, arguments)
+        elif name in _ASYNC_HANDLERS:
+            content = await _ASYNC_HANDLERS[name](arguments)
         else:
-            return _json_result({"error": f"Unknown tool: {name}"})
+            content = _json_result({"error": f"Unknown tool: {name}"})
     except Exception as e:
         logger.exception(f"Error handling tool {name}")
-        return _json_result({"error": str(e), "tool": name})
+        content = _json_result({"error": str(e), "tool": name})
+
+    if options.file:
+        return await _executor.run("cpu", _write_result_file, content, options)
+    return content
 
 
 async def handle_validate_workflow(args: dict[str, Any]) -> list[TextContent]:
@@ -366,14 +842,22 @@ async def handle_validate_workflow(args: dict[str, Any]) -> list[TextContent]:
     chatflow_id = args.get("chatflow_id")
     strict = args.get("strict", False)
 
-    # Run local validation
-    result = validate_workflow_local(workflow, strict=strict)
+    # Run local validation; schema checks may need to load the node catalogue
+    check_schemas = args.get("check_schemas", False)
+    result = await _executor.run(
+        "schema" if check_schemas else "cpu",
+        validate_workflow_local,
+        workflow,
+        strict=strict,
+        max_fan_in=args.get("max_fan_in"),
+        schemas=_get_schema_cache() if check_schemas else None,
+    )
 
     # Optionally run server validation
     if chatflow_id and result.valid:
         try:
-            client = FlowiseClient()
-            server_result = client.validate_chatflow(chatflow_id)
+            client = _get_async_client()
+            server_result = await client.validate_chatflow(chatflow_id)
             result.server_validation = server_result
             # Check if server found issues
             if server_result:
@@ -387,13 +871,103 @@ async def handle_validate_workflow(args: dict[str, Any]) -> list[TextContent]:
     return _json_result(result.to_dict())
 
 
-async def handle_wrap_workflow(args: dict[str, Any]) -> list[TextContent]:
+async def handle_validate_many(args: dict[str, Any]) -> list[TextContent]:
+    """Handle validate_many tool call."""
+    sources: list[str | dict[str, Any]] = []
+    if args.get("paths"):
+        sources.extend(await _executor.run("cpu", expand_paths, args["paths"]))
+    sources.extend(args.get("workflows") or [])
+    if not sources:
+        return _json_result({"success": False, "error": "No workflows given or no files matched"})
+
+    # An explicit worker count gets its own pool; otherwise reuse the shared one
+    workers = args.get("workers")
+    result = await _executor.run(
+        "cpu",
+        validate_many,
+        sources,
+        workers=workers,
+        strict=args.get("strict", False),
+        max_fan_in=args.get("max_fan_in"),
+        pool=None if workers else _get_validation_pool(),
+    )
+
+    if args.get("server_validation"):
+        try:
+            manifest = await _get_manifest()
+            chatflow_ids = {
+                entry.name: entry.id for entry in manifest.entries() if entry.kind == KIND_CHATFLOW
+            }
+            await validate_on_server(
+                _get_async_client(),
+                result,
+                chatflow_ids,
+                concurrency=args.get("concurrency", DEFAULT_SERVER_CONCURRENCY),
+                rate=args.get("rate", DEFAULT_SERVER_RATE),
+            )
+        except Exception as e:
+            result["success"] = False
+            result["server"] = {"error": str(e)}
+
+    return _json_result(result)
+
+
+def handle_wrap_workflow(args: dict[str, Any]) -> list[TextContent]:
     """Handle wrap_workflow tool call."""
     workflow = args.get("workflow", {})
     name = args.get("name")
     generate_id = args.get("generate_id", True)
 
-    result = do_wrap_workflow(workflow, name=name, generate_id=generate_id)
+    result = do_wrap_workflow(
+        workflow, name=name, generate_id=generate_id, compact=_compact_flow_data(args)
+    )
+    return _json_result(result)
+
+
+async def handle_wrap_directory(args: dict[str, Any]) -> list[TextContent]:
+    """Handle wrap_directory tool call."""
+    directory = args.get("directory")
+    output_path = args.get("output_path")
+
+    if not directory:
+        return _json_result({"success": False, "error": "directory is required"})
+
+    # Written item by item as workers finish; the merged ExportData is only
+    # held in memory when it is imported or returned
+    bulk = await _executor.run(
+        "cpu",
+        wrap_directory,
+        directory,
+        pattern=args.get("pattern", "*.json"),
+        workers=args.get("workers"),
+        validate=args.get("validate", True),
+        compact=_compact_flow_data(args),
+        output=output_path,
+        keep_exportdata=(
+            not output_path or args.get("import_data") or args.get("include_exportdata")
+        ),
+    )
+    exportdata = bulk.pop("exportdata", None)
+    result: dict[str, Any] = bulk
+
+    if not sum(bulk["counts"].values()):
+        result["error"] = "No valid flows or tools found"
+        return _json_result(result)
+
+    if result.pop("output_file", None):
+        result["output_path"] = output_path
+
+    if args.get("import_data"):
+        try:
+            result["api_response"] = await _get_async_client().import_data(exportdata)
+            result["imported"] = True
+        except Exception as e:
+            result["success"] = False
+            result["error"] = str(e)
+
+    if args.get("include_exportdata"):
+        result["exportdata"] = exportdata
+
     return _json_result(result)
 
 
@@ -410,7 +984,7 @@ async def handle_create_chatflow(args: dict[str, Any]) -> list[TextContent]:
     if validate_first:
         # Check if raw workflow or already wrapped
         if "nodes" in workflow and "flowData" not in workflow:
-            validation = validate_workflow_local(workflow)
+            validation = await _executor.run("cpu", validate_workflow_local, workflow)
             result["validation_result"] = validation.to_dict()
             if not validation.valid:
                 result["error"] = "Validation failed - see validation_result"
@@ -418,7 +992,9 @@ async def handle_create_chatflow(args: dict[str, Any]) -> list[TextContent]:
 
     # Wrap if needed
     if "nodes" in workflow and "flowData" not in workflow:
-        wrap_result = do_wrap_workflow(workflow, name=name, generate_id=True)
+        wrap_result = await _executor.run(
+            "cpu", do_wrap_workflow, workflow, name=name, generate_id=True, compact=True
+        )
         if not wrap_result.get("success"):
             result["error"] = wrap_result.get("error", "Failed to wrap workflow")
             return _json_result(result)
@@ -432,10 +1008,27 @@ async def handle_create_chatflow(args: dict[str, Any]) -> list[TextContent]:
     # Add deployed flag
     chatflow_data["deployed"] = deployed
 
+    if args.get("sync"):
+        try:
+            array = "AgentFlowV2" if chatflow_data.get("type") == "AGENTFLOW" else "ChatFlow"
+            manifest = await _get_manifest()
+            synced = await sync_exportdata(_get_async_client(), {array: [chatflow_data]}, manifest)
+            await _executor.run("cpu", manifest.save)
+            item = synced["items"][0]
+            result["success"] = synced["success"]
+            result["chatflow_id"] = item["id"]
+            result["action"] = item["action"]
+            result["content_hash"] = item["hash"]
+            if "error" in item:
+                result["error"] = item["error"]
+        except Exception as e:
+            result["error"] = str(e)
+        return _json_result(result)
+
     # Create via API
     try:
-        client = FlowiseClient()
-        api_response = client.create_chatflow(chatflow_data)
+        client = _get_async_client()
+        api_response = await client.create_chatflow(chatflow_data)
         result["success"] = True
         result["chatflow_id"] = api_response.get("id")
         result["api_response"] = api_response
@@ -448,9 +1041,45 @@ async def handle_create_chatflow(args: dict[str, Any]) -> list[TextContent]:
 async def handle_import_workflow(args: dict[str, Any]) -> list[TextContent]:
     """Handle import_workflow tool call."""
     exportdata = args.get("exportdata", {})
+    path = args.get("path")
+    max_chunk_bytes = args.get("max_chunk_bytes")
 
     result: dict[str, Any] = {"success": False}
 
+    if args.get("sync"):
+        try:
+            ignored: dict[str, int] = {}
+            if path:
+                exportdata, ignored = await _executor.run("cpu", _read_syncable, path)
+            manifest = await _get_manifest(args.get("refresh_manifest", True))
+            dry_run = args.get("dry_run", False)
+            result = await sync_exportdata(_get_async_client(), exportdata, manifest, dry_run)
+            if not dry_run:
+                await _executor.run("cpu", manifest.save)
+            if ignored:
+                result["ignored"] = ignored
+        except Exception as e:
+            result["error"] = str(e)
+        return _json_result(result)
+
+    if path or max_chunk_bytes:
+        try:
+            client = _get_async_client()
+            chunked = await client.import_data_chunked(
+                path or exportdata,
+                max_bytes=max_chunk_bytes or DEFAULT_CHUNK_BYTES,
+            )
+            if not chunked["chunks"]:
+                result["error"] = "ExportData is empty - no items to import"
+                return _json_result(result)
+            result["success"] = True
+            result["imported"] = chunked["counts"]
+            result["chunks"] = chunked["chunks"]
+            result["api_responses"] = chunked["responses"]
+        except Exception as e:
+            result["error"] = str(e)
+        return _json_result(result)
+
     # Count items
     counts = {
         "chatflows": len(exportdata.get("ChatFlow", [])),
@@ -463,8 +1092,8 @@ async def handle_import_workflow(args: dict[str, Any]) -> list[TextContent]:
         return _json_result(result)
 
     try:
-        client = FlowiseClient()
-        api_response = client.import_data(exportdata)
+        client = _get_async_client()
+        api_response = await client.import_data(exportdata)
         result["success"] = True
         result["imported"] = counts
         result["api_response"] = api_response
@@ -474,11 +1103,42 @@ async def handle_import_workflow(args: dict[str, Any]) -> list[TextContent]:
     return _json_result(result)
 
 
+def _count_exportdata_file(path: str) -> dict[str, int]:
+    """Count items per array in an ExportData file without loading it."""
+    counts: dict[str, int] = {}
+    with open(path, encoding="utf-8-sig") as f:
+        for name, _ in iter_exportdata(f):
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+async def handle_export_workspace(args: dict[str, Any]) -> list[TextContent]:
+    """Handle export_workspace tool call."""
+    path = args.get("path", "")
+
+    result: dict[str, Any] = {"success": False}
+
+    if not path:
+        result["error"] = "path is required"
+        return _json_result(result)
+
+    try:
+        client = _get_async_client()
+        result["bytes"] = await client.export_data_to_file(path)
+        result["counts"] = await _executor.run("cpu", _count_exportdata_file, path)
+        result["path"] = path
+        result["success"] = True
+    except Exception as e:
+        result["error"] = str(e)
+
+    return _json_result(result)
+
+
 async def handle_list_chatflows(args: dict[str, Any]) -> list[TextContent]:
     """Handle list_chatflows tool call."""
     try:
-        client = FlowiseClient()
-        chatflows = client.list_chatflows()
+        client = _get_async_client()
+        chatflows = await client.list_chatflows()
 
         # Format for readability
         summary = []
@@ -508,8 +1168,8 @@ async def handle_get_chatflow(args: dict[str, Any]) -> list[TextContent]:
         return _json_result({"success": False, "error": "chatflow_id is required"})
 
     try:
-        client = FlowiseClient()
-        chatflow = client.get_chatflow(chatflow_id)
+        client = _get_async_client()
+        chatflow = await client.get_chatflow(chatflow_id)
         return _json_result({
             "success": True,
             "chatflow": chatflow,
@@ -518,11 +1178,88 @@ async def handle_get_chatflow(args: dict[str, Any]) -> list[TextContent]:
         return _json_result({"success": False, "error": str(e)})
 
 
+def _patch_workflow(
+    workflow: dict[str, Any],
+    operations: list[dict[str, Any]],
+    validate: bool,
+) -> dict[str, Any]:
+    """Apply, validate and diff a patch (CPU work for patch_chatflow)."""
+    patched, errors = apply_patch(workflow, operations)
+    if errors:
+        return {"errors": errors}
+    if validate:
+        validation = validate_workflow_local(patched)
+        if not validation.valid:
+            return {"validation_result": validation.to_dict()}
+
+    new_hash = content_hash(patched)
+    return {
+        "changed": new_hash != content_hash(workflow),
+        "content_hash": new_hash,
+        "diff": diff_workflows(workflow, patched),
+        "flow_data": encode_flow_data(patched, compact=True),
+    }
+
+
+async def handle_patch_chatflow(args: dict[str, Any]) -> list[TextContent]:
+    """Handle patch_chatflow tool call."""
+    chatflow_id = args.get("chatflow_id")
+    operations = args.get("operations") or []
+    dry_run = args.get("dry_run", False)
+
+    if not chatflow_id:
+        return _json_result({"success": False, "error": "chatflow_id is required"})
+    if not operations:
+        return _json_result({"success": False, "error": "operations is required"})
+
+    result: dict[str, Any] = {"success": False}
+
+    try:
+        client = _get_async_client()
+        # Served by the client's response cache, revalidated with its ETag
+        chatflow = await client.get_chatflow(chatflow_id)
+
+        current = chatflow.get("flowData") or "{}"
+        workflow = json.loads(current) if isinstance(current, str) else current
+        patch = await _executor.run(
+            "cpu", _patch_workflow, workflow, operations, args.get("validate", True)
+        )
+        if "errors" in patch:
+            result["error"] = "Patch could not be applied"
+            result["errors"] = patch["errors"]
+            return _json_result(result)
+        if "validation_result" in patch:
+            result["error"] = "Patched workflow failed validation - see validation_result"
+            result["validation_result"] = patch["validation_result"]
+            return _json_result(result)
+
+        flow_data = patch.pop("flow_data")
+        updated = patch["changed"] and not dry_run
+        if updated:
+            await client.update_chatflow(chatflow_id, {"flowData": flow_data})
+
+        result.update(patch)
+        result["success"] = True
+        result["updated"] = updated
+        result["bytes"] = {
+            "flow_data_before": len(current) if isinstance(current, str) else None,
+            "flow_data_after": len(flow_data),
+            "delta": patch["diff"]["delta_bytes"],
+            "operations": len(json.dumps(operations, separators=(",", ":"))),
+            "sent": len(flow_data) if updated else 0,
+        }
+    except Exception as e:
+        result["error"] = str(e)
+
+    return _json_result(result)
+
+
 async def handle_create_prediction(args: dict[str, Any]) -> list[TextContent]:
     """Handle create_prediction tool call."""
     question = args.get("question")
     chatflow_id = args.get("chatflow_id")
     history = args.get("history")
+    stream = args.get("stream", False)
 
     if not question:
         return _json_result({"success": False, "error": "question is required"})
@@ -530,12 +1267,17 @@ async def handle_create_prediction(args: dict[str, Any]) -> list[TextContent]:
         return _json_result({"success": False, "error": "chatflow_id is required"})
 
     try:
-        client = FlowiseClient()
-        response = client.create_prediction(
-            chatflow_id=chatflow_id,
-            question=question,
-            history=history,
-        )
+        client = _get_async_client()
+        if stream:
+            response = await _stream_prediction(client, chatflow_id, question, history)
+            if response.get("error"):
+                return _json_result({"success": False, **response})
+        else:
+            response = await client.create_prediction(
+                chatflow_id=chatflow_id,
+                question=question,
+                history=history,
+            )
 
         # Extract the text response
         result: dict[str, Any] = {"success": True}
@@ -554,34 +1296,93 @@ async def handle_create_prediction(args: dict[str, Any]) -> list[TextContent]:
         return _json_result({"success": False, "error": str(e)})
 
 
-async def handle_list_node_types(args: dict[str, Any]) -> list[TextContent]:
+async def _stream_prediction(
+    client: AsyncFlowiseClient,
+    chatflow_id: str,
+    question: str,
+    history: list[dict[str, str]] | None,
+) -> dict[str, Any]:
+    """Consume a streaming prediction, forwarding tokens as progress notifications.
+
+    Tokens are batched so at most one notification is sent per
+    STREAM_PROGRESS_INTERVAL seconds. Without a progress token from the
+    caller, the stream is simply aggregated.
+
+    Returns:
+        Aggregated response with text and any sourceDocuments
+    """
+    ctx = server.request_context
+    progress_token = ctx.meta.progressToken if ctx.meta else None
+
+    aggregator = PredictionAggregator()
+    pending: list[str] = []
+    last_sent = time.monotonic()
+
+    async def flush() -> None:
+        nonlocal last_sent
+        if pending and progress_token is not None:
+            await ctx.session.send_progress_notification(
+                progress_token,
+                progress=len(aggregator.tokens),
+                message="".join(pending),
+            )
+        pending.clear()
+        last_sent = time.monotonic()
+
+    async for event in client.stream_prediction(
+        chatflow_id=chatflow_id,
+        question=question,
+        history=history,
+    ):
+        token = aggregator.add(event)
+        if token:
+            pending.append(token)
+            if time.monotonic() - last_sent >= STREAM_PROGRESS_INTERVAL:
+                await flush()
+
+    await flush()
+    return aggregator.to_response()
+
+
+def _node_overview(schema: dict[str, Any]) -> dict[str, Any]:
+    """Summarize a node schema for catalogue listings."""
+    return {
+        "name": schema.get("name"),
+        "label": schema.get("label"),
+        "category": schema.get("category"),
+        "description": schema.get("description", "")[:100],
+        "version": schema.get("version"),
+        "baseClasses": schema.get("baseClasses", []),
+    }
+
+
+def handle_list_node_types(args: dict[str, Any]) -> list[TextContent]:
     """Handle list_node_types tool call."""
     category = args.get("category")
     search = args.get("search")
     refresh = args.get("refresh", False)
+    limit = args.get("limit")
 
     try:
         cache = _get_schema_cache()
+        if refresh:
+            cache.get_all_schemas(force_refresh=True)
 
         # Get schemas based on filters
         if search:
             schemas = cache.search(search)
+            if category:
+                schemas = [s for s in schemas if s.get("category") == category]
         elif category:
             schemas = cache.get_by_category(category)
         else:
-            schemas = cache.get_all_schemas(force_refresh=refresh)
+            schemas = cache.get_all_schemas()
+
+        if limit is not None:
+            schemas = schemas[:limit]
 
         # Format for readability - return summary info
-        nodes = []
-        for schema in schemas:
-            nodes.append({
-                "name": schema.get("name"),
-                "label": schema.get("label"),
-                "category": schema.get("category"),
-                "description": schema.get("description", "")[:100],
-                "version": schema.get("version"),
-                "baseClasses": schema.get("baseClasses", []),
-            })
+        nodes = [_node_overview(schema) for schema in schemas]
 
         # Get available categories for reference
         categories = cache.get_categories()
@@ -596,7 +1397,105 @@ async def handle_list_node_types(args: dict[str, Any]) -> list[TextContent]:
         return _json_result({"success": False, "error": str(e)})
 
 
-async def handle_get_node_schema(args: dict[str, Any]) -> list[TextContent]:
+def handle_find_nodes_by_type(args: dict[str, Any]) -> list[TextContent]:
+    """Handle find_nodes_by_type tool call."""
+    base_class = args.get("base_class")
+    input_type = args.get("input_type")
+    output_type = args.get("output_type")
+
+    if not (base_class or input_type or output_type):
+        return _json_result({
+            "success": False,
+            "error": "One of base_class, input_type or output_type is required",
+        })
+
+    try:
+        cache = _get_schema_cache()
+
+        # Intersect the name sets of every filter given
+        matches: list[dict[str, Any]] | None = None
+        for lookup, value in (
+            (cache.get_by_base_class, base_class),
+            (cache.get_by_input_type, input_type),
+            (cache.get_by_output_type, output_type),
+        ):
+            if not value:
+                continue
+            found = lookup(value)
+            if matches is None:
+                matches = found
+            else:
+                names = {s.get("name") for s in found}
+                matches = [s for s in matches if s.get("name") in names]
+
+        nodes = [_node_overview(schema) for schema in matches or []]
+        return _json_result({
+            "success": True,
+            "count": len(nodes),
+            "nodes": nodes,
+        })
+    except Exception as e:
+        return _json_result({"success": False, "error": str(e)})
+
+
+def handle_suggest_connections(args: dict[str, Any]) -> list[TextContent]:
+    """Handle suggest_connections tool call."""
+    node_name = args.get("node_name")
+    anchor = args.get("anchor")
+    limit = args.get("limit", 25)
+
+    if not node_name:
+        return _json_result({"success": False, "error": "node_name is required"})
+
+    try:
+        graph = _get_schema_cache().get_compatibility_graph()
+        inputs = graph.input_anchors(node_name)
+        outputs = graph.output_anchors(node_name)
+
+        if not inputs and not outputs:
+            return _json_result({
+                "success": False,
+                "error": f"Node '{node_name}' not found or has no anchors",
+                "hint": "Use list_node_types to see available nodes",
+            })
+
+        if anchor:
+            if anchor not in inputs and anchor not in outputs:
+                return _json_result({
+                    "success": False,
+                    "error": f"Anchor '{anchor}' not found on '{node_name}'",
+                    "inputs": inputs,
+                    "outputs": outputs,
+                })
+            inputs = [a for a in inputs if a == anchor]
+            outputs = [a for a in outputs if a == anchor]
+
+        sources = {
+            name: [
+                {"node": node, "output": output}
+                for node, output in graph.sources_for(node_name, name)[:limit]
+            ]
+            for name in inputs
+        }
+        targets = {
+            name: [
+                {"node": node, "input": target_input}
+                for node, target_input in graph.targets_for(node_name, name)[:limit]
+            ]
+            for name in outputs
+        }
+
+        return _json_result({
+            "success": True,
+            "node_name": node_name,
+            "sources": sources,
+            "targets": targets,
+        })
+    except Exception as e:
+        return _json_result({"success": False, "error": str(e)})
+
+
+def handle_get_node_schema(args: dict[str, Any]) -> list[TextContent]:
     """Handle get_node_schema tool call."""
     node_name = args.get("node_name")
     summary = args.get("summary", False)
@@ -629,7 +1528,7 @@ async def handle_get_node_schema(args: dict[str, Any]) -> list[TextContent]:
         return _json_result({"success": False, "error": str(e)})
 
 
-async def handle_create_node(args: dict[str, Any]) -> list[TextContent]:
+def handle_create_node(args: dict[str, Any]) -> list[TextContent]:
     """Handle create_node tool call."""
     node_name = args.get("node_name")
     position = args.get("position")
@@ -669,7 +1568,66 @@ async def handle_create_node(args: dict[str, Any]) -> list[TextContent]:
         return _json_result({"success": False, "error": str(e)})
 
 
-async def handle_create_edge(args: dict[str, Any]) -> list[TextContent]:
+def _build_and_validate(args: dict[str, Any]) -> tuple[dict[str, Any], ValidationResult | None]:
+    """Build a workflow from a build_workflow spec and validate it (blocking)."""
+    built = build_workflow(
+        {"nodes": args["nodes"], "connections": args.get("connections", [])},
+        _get_schema_cache().get_schema,
+    )
+    if built["errors"]:
+        return built, None
+    return built, validate_workflow_local({"nodes": built["nodes"], "edges": built["edges"]})
+
+
+async def handle_build_workflow(args: dict[str, Any]) -> list[TextContent]:
+    """Handle build_workflow tool call."""
+    name = args.get("name")
+    create = args.get("create", False)
+    deployed = args.get("deployed", False)
+
+    if not args.get("nodes"):
+        return _json_result({"success": False, "error": "nodes is required"})
+    if create and not name:
+        return _json_result({"success": False, "error": "name is required when create is true"})
+
+    try:
+        built, validation = await _executor.run("schema", _build_and_validate, args)
+        if built["errors"]:
+            return _json_result({"success": False, "errors": built["errors"]})
+
+        workflow = {"nodes": built["nodes"], "edges": built["edges"]}
+        result: dict[str, Any] = {
+            "success": validation.valid,
+            "node_count": len(workflow["nodes"]),
+            "edge_count": len(workflow["edges"]),
+            "validation": validation.to_dict(),
+        }
+        if not validation.valid:
+            return _json_result(result)
+
+        if not create:
+            result["workflow"] = workflow
+            return _json_result(result)
+
+        wrap_result = await _executor.run(
+            "cpu", do_wrap_workflow, workflow, name=name, generate_id=True, compact=True
+        )
+        if not wrap_result.get("success"):
+            result["success"] = False
+            result["error"] = wrap_result.get("error", "Failed to wrap workflow")
+            return _json_result(result)
+        chatflow_data = wrap_result["wrapped"]
+        chatflow_data["deployed"] = deployed
+
+        client = _get_async_client()
+        api_response = await client.create_chatflow(chatflow_data)
+        result["chatflow_id"] = api_response.get("id")
+        return _json_result(result)
+    except Exception as e:
+        return _json_result({"success": False, "error": str(e)})
+
+
+def handle_create_edge(args: dict[str, Any]) -> list[TextContent]:
     """Handle create_edge tool call."""
     source_node = args.get("source_node")
     target_node = args.get("target_node")
@@ -727,15 +1685,72 @@ async def handle_create_edge(args: dict[str, Any]) -> list[TextContent]:
         return _json_result({"success": False, "error": str(e)})
 
 
+async def handle_get_server_metrics(args: dict[str, Any]) -> list[TextContent]:
+    """Handle get_server_metrics tool call."""
+    clients = {"async": _async_client, "sync": _client}
+    return _json_result({
+        "success": True,
+        "executor": _executor.metrics(),
+        "flowise_requests": {
+            name: client.resilience.metrics()
+            for name, client in clients.items()
+            if client is not None
+        },
+        "flowise_cache": {
+            name: client.cache.metrics()
+            for name, client in clients.items()
+            if client is not None
+        },
+    })
+
+
+# Handlers that only await network I/O run directly on the event loop
+_ASYNC_HANDLERS = {
+    "validate_workflow": handle_validate_workflow,
+    "validate_many": handle_validate_many,
+    "create_chatflow": handle_create_chatflow,
+    "wrap_directory": handle_wrap_directory,
+    "import_workflow": handle_import_workflow,
+    "export_workspace": handle_export_workspace,
+    "list_chatflows": handle_list_chatflows,
+    "get_chatflow": handle_get_chatflow,
+    "patch_chatflow": handle_patch_chatflow,
+    "create_prediction": handle_create_prediction,
+    "build_workflow": handle_build_workflow,
+    "get_server_metrics": handle_get_server_metrics,
+}
+
+# Blocking handlers run in the executor under their tool class's limit
+_BLOCKING_HANDLERS = {
+    "wrap_workflow": (handle_wrap_workflow, "cpu"),
+    "create_edge": (handle_create_edge, "cpu"),
+    "list_node_types": (handle_list_node_types, "schema"),
+    "find_nodes_by_type": (handle_find_nodes_by_type, "schema"),
+    "suggest_connections": (handle_suggest_connections, "schema"),
+    "get_node_schema": (handle_get_node_schema, "schema"),
+    "create_node": (handle_create_node, "schema"),
+}
+
+
 def main():
     """Run the MCP server."""
-    import asyncio
 
     async def run():
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(read_stream, write_stream, server.create_initialization_options())
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, server.create_initialization_options())
+        finally:
+            if _async_client is not None:
+                await _async_client.aclose()
 
-    asyncio.run(run())
+    try:
+        asyncio.run(run())
+    finally:
+        _executor.shutdown()
+        if _validation_pool is not None:
+            _validation_pool.shutdown(wait=False, cancel_futures=True)
+        if _client is not None:
+            _client.close()
 
 
 if __name__ == "__main__":
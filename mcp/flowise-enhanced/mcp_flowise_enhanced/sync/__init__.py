@@ -0,0 +1,15 @@
+"""Content-addressed sync and incremental patching of flows and tools."""
+
+from .deploy import SyncItem, plan_item, sync_exportdata
+from .manifest import Manifest, ManifestEntry
+from .patch import apply_patch, diff_workflows
+
+__all__ = [
+    "Manifest",
+    "ManifestEntry",
+    "SyncItem",
+    "apply_patch",
+    "diff_workflows",
+    "plan_item",
+    "sync_exportdata",
+]
@@ -0,0 +1,189 @@
+"""Idempotent deployment of ExportData flows and tools.
+
+Each ChatFlow, AgentFlowV2 and Tool item is hashed and compared with the
+manifest. Identical items are skipped, items whose name already exists are
+updated in place, and only new items are created, so re-deploying an
+unchanged workspace sends nothing but the listing request.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from ..converters.hashing import TOOL_HASH_FIELDS, flow_data_hash, tool_hash
+from .manifest import KIND_CHATFLOW, KIND_TOOL, Manifest, ManifestEntry
+
+# ExportData arrays handled by sync, with the manifest kind and default type
+SYNC_ARRAYS: dict[str, tuple[str, str | None]] = {
+    "ChatFlow": (KIND_CHATFLOW, "CHATFLOW"),
+    "AgentFlowV2": (KIND_CHATFLOW, "AGENTFLOW"),
+    "Tool": (KIND_TOOL, None),
+}
+
+# Caller-set chatflow settings sent along with flowData on update. They are
+# not part of the content hash: changing only these does not redeploy a flow.
+CHATFLOW_SETTING_FIELDS = (
+    "deployed", "isPublic", "category", "chatbotConfig", "apiConfig",
+    "analytic", "speechToText", "followUpPrompts",
+)
+
+ACTION_CREATE = "create"
+ACTION_UPDATE = "update"
+ACTION_SKIP = "skip"
+
+
+@dataclass
+class SyncItem:
+    """Planned (and, once applied, executed) sync step for one item."""
+
+    kind: str
+    name: str
+    hash: str
+    action: str
+    type: str | None = None
+    id: str | None = None
+    bytes: int = 0
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        result = {
+            "kind": self.kind,
+            "name": self.name,
+            "action": self.action,
+            "id": self.id,
+            "hash": self.hash,
+        }
+        if self.type:
+            result["type"] = self.type
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+def _payload(kind: str, item: dict[str, Any], flow_type: str | None) -> dict[str, Any]:
+    """Fields sent to create_*/update_* for an item."""
+    if kind == KIND_TOOL:
+        return {key: item.get(key) or "" for key in TOOL_HASH_FIELDS}
+    payload = {"name": item.get("name", ""), "flowData": item["flowData"], "type": flow_type}
+    payload.update({key: item[key] for key in CHATFLOW_SETTING_FIELDS if key in item})
+    return payload
+
+
+def plan_item(
+    manifest: Manifest,
+    kind: str,
+    item: dict[str, Any],
+    flow_type: str | None = None,
+) -> SyncItem:
+    """Decide whether an item is created, updated or skipped.
+
+    Args:
+        manifest: Manifest of the target server
+        kind: 'chatflow' or 'tool'
+        item: Wrapped ExportData item (flow with flowData, or tool)
+        flow_type: Chatflow type used when the item has none
+
+    Returns:
+        SyncItem with action and, for update/skip, the existing ID
+    """
+    if kind == KIND_TOOL:
+        content_hash = tool_hash(item)
+        flow_type = None
+    else:
+        content_hash = flow_data_hash(item["flowData"])
+        flow_type = item.get("type") or flow_type
+
+    name = item.get("name", "")
+    step = SyncItem(kind=kind, name=name, hash=content_hash, action=ACTION_CREATE, type=flow_type)
+
+    existing = manifest.find_by_hash(kind, content_hash)
+    if existing is not None:
+        step.action = ACTION_SKIP
+        step.id = existing.id
+    else:
+        existing = manifest.find_by_name(kind, name, flow_type)
+        if existing is not None:
+            step.action = ACTION_UPDATE
+            step.id = existing.id
+    return step
+
+
+async def sync_exportdata(
+    client: Any,
+    exportdata: dict[str, Any],
+    manifest: Manifest,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Create, update or skip every flow and tool in an ExportData.
+
+    The manifest is updated as items are deployed, so duplicates inside
+    the same ExportData are only sent once.
+
+    Args:
+        client: AsyncFlowiseClient
+        exportdata: ExportData with ChatFlow, AgentFlowV2 and/or Tool items
+        manifest: Manifest of the target server (modified in place)
+        dry_run: Plan only; send nothing
+
+    Returns:
+        Dict with:
+            - success: True if no item failed
+            - summary: Counts of created, updated, unchanged and failed items
+            - bytes_skipped: Payload bytes not sent because items were unchanged
+            - items: Per-item actions
+            - ignored: Items in arrays sync does not handle (e.g. ChatMessage)
+    """
+    steps: list[SyncItem] = []
+
+    for array, (kind, default_type) in SYNC_ARRAYS.items():
+        for item in exportdata.get(array) or []:
+            step = plan_item(manifest, kind, item, default_type)
+            payload = _payload(kind, item, step.type)
+            step.bytes = sum(len(str(value)) for value in payload.values())
+            steps.append(step)
+
+            if step.action != ACTION_SKIP and not dry_run:
+                try:
+                    if kind == KIND_TOOL:
+                        response = (
+                            await client.update_tool(step.id, payload)
+                            if step.action == ACTION_UPDATE
+                            else await client.create_tool(payload)
+                        )
+                    else:
+                        if step.action == ACTION_UPDATE:
+                            response = await client.update_chatflow(step.id, payload)
+                        else:
+                            response = await client.create_chatflow({**item, **payload})
+                    step.id = response.get("id", step.id)
+                except Exception as e:
+                    step.error = str(e)
+                    continue
+
+            if step.action != ACTION_SKIP:
+                # Later duplicates in this ExportData now resolve to a skip
+                manifest.add(ManifestEntry(
+                    kind=kind, id=step.id or f"pending:{step.hash}",
+                    name=step.name, hash=step.hash, type=step.type,
+                ))
+
+    ignored = {
+        array: len(items)
+        for array, items in exportdata.items()
+        if array not in SYNC_ARRAYS and items
+    }
+    failed = [s for s in steps if s.error]
+
+    return {
+        "success": not failed,
+        "dry_run": dry_run,
+        "summary": {
+            "created": sum(1 for s in steps if s.action == ACTION_CREATE and not s.error),
+            "updated": sum(1 for s in steps if s.action == ACTION_UPDATE and not s.error),
+            "unchanged": sum(1 for s in steps if s.action == ACTION_SKIP),
+            "failed": len(failed),
+        },
+        "bytes_skipped": sum(s.bytes for s in steps if s.action == ACTION_SKIP),
+        "items": [s.to_dict() for s in steps],
+        "ignored": ignored,
+    }
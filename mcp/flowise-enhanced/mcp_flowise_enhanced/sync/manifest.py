@@ -0,0 +1,170 @@
+"""Local manifest of deployed chatflows and tools, keyed by content hash.
+
+Built from one list_chatflows/list_tools call, it answers "is this exact
+flow already deployed, and if not, is there an older version with the same
+name to update" without re-uploading anything. The manifest is stored per
+endpoint next to the schema cache so later syncs can reuse it.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from ..converters.hashing import flow_data_hash, tool_hash
+from ..nodes.store import default_cache_dir
+
+# Bump when the file layout changes; older files are ignored
+MANIFEST_FORMAT = 1
+
+KIND_CHATFLOW = "chatflow"
+KIND_TOOL = "tool"
+
+
+@dataclass
+class ManifestEntry:
+    """One deployed chatflow or tool.
+
+    Attributes:
+        kind: 'chatflow' or 'tool'
+        id: Flowise ID
+        name: Display name
+        hash: Content hash (flow_data_hash or tool_hash)
+        type: Chatflow type (CHATFLOW, AGENTFLOW, ...); None for tools
+    """
+
+    kind: str
+    id: str
+    name: str
+    hash: str
+    type: str | None = None
+
+
+class Manifest:
+    """Content-hash and name indexes over the chatflows and tools on a server."""
+
+    def __init__(self, endpoint: str, built_at: float | None = None):
+        """Initialize an empty manifest.
+
+        Args:
+            endpoint: Flowise endpoint URL the manifest describes
+            built_at: When the server listing was taken (defaults to now)
+        """
+        self.endpoint = endpoint
+        self.built_at = built_at if built_at is not None else time.time()
+        self._by_id: dict[tuple[str, str], ManifestEntry] = {}
+        self._by_hash: dict[tuple[str, str], ManifestEntry] = {}
+        self._by_name: dict[tuple[str, str | None, str], ManifestEntry] = {}
+
+    @classmethod
+    def from_server(
+        cls,
+        endpoint: str,
+        chatflows: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+    ) -> "Manifest":
+        """Build a manifest from list_chatflows and list_tools responses."""
+        manifest = cls(endpoint)
+        for chatflow in chatflows:
+            if chatflow.get("id") and chatflow.get("flowData"):
+                manifest.add(ManifestEntry(
+                    kind=KIND_CHATFLOW,
+                    id=chatflow["id"],
+                    name=chatflow.get("name", ""),
+                    hash=flow_data_hash(chatflow["flowData"]),
+                    type=chatflow.get("type") or "CHATFLOW",
+                ))
+        for tool in tools:
+            if tool.get("id"):
+                manifest.add(ManifestEntry(
+                    kind=KIND_TOOL,
+                    id=tool["id"],
+                    name=tool.get("name", ""),
+                    hash=tool_hash(tool),
+                ))
+        return manifest
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def entries(self) -> list[ManifestEntry]:
+        """All entries."""
+        return list(self._by_id.values())
+
+    def add(self, entry: ManifestEntry) -> None:
+        """Add or replace the entry for entry.id."""
+        old = self._by_id.pop((entry.kind, entry.id), None)
+        if old is not None:
+            if self._by_hash.get((old.kind, old.hash)) is old:
+                del self._by_hash[(old.kind, old.hash)]
+            if self._by_name.get((old.kind, old.type, old.name)) is old:
+                del self._by_name[(old.kind, old.type, old.name)]
+
+        self._by_id[(entry.kind, entry.id)] = entry
+        self._by_hash.setdefault((entry.kind, entry.hash), entry)
+        self._by_name.setdefault((entry.kind, entry.type, entry.name), entry)
+
+    def find_by_hash(self, kind: str, content_hash: str) -> ManifestEntry | None:
+        """Entry with identical content, if any."""
+        return self._by_hash.get((kind, content_hash))
+
+    def find_by_name(self, kind: str, name: str, flow_type: str | None = None) -> ManifestEntry | None:
+        """Entry with the same kind, type and name, if any."""
+        return self._by_name.get((kind, flow_type, name))
+
+    @staticmethod
+    def default_path(endpoint: str, cache_dir: Path | None = None) -> Path:
+        """Manifest file for an endpoint inside the cache directory."""
+        digest = hashlib.sha256(endpoint.encode("utf-8")).hexdigest()[:16]
+        return (cache_dir or default_cache_dir()) / f"manifest-{digest}.json"
+
+    @classmethod
+    def load(cls, endpoint: str, path: Path | None = None) -> "Manifest | None":
+        """Load a stored manifest.
+
+        Returns:
+            Manifest, or None if missing, unreadable, from another endpoint,
+            or written by an incompatible format version
+        """
+        try:
+            with (path or cls.default_path(endpoint)).open("r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            not isinstance(payload, dict)
+            or payload.get("format") != MANIFEST_FORMAT
+            or payload.get("endpoint") != endpoint
+            or not isinstance(payload.get("entries"), list)
+        ):
+            return None
+
+        manifest = cls(endpoint, built_at=float(payload.get("built_at", 0)))
+        for entry in payload["entries"]:
+            manifest.add(ManifestEntry(**entry))
+        return manifest
+
+    def save(self, path: Path | None = None) -> None:
+        """Atomically write the manifest to disk.
+
+        Write failures are swallowed; the server listing is the source of truth.
+        """
+        path = path or self.default_path(self.endpoint)
+        payload = {
+            "format": MANIFEST_FORMAT,
+            "endpoint": self.endpoint,
+            "built_at": self.built_at,
+            "entries": [asdict(entry) for entry in self._by_id.values()],
+        }
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
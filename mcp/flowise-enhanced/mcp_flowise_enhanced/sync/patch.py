@@ -0,0 +1,175 @@
+"""Node/edge level patches for existing chatflows.
+
+Operations address nodes and edges by ID, so a one-input change is sent as
+one small operation instead of a hand-edited copy of the whole flowData.
+Patches are applied to a copy of the workflow; the caller decides whether
+the result is valid and actually different before uploading it.
+
+Supported operations:
+    {"op": "set_input", "node": id, "input": name, "value": v}
+    {"op": "set", "node": id, "path": "data.label", "value": v}
+    {"op": "add_node", "node": {...}}
+    {"op": "replace_node", "node": {...}}
+    {"op": "remove_node", "node": id}          (also removes its edges)
+    {"op": "add_edge", "edge": {...}}
+    {"op": "remove_edge", "edge": id}
+
+Edge operations also update the target node's data.inputs references
+('{{source.data.instance}}'), which Flowise uses to wire nodes at runtime.
+"""
+
+import copy
+import json
+from typing import Any
+
+from ..nodes.builder import handle_anchor, link_input, unlink_input
+
+PATCH_OPS = ("set_input", "set", "add_node", "replace_node", "remove_node", "add_edge", "remove_edge")
+
+
+def _set_path(target: dict[str, Any], path: str, value: Any) -> None:
+    """Set a dotted path inside a dict, creating intermediate dicts."""
+    parts = path.split(".")
+    for part in parts[:-1]:
+        child = target.get(part)
+        if not isinstance(child, dict):
+            child = target[part] = {}
+        target = child
+    target[parts[-1]] = value
+
+
+def apply_patch(
+    workflow: dict[str, Any],
+    operations: list[dict[str, Any]],
+) -> tuple[dict[str, Any], list[str]]:
+    """Apply node/edge operations to a copy of a workflow.
+
+    Args:
+        workflow: Raw workflow JSON with nodes/edges (not modified)
+        operations: Patch operations (see module docstring)
+
+    Returns:
+        (patched workflow, errors); any error means the patch was not
+        applied cleanly and the result should not be uploaded
+    """
+    patched = copy.deepcopy(workflow)
+    nodes: list[dict[str, Any]] = patched.setdefault("nodes", [])
+    edges: list[dict[str, Any]] = patched.setdefault("edges", [])
+    node_index = {node.get("id"): i for i, node in enumerate(nodes)}
+    errors: list[str] = []
+
+    def reindex() -> None:
+        node_index.clear()
+        node_index.update({node.get("id"): i for i, node in enumerate(nodes)})
+
+    def target_input(edge: dict[str, Any]) -> tuple[dict[str, Any], str] | tuple[None, None]:
+        """Target node and input name of an edge, if both can be resolved."""
+        target = edge.get("target")
+        input_name = handle_anchor(edge.get("targetHandle"), target, "input")
+        if target not in node_index or not input_name:
+            return None, None
+        return nodes[node_index[target]], input_name
+
+    def drop_edges(keep: Any) -> list[dict[str, Any]]:
+        """Remove edges failing keep(edge), unlinking their targets' inputs."""
+        dropped = [e for e in edges if not keep(e)]
+        edges[:] = [e for e in edges if keep(e)]
+        for edge in dropped:
+            node, input_name = target_input(edge)
+            if node is not None:
+                unlink_input(node, input_name, edge.get("source"))
+        return dropped
+
+    for i, operation in enumerate(operations):
+        op = operation.get("op")
+        where = f"Operation {i} ({op})"
+
+        if op in ("set_input", "set", "remove_node") and operation.get("node") not in node_index:
+            errors.append(f"{where}: unknown node '{operation.get('node')}'")
+            continue
+
+        if op == "set_input":
+            node = nodes[node_index[operation["node"]]]
+            node.setdefault("data", {}).setdefault("inputs", {})[operation.get("input", "")] = (
+                operation.get("value")
+            )
+        elif op == "set":
+            if not operation.get("path"):
+                errors.append(f"{where}: path is required")
+                continue
+            _set_path(nodes[node_index[operation["node"]]], operation["path"], operation.get("value"))
+        elif op in ("add_node", "replace_node"):
+            node = operation.get("node")
+            if not isinstance(node, dict) or not node.get("id"):
+                errors.append(f"{where}: node object with an id is required")
+                continue
+            exists = node["id"] in node_index
+            if op == "add_node" and exists:
+                errors.append(f"{where}: node '{node['id']}' already exists")
+                continue
+            if op == "replace_node" and not exists:
+                errors.append(f"{where}: unknown node '{node['id']}'")
+                continue
+            if exists:
+                nodes[node_index[node["id"]]] = copy.deepcopy(node)
+            else:
+                node_index[node["id"]] = len(nodes)
+                nodes.append(copy.deepcopy(node))
+        elif op == "remove_node":
+            node_id = operation["node"]
+            drop_edges(lambda e: node_id not in (e.get("source"), e.get("target")))
+            nodes.pop(node_index[node_id])
+            reindex()
+        elif op == "add_edge":
+            edge = operation.get("edge")
+            if not isinstance(edge, dict) or not edge.get("source") or not edge.get("target"):
+                errors.append(f"{where}: edge object with source and target is required")
+                continue
+            if edge.get("id") and any(e.get("id") == edge["id"] for e in edges):
+                errors.append(f"{where}: edge '{edge['id']}' already exists")
+                continue
+            edges.append(copy.deepcopy(edge))
+            node, input_name = target_input(edge)
+            if node is not None:
+                link_input(node, input_name, edge["source"])
+        elif op == "remove_edge":
+            if not drop_edges(lambda e: e.get("id") != operation.get("edge")):
+                errors.append(f"{where}: unknown edge '{operation.get('edge')}'")
+        else:
+            errors.append(f"{where}: unsupported op, expected one of {', '.join(PATCH_OPS)}")
+
+    return patched, errors
+
+
+def diff_workflows(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Summarize node and edge differences between two workflows.
+
+    Returns:
+        Dict with added/removed/changed node IDs, added/removed edge IDs,
+        and delta_bytes: the encoded size of the changed nodes and edges
+        (0 when the workflows are identical)
+    """
+    old_nodes = {n.get("id"): n for n in old.get("nodes", [])}
+    new_nodes = {n.get("id"): n for n in new.get("nodes", [])}
+    old_edges = {e.get("id"): e for e in old.get("edges", [])}
+    new_edges = {e.get("id"): e for e in new.get("edges", [])}
+
+    added = [i for i in new_nodes if i not in old_nodes]
+    removed = [i for i in old_nodes if i not in new_nodes]
+    changed = [i for i in new_nodes if i in old_nodes and new_nodes[i] != old_nodes[i]]
+    edges_added = [i for i in new_edges if i not in old_edges or new_edges[i] != old_edges[i]]
+    edges_removed = [i for i in old_edges if i not in new_edges]
+
+    delta = {
+        "nodes": [new_nodes[i] for i in added + changed],
+        "edges": [new_edges[i] for i in edges_added],
+        "removed": removed + edges_removed,
+    }
+    return {
+        "nodes_added": added,
+        "nodes_removed": removed,
+        "nodes_changed": changed,
+        "edges_added": edges_added,
+        "edges_removed": edges_removed,
+        "delta_bytes": len(json.dumps(delta, separators=(",", ":"))) if any(delta.values()) else 0,
+    }
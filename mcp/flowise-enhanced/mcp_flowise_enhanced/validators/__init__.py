@@ -1,5 +1,13 @@
 """Workflow validation for Flowise."""
 
+from .batch import expand_paths, validate_item, validate_many, validate_on_server
 from .local import ValidationResult, validate_workflow_local
 
-__all__ = ["ValidationResult", "validate_workflow_local"]
+__all__ = [
+    "ValidationResult",
+    "expand_paths",
+    "validate_item",
+    "validate_many",
+    "validate_on_server",
+    "validate_workflow_local",
+]
@@ -0,0 +1,321 @@
+"""Batch validation of many Flowise workflows.
+
+Local validation runs in worker processes, one workflow per task (small
+batches run in-process, where spawning workers would cost more than it
+saves), and server-side validate_chatflow calls for the locally valid flows are fanned
+out concurrently under a concurrency cap and a request rate limit.
+
+Usage:
+    flowise-validate 'flowise/*.json' [--server] [--json]
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from ..config import env_float, env_int
+from ..converters.types import is_raw_flow_file
+from .local import validate_workflow_local
+
+# Server-side validation limits (requests in flight, requests per second)
+DEFAULT_SERVER_CONCURRENCY = env_int("FLOWISE_VALIDATE_CONCURRENCY", 4)
+DEFAULT_SERVER_RATE = env_float("FLOWISE_VALIDATE_RATE", 10.0)
+
+# Batches up to this size are validated in-process
+DEFAULT_INPROCESS_MAX = env_int("FLOWISE_VALIDATE_INPROCESS_MAX", 8)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def validate_item(
+    source: str | dict[str, Any],
+    strict: bool = False,
+    max_fan_in: int | None = None,
+) -> dict[str, Any]:
+    """Validate one workflow file or inline workflow.
+
+    Runs in a worker process, so it takes and returns plain data only.
+
+    Args:
+        source: Path to a workflow JSON file, or a dict with 'workflow' and
+               optional 'name' and 'chatflow_id'
+        strict: Enable strict mode for additional checks
+        max_fan_in: Maximum edges into any one list input anchor
+
+    Returns:
+        Report dict with file or name, status ('valid', 'invalid',
+        'skipped' or 'error'), flow_type, errors, warnings, summary and
+        elapsed_ms (read + validate time in the worker)
+    """
+    started = time.perf_counter()
+
+    if isinstance(source, dict):
+        report: dict[str, Any] = {"name": source.get("name") or "workflow"}
+        if source.get("chatflow_id"):
+            report["chatflow_id"] = source["chatflow_id"]
+        workflow = source.get("workflow")
+    else:
+        report = {"file": source, "name": Path(source).stem}
+        try:
+            # Files saved by PowerShell often carry a UTF-8 BOM
+            with open(source, encoding="utf-8-sig") as f:
+                workflow = json.load(f)
+        except (OSError, ValueError) as e:
+            return {**report, "status": "error", "error": f"Could not read JSON: {e}",
+                    "elapsed_ms": _elapsed_ms(started)}
+
+    if not isinstance(workflow, dict) or not is_raw_flow_file(workflow):
+        return {**report, "status": "skipped", "error": "Not a raw flow (nodes/edges)",
+                "elapsed_ms": _elapsed_ms(started)}
+
+    result = validate_workflow_local(workflow, strict=strict, max_fan_in=max_fan_in)
+    return {
+        **report,
+        "status": "valid" if result.valid else "invalid",
+        "flow_type": result.flow_type,
+        "errors": result.local_errors,
+        "warnings": result.local_warnings,
+        "summary": result.summary,
+        "elapsed_ms": _elapsed_ms(started),
+    }
+
+
+def expand_paths(patterns: list[str]) -> list[str]:
+    """Expand files, directories and glob patterns into sorted JSON file paths."""
+    paths: set[str] = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.json")
+        paths.update(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+    return sorted(paths)
+
+
+def _count_statuses(result: dict[str, Any]) -> None:
+    """Set counts and success of a batch result from its reports."""
+    counts: dict[str, int] = {}
+    for report in result["files"]:
+        counts[report["status"]] = counts.get(report["status"], 0) + 1
+    result["counts"] = counts
+    result["success"] = not counts.get("invalid") and not counts.get("error")
+
+
+def worker_pool(workers: int | None = None) -> ProcessPoolExecutor:
+    """Create a process pool suitable for validate_many.
+
+    Args:
+        workers: Worker processes (defaults to CPU count)
+
+    Returns:
+        ProcessPoolExecutor using the spawn start method, which keeps
+        worker start-up safe when called from a threaded server
+    """
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, mp_context=context)
+
+
+def validate_many(
+    sources: list[str | dict[str, Any]],
+    workers: int | None = None,
+    strict: bool = False,
+    max_fan_in: int | None = None,
+    pool: Executor | None = None,
+    inprocess_max: int = DEFAULT_INPROCESS_MAX,
+) -> dict[str, Any]:
+    """Validate many workflows locally in worker processes.
+
+    Args:
+        sources: File paths and/or inline workflow dicts (see validate_item)
+        workers: Worker processes for a per-call pool (defaults to CPU
+                count; 1 runs in-process)
+        strict: Enable strict mode for additional checks
+        max_fan_in: Maximum edges into any one list input anchor
+        pool: Long-lived executor to use instead of a per-call pool
+        inprocess_max: Batches of at most this many workflows run in-process
+
+    Returns:
+        Dict with:
+            - success: True if no workflow was invalid or unreadable
+            - counts: Workflows per status
+            - elapsed_ms: Wall time of the whole batch
+            - files: Per-workflow reports, in input order
+    """
+    started = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, max(len(sources), 1))
+
+    args = (sources, [strict] * len(sources), [max_fan_in] * len(sources))
+
+    if workers <= 1 or len(sources) <= inprocess_max:
+        reports = [validate_item(source, strict, max_fan_in) for source in sources]
+    elif pool is not None:
+        reports = list(pool.map(validate_item, *args))
+    else:
+        with worker_pool(workers) as per_call:
+            reports = list(per_call.map(validate_item, *args))
+
+    result = {"elapsed_ms": _elapsed_ms(started), "files": reports}
+    _count_statuses(result)
+    return result
+
+
+class _RateLimiter:
+    """Spaces out request starts to at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def validate_on_server(
+    client: Any,
+    result: dict[str, Any],
+    chatflow_ids: dict[str, str] | None = None,
+    concurrency: int = DEFAULT_SERVER_CONCURRENCY,
+    rate: float = DEFAULT_SERVER_RATE,
+) -> dict[str, Any]:
+    """Run server-side validation for locally valid workflows.
+
+    Reports are updated in place with server_validation and server_ms; a
+    report whose server result has issues becomes 'invalid', and the
+    batch counts and success are refreshed.
+
+    Args:
+        client: AsyncFlowiseClient
+        result: Batch result from validate_many (modified in place)
+        chatflow_ids: Chatflow ID by report name, for reports without one
+        concurrency: Maximum validate_chatflow requests in flight
+        rate: Maximum requests started per second (0 for unlimited)
+
+    Returns:
+        Dict with checked, failed (request errors) and elapsed_ms, also
+        stored as result['server']
+    """
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    limiter = _RateLimiter(rate)
+    chatflow_ids = chatflow_ids or {}
+
+    async def check(report: dict[str, Any], chatflow_id: str) -> bool:
+        async with semaphore:
+            await limiter.wait()
+            request_started = time.perf_counter()
+            try:
+                server_result = await client.validate_chatflow(chatflow_id)
+            except Exception as e:
+                report["server_validation"] = [{"error": str(e)}]
+                return False
+            finally:
+                report["server_ms"] = _elapsed_ms(request_started)
+        report["chatflow_id"] = chatflow_id
+        report["server_validation"] = server_result
+        if any(item.get("issues") for item in server_result or []):
+            report["status"] = "invalid"
+        return True
+
+    tasks = []
+    for report in result["files"]:
+        chatflow_id = report.get("chatflow_id") or chatflow_ids.get(report["name"])
+        if report["status"] == "valid" and chatflow_id:
+            tasks.append(check(report, chatflow_id))
+
+    results = await asyncio.gather(*tasks)
+    _count_statuses(result)
+    result["server"] = {
+        "checked": len(results),
+        "failed": results.count(False),
+        "elapsed_ms": _elapsed_ms(started),
+    }
+    return result["server"]
+
+
+async def _server_pass(result: dict[str, Any], concurrency: int, rate: float) -> None:
+    """Resolve chatflow IDs by name and validate them on the server."""
+    from ..api.async_client import AsyncFlowiseClient
+
+    async with AsyncFlowiseClient() as client:
+        chatflow_ids = {c.get("name"): c.get("id") for c in await client.list_chatflows()}
+        await validate_on_server(client, result, chatflow_ids, concurrency, rate)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Validate many Flowise workflow JSON files in parallel."
+    )
+    parser.add_argument("paths", nargs="+", help="Files, directories or glob patterns")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--strict", action="store_true", help="Enable strict mode")
+    parser.add_argument("--max-fan-in", type=int, help="Maximum connections into a list input")
+    parser.add_argument(
+        "--server", action="store_true",
+        help="Also validate chatflows with the same name on the server (FLOWISE_API_ENDPOINT)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_SERVER_CONCURRENCY,
+        help="Server validation requests in flight",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=DEFAULT_SERVER_RATE,
+        help="Server validation requests per second (0 for unlimited)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        print("No files matched.", file=sys.stderr)
+        return 1
+
+    result = validate_many(paths, workers=args.workers, strict=args.strict, max_fan_in=args.max_fan_in)
+    if args.server:
+        asyncio.run(_server_pass(result, args.concurrency, args.rate))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for report in result["files"]:
+            detail = report.get("flow_type") or report.get("error", "")
+            print(
+                f"{report['status']:>8}  {report['elapsed_ms']:>8.1f}ms  "
+                f"{Path(report['file']).name}  {detail}",
+                file=sys.stderr,
+            )
+            for error in report.get("errors", []):
+                print(f"          - {error}", file=sys.stderr)
+            for item in report.get("server_validation") or []:
+                for issue in item.get("issues", []) or ([item["error"]] if "error" in item else []):
+                    print(f"          - server: {issue}", file=sys.stderr)
+        print(f"{result['counts']} in {result['elapsed_ms']:.0f}ms", file=sys.stderr)
+        if "server" in result:
+            server = result["server"]
+            print(
+                f"server: {server['checked']} checked, {server['failed']} failed "
+                f"in {server['elapsed_ms']:.0f}ms",
+                file=sys.stderr,
+            )
+
+    return 0 if result["success"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,18 @@
 """Local validation for Flowise workflows.
 
-Performs quick structural validation before API calls.
+Performs quick structural validation before API calls. With a node schema
+cache it also catches unknown nodes, version drift, missing required inputs
+and incompatible connections offline.
 """
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from ..converters.types import FlowType, detect_flow_type
+from ..nodes.builder import handle_anchor, split_inputs
+
+if TYPE_CHECKING:
+    from ..nodes.schema import NodeSchemaCache
 
 
 @dataclass
@@ -32,24 +38,173 @@ class ValidationResult:
         }
 
 
+# Node names that start an AgentFlow
+START_NODE_NAMES = frozenset({"startAgentflow"})
+
+# Canvas annotations, ignored by graph checks
+NOTE_NODE_TYPES = frozenset({"stickyNote"})
+
+# Node IDs listed in cycle and reachability messages
+MAX_LISTED_NODES = 10
+
+
+def _node_anchors(data: Any) -> tuple[dict[str, bool] | None, set[str] | None]:
+    """Handle IDs a node exposes, for dangling handle and fan-in checks.
+
+    Returns:
+        (input handle ID -> accepts a list, output handle IDs); either is
+        None when the node carries no anchor data to check against
+    """
+    if not isinstance(data, dict):
+        return None, None
+
+    inputs: dict[str, bool] | None = None
+    if "inputAnchors" in data or "inputParams" in data:
+        inputs = {}
+        for anchor in data.get("inputAnchors") or []:
+            inputs[anchor.get("id")] = bool(anchor.get("list"))
+        for param in data.get("inputParams") or []:
+            inputs.setdefault(param.get("id"), bool(param.get("list")))
+
+    outputs: set[str] | None = None
+    if "outputAnchors" in data:
+        outputs = set()
+        for anchor in data.get("outputAnchors") or []:
+            outputs.add(anchor.get("id"))
+            for option in anchor.get("options") or []:
+                outputs.add(option.get("id"))
+
+    return inputs, outputs
+
+
+def _format_nodes(node_ids: list[str]) -> str:
+    """Comma-separated node IDs, shortened past MAX_LISTED_NODES."""
+    shown = ", ".join(node_ids[:MAX_LISTED_NODES])
+    if len(node_ids) > MAX_LISTED_NODES:
+        shown += f" (+{len(node_ids) - MAX_LISTED_NODES} more)"
+    return shown
+
+
+def _cycle_nodes(
+    node_ids: list[str],
+    outgoing: dict[str, list[str]],
+    incoming: dict[str, list[str]],
+) -> list[str]:
+    """Nodes on (or between) cycles, in O(V + E).
+
+    Repeatedly strips nodes without incoming edges, then nodes without
+    outgoing edges; whatever survives both passes lies on a cycle.
+    """
+    remaining = set(node_ids)
+    for forward, backward in ((incoming, outgoing), (outgoing, incoming)):
+        degree = {n: sum(1 for m in forward[n] if m in remaining) for n in remaining}
+        queue = [n for n, d in degree.items() if d == 0]
+        while queue:
+            node = queue.pop()
+            remaining.discard(node)
+            for neighbour in backward[node]:
+                if neighbour in remaining:
+                    degree[neighbour] -= 1
+                    if degree[neighbour] == 0:
+                        queue.append(neighbour)
+    return [n for n in node_ids if n in remaining]
+
+
+def _reachable(roots: list[str], neighbours: dict[str, list[str]]) -> set[str]:
+    """Nodes reachable from roots."""
+    seen = set(roots)
+    stack = list(roots)
+    while stack:
+        for neighbour in neighbours[stack.pop()]:
+            if neighbour not in seen:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return seen
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _check_node_schema(
+    node_id: str,
+    data: dict[str, Any],
+    schema: dict[str, Any],
+    errors: list[str],
+    warnings: list[str],
+) -> list[str]:
+    """Check one node against its schema.
+
+    Returns:
+        Names of required input anchors, checked once edges are indexed
+    """
+    name = data.get("name")
+    version = data.get("version")
+    current = schema.get("version")
+    if isinstance(version, (int, float)) and isinstance(current, (int, float)):
+        if version < current:
+            warnings.append(
+                f"Node '{node_id}' uses {name} version {version}; the server has version {current}"
+            )
+        elif version > current:
+            errors.append(
+                f"Node '{node_id}' uses {name} version {version}, newer than the server's {current}"
+            )
+
+    params, anchors = split_inputs(schema)
+    inputs = data.get("inputs") or {}
+    for param in params:
+        # Credentials live outside inputs; show/hide params may not apply
+        if (
+            param.get("optional")
+            or param.get("type") == "credential"
+            or "show" in param
+            or "hide" in param
+        ):
+            continue
+        param_name = param.get("name")
+        if _is_empty(inputs.get(param_name)) and _is_empty(param.get("default")):
+            errors.append(f"Node '{node_id}' is missing required input '{param_name}'")
+
+    return [a.get("name") for a in anchors if not a.get("optional")]
+
+
 def validate_workflow_local(
     workflow: dict[str, Any],
     strict: bool = False,
+    max_fan_in: int | None = None,
+    schemas: "NodeSchemaCache | None" = None,
 ) -> ValidationResult:
     """Perform local structural validation on a workflow.
 
+    Nodes and edges are each visited once to build ID, anchor and adjacency
+    indexes; the graph checks then run in linear time over those indexes.
+
     Validates:
     - nodes array exists and non-empty
     - edges array exists
     - Each node has: id, type, position, data
     - Each edge has: source, target, id
     - Edge source/target nodes exist
+    - Edge sourceHandle/targetHandle match the nodes' anchor IDs
+    - Single-connection input anchors have at most one incoming edge
+    - No cycles
+    - Every node is connected (CHATFLOW) or reachable from Start (AGENTFLOW)
     - Flow type detection
     - AgentFlow: exactly one Start node
 
+    With schemas, also (in the same passes):
+    - Node names exist in the Flowise catalogue
+    - Node versions match the catalogue
+    - Required input parameters are set and required anchors connected
+    - Edges connect type-compatible anchors
+
     Args:
         workflow: Raw workflow JSON with nodes/edges
         strict: Enable strict mode for additional checks
+        max_fan_in: Maximum edges into any one list input anchor (None for unlimited)
+        schemas: Node schema cache for schema-aware checks (skipped with a
+                warning if the catalogue cannot be loaded)
 
     Returns:
         ValidationResult with errors, warnings, and summary
@@ -57,6 +212,14 @@ def validate_workflow_local(
     errors: list[str] = []
     warnings: list[str] = []
 
+    compatibility = None
+    if schemas is not None:
+        try:
+            compatibility = schemas.get_compatibility_graph()
+        except Exception as e:
+            warnings.append(f"Schema checks skipped: could not load node schemas ({e})")
+            schemas = None
+
     # Check for nodes array
     nodes = workflow.get("nodes")
     if nodes is None:
@@ -93,6 +256,7 @@ def validate_workflow_local(
     edges = workflow.get("edges")
     if edges is None:
         errors.append("Missing 'edges' array")
+        edges = []
     elif not isinstance(edges, list):
         errors.append("'edges' must be an array")
         edges = []
@@ -101,23 +265,33 @@ def validate_workflow_local(
         if len(edges) == 0 and len(nodes) > 1:
             warnings.append("Workflow has multiple nodes but no edges")
 
-    # Collect node IDs for reference checking
-    node_ids: set[str] = set()
+    # Single pass over nodes: IDs, types, anchors, containment
+    node_ids: list[str] = []
+    seen: set[str] = set()
     node_types: dict[str, str] = {}  # id -> type mapping
+    input_handles: dict[str, dict[str, bool]] = {}
+    output_handles: dict[str, set[str]] = {}
+    children: dict[str, list[str]] = {}
+    start_ids: list[str] = []
+    note_ids: set[str] = set()
+    node_names: dict[str, str] = {}
+    required_anchors: dict[str, list[str]] = {}
 
-    # Validate each node
     for i, node in enumerate(nodes):
         if not isinstance(node, dict):
             errors.append(f"Node at index {i} is not an object")
             continue
 
         node_id = node.get("id")
+        duplicate = False
         if not node_id:
             errors.append(f"Node at index {i} missing 'id'")
+        elif node_id in seen:
+            errors.append(f"Duplicate node ID: {node_id}")
+            duplicate = True
         else:
-            if node_id in node_ids:
-                errors.append(f"Duplicate node ID: {node_id}")
-            node_ids.add(node_id)
+            seen.add(node_id)
+            node_ids.append(node_id)
 
         node_type = node.get("type")
         if not node_type:
@@ -127,6 +301,8 @@ def validate_workflow_local(
                 warnings.append(f"Node '{node_id}' missing 'type'")
         else:
             node_types[node_id] = node_type
+            if node_type in NOTE_NODE_TYPES:
+                note_ids.add(node_id)
 
         # Position check (optional but expected)
         position = node.get("position")
@@ -141,59 +317,173 @@ def validate_workflow_local(
             if strict:
                 warnings.append(f"Node '{node_id}' missing 'data'")
 
-    # Validate each edge
+        if not node_id or duplicate:
+            continue
+        # Nodes without anchor data accept any handle
+        inputs, outputs = _node_anchors(data)
+        if inputs is not None:
+            input_handles[node_id] = inputs
+        if outputs is not None:
+            output_handles[node_id] = outputs
+
+        name = data.get("name", "") if isinstance(data, dict) else ""
+        if name in START_NODE_NAMES or "start" in (node_type or "").lower():
+            start_ids.append(node_id)
+
+        if schemas is not None and name and node_type not in NOTE_NODE_TYPES:
+            schema = schemas.get_cached_schema(name)
+            if schema is None:
+                errors.append(f"Node '{node_id}' uses unknown node type '{name}'")
+            else:
+                node_names[node_id] = name
+                required = _check_node_schema(node_id, data, schema, errors, warnings)
+                if required:
+                    required_anchors[node_id] = required
+        parent = node.get("parentNode")
+        if parent:
+            children.setdefault(parent, []).append(node_id)
+
+    known = seen
+    outgoing: dict[str, list[str]] = {n: [] for n in node_ids}
+    incoming: dict[str, list[str]] = {n: [] for n in node_ids}
+    fan_in: dict[tuple[str, str], int] = {}
+    connections: set[tuple[Any, ...]] = set()
+    connected_inputs: set[tuple[str, str | None]] = set()
+
+    # Single pass over edges: references, handles, adjacency, fan-in
     edge_ids: set[str] = set()
-    if edges:
-        for i, edge in enumerate(edges):
-            if not isinstance(edge, dict):
-                errors.append(f"Edge at index {i} is not an object")
-                continue
-
-            edge_id = edge.get("id")
-            if not edge_id:
-                if strict:
-                    errors.append(f"Edge at index {i} missing 'id'")
+    for i, edge in enumerate(edges):
+        if not isinstance(edge, dict):
+            errors.append(f"Edge at index {i} is not an object")
+            continue
+
+        edge_id = edge.get("id")
+        if not edge_id:
+            if strict:
+                errors.append(f"Edge at index {i} missing 'id'")
+        else:
+            if edge_id in edge_ids:
+                errors.append(f"Duplicate edge ID: {edge_id}")
+            edge_ids.add(edge_id)
+
+        label = edge_id or i
+        source = edge.get("source")
+        target = edge.get("target")
+        source_handle = edge.get("sourceHandle")
+        target_handle = edge.get("targetHandle")
+
+        if not source:
+            errors.append(f"Edge '{label}' missing 'source'")
+        elif source not in known:
+            errors.append(f"Edge '{label}' references non-existent source node: {source}")
+
+        if not target:
+            errors.append(f"Edge '{label}' missing 'target'")
+        elif target not in known:
+            errors.append(f"Edge '{label}' references non-existent target node: {target}")
+
+        if source not in known or target not in known:
+            continue
+
+        outgoing[source].append(target)
+        incoming[target].append(source)
+        # Any edge satisfies a required input, even from a node without a schema
+        connected_inputs.add((target, handle_anchor(target_handle, target, "input")))
+
+        outputs = output_handles.get(source)
+        if source_handle and outputs is not None and source_handle not in outputs:
+            errors.append(
+                f"Edge '{label}' uses unknown sourceHandle '{source_handle}' on node '{source}'"
+            )
+
+        inputs = input_handles.get(target)
+        if target_handle and inputs is not None and target_handle != target:
+            if target_handle not in inputs:
+                errors.append(
+                    f"Edge '{label}' uses unknown targetHandle '{target_handle}' on node '{target}'"
+                )
             else:
-                if edge_id in edge_ids:
-                    errors.append(f"Duplicate edge ID: {edge_id}")
-                edge_ids.add(edge_id)
+                key = (target, target_handle)
+                fan_in[key] = fan_in.get(key, 0) + 1
 
-            source = edge.get("source")
-            target = edge.get("target")
+        if compatibility is not None and source in node_names and target in node_names:
+            input_name = handle_anchor(target_handle, target, "input")
+            output_name = handle_anchor(source_handle, source, "output")
+            source_name, target_name = node_names[source], node_names[target]
+            if (
+                output_name in compatibility.output_anchors(source_name)
+                and input_name in compatibility.input_anchors(target_name)
+                and not compatibility.is_compatible(source_name, output_name, target_name, input_name)
+            ):
+                errors.append(
+                    f"Edge '{label}' connects incompatible anchors: "
+                    f"{source}.{output_name} ({source_name}) -> {target}.{input_name} ({target_name})"
+                )
 
-            if not source:
-                errors.append(f"Edge '{edge_id or i}' missing 'source'")
-            elif source not in node_ids:
-                errors.append(f"Edge '{edge_id or i}' references non-existent source node: {source}")
+        connection = (source, source_handle, target, target_handle)
+        if connection in connections:
+            warnings.append(f"Edge '{label}' duplicates another connection {source} -> {target}")
+        connections.add(connection)
 
-            if not target:
-                errors.append(f"Edge '{edge_id or i}' missing 'target'")
-            elif target not in node_ids:
-                errors.append(f"Edge '{edge_id or i}' references non-existent target node: {target}")
+    # Per-anchor fan-in limits
+    for (target, handle), count in fan_in.items():
+        if not input_handles[target][handle] and count > 1:
+            errors.append(
+                f"Input '{handle}' on node '{target}' accepts one connection but has {count}"
+            )
+        elif max_fan_in is not None and count > max_fan_in:
+            errors.append(
+                f"Input '{handle}' on node '{target}' has {count} connections (limit {max_fan_in})"
+            )
+
+    # Required anchors need at least one connection
+    for node_id, anchor_names in required_anchors.items():
+        for anchor_name in anchor_names:
+            if (node_id, anchor_name) not in connected_inputs:
+                errors.append(f"Node '{node_id}' requires a connection to input '{anchor_name}'")
+
+    # Cycle detection
+    cycle = _cycle_nodes(node_ids, outgoing, incoming)
+    if cycle:
+        errors.append(f"Cycle detected among nodes: {_format_nodes(cycle)}")
 
-    # Detect flow type
     flow_type = detect_flow_type(workflow)
+    graph_nodes = [n for n in node_ids if n not in note_ids]
+    unreachable: list[str] = []
 
-    # AgentFlow-specific checks
     if flow_type == FlowType.AGENTFLOW:
-        start_nodes = [
-            nid for nid, ntype in node_types.items()
-            if ntype in ("startAgentFlow", "start", "agentFlow")
-            and "start" in ntype.lower()
-        ]
-        # More lenient check - look for nodes that might be start nodes
-        potential_starts = [
-            nid for nid, ntype in node_types.items()
-            if "start" in ntype.lower()
-        ]
-        if not potential_starts:
+        if not start_ids:
             warnings.append("AgentFlow may be missing a Start node")
+        else:
+            if len(start_ids) > 1:
+                warnings.append(f"AgentFlow has {len(start_ids)} Start nodes: {_format_nodes(start_ids)}")
+            # Nodes inside an iteration are entered through their parent
+            forward = {n: outgoing[n] + children.get(n, []) for n in node_ids}
+            reached = _reachable(start_ids, forward)
+            unreachable = [n for n in graph_nodes if n not in reached]
+            if unreachable:
+                warnings.append(f"Nodes unreachable from the Start node: {_format_nodes(unreachable)}")
+    elif edges and len(graph_nodes) > 1:
+        # Chatflows run as one dependency graph; find the largest connected component
+        undirected = {n: outgoing[n] + incoming[n] for n in node_ids}
+        unvisited = set(graph_nodes)
+        largest: set[str] = set()
+        while unvisited:
+            component = _reachable([unvisited.pop()], undirected)
+            unvisited -= component
+            if len(component) > len(largest):
+                largest = component
+        unreachable = [n for n in graph_nodes if n not in largest]
+        if unreachable:
+            warnings.append(f"Nodes not connected to the main flow: {_format_nodes(unreachable)}")
 
     # Summary
     summary = {
         "node_count": len(nodes),
-        "edge_count": len(edges) if edges else 0,
+        "edge_count": len(edges),
         "node_types": len(set(node_types.values())),
+        "cycle_nodes": len(cycle),
+        "unreachable_nodes": len(unreachable),
     }
 
     return ValidationResult(
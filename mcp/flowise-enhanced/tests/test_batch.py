@@ -0,0 +1,42 @@
+"""Tests for validators.batch.validate_many."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from mcp_flowise_enhanced.validators.batch import validate_many
+
+
+def _source(name: str, workflow: object) -> dict:
+    return {"name": name, "workflow": workflow}
+
+
+def _sources() -> list[dict]:
+    return [
+        _source("empty", {"nodes": [], "edges": []}),
+        _source("not-a-flow", {"chatflows": []}),
+    ]
+
+
+class _CountingPool(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.batches = 0
+
+    def map(self, *args, **kwargs):
+        self.batches += 1
+        return super().map(*args, **kwargs)
+
+
+def test_small_batches_run_in_process():
+    with _CountingPool() as pool:
+        result = validate_many(_sources(), workers=4, pool=pool)
+        assert pool.batches == 0
+    assert [r["name"] for r in result["files"]] == ["empty", "not-a-flow"]
+    assert result["files"][1]["status"] == "skipped"
+
+
+def test_large_batches_use_the_given_pool():
+    with _CountingPool() as pool:
+        result = validate_many(_sources(), workers=4, pool=pool, inprocess_max=1)
+        assert pool.batches == 1
+    assert [r["name"] for r in result["files"]] == ["empty", "not-a-flow"]
+    assert result["counts"].get("skipped") == 1
@@ -0,0 +1,111 @@
+"""Tests for nodes.builder connection checks and build_workflow."""
+
+from mcp_flowise_enhanced.nodes.builder import (
+    build_workflow,
+    create_node_instance,
+    validate_connection,
+)
+from mcp_flowise_enhanced.nodes.compat import CompatibilityGraph
+
+SCHEMAS = {
+    "chatOllama": {
+        "name": "chatOllama",
+        "label": "ChatOllama",
+        "baseClasses": ["ChatOllama", "BaseChatModel"],
+        "inputs": [{"name": "modelName", "type": "string"}],
+    },
+    "calculator": {
+        "name": "calculator",
+        "label": "Calculator",
+        "baseClasses": ["Calculator", "Tool"],
+        "inputs": [],
+    },
+    "toolAgent": {
+        "name": "toolAgent",
+        "label": "Tool Agent",
+        "baseClasses": ["AgentExecutor"],
+        "inputs": [
+            {"name": "tools", "type": "Tool", "list": True},
+            {"name": "model", "type": "BaseChatModel"},
+        ],
+    },
+}
+
+
+def _instance(name: str, node_id: str) -> dict:
+    return create_node_instance(SCHEMAS[name], node_id)
+
+
+def test_validate_connection_matches_graph():
+    llm = _instance("chatOllama", "llm")
+    agent = _instance("toolAgent", "agent")
+    graph = CompatibilityGraph(list(SCHEMAS.values()))
+
+    for target_input in ("model", "tools"):
+        result = validate_connection(llm, agent, target_input)
+        assert result["valid"] == graph.is_compatible(
+            "chatOllama", "chatOllama", "toolAgent", target_input
+        )
+
+
+def test_validate_connection_reports_mismatch():
+    result = validate_connection(_instance("chatOllama", "llm"), _instance("toolAgent", "agent"), "tools")
+    assert not result["valid"]
+    assert result["target_types"] == ["Tool"]
+    assert "Type mismatch" in result["error"]
+
+
+def test_validate_connection_unknown_anchors():
+    llm = _instance("chatOllama", "llm")
+    agent = _instance("toolAgent", "agent")
+    assert validate_connection(llm, agent, "memory")["error"] == "Target input 'memory' not found"
+    assert validate_connection(llm, agent, "model", "other")["error"] == "Source output 'other' not found"
+
+
+def test_build_workflow_links_inputs():
+    spec = {
+        "nodes": [
+            {"name": "chatOllama", "id": "llm"},
+            {"name": "calculator", "id": "calc"},
+            {"name": "toolAgent", "id": "agent"},
+        ],
+        "connections": [
+            {"from": "llm", "to": "agent.model"},
+            {"from": "calc", "to": "agent.tools"},
+        ],
+    }
+    workflow = build_workflow(spec, SCHEMAS.get)
+    assert workflow["errors"] == []
+    assert len(workflow["edges"]) == 2
+    agent = next(n for n in workflow["nodes"] if n["id"] == "agent")
+    assert agent["data"]["inputs"]["model"] == "{{llm.data.instance}}"
+    assert agent["data"]["inputs"]["tools"] == ["{{calc.data.instance}}"]
+
+
+def test_build_workflow_resolves_dotted_ids():
+    spec = {
+        "nodes": [
+            {"name": "chatOllama", "id": "team.llm"},
+            {"name": "toolAgent", "id": "team.agent"},
+        ],
+        "connections": [{"from": "team.llm.chatOllama", "to": "team.agent.model"}],
+    }
+    workflow = build_workflow(spec, SCHEMAS.get)
+    assert workflow["errors"] == []
+    assert workflow["edges"][0]["source"] == "team.llm"
+    assert workflow["edges"][0]["target"] == "team.agent"
+
+
+def test_build_workflow_reports_unknown_refs():
+    spec = {
+        "nodes": [{"name": "chatOllama", "id": "llm"}, {"name": "toolAgent", "id": "agent"}],
+        "connections": [
+            {"from": "llm", "to": "missing.model"},
+            {"from": "llm", "to": "agent"},
+        ],
+    }
+    errors = build_workflow(spec, SCHEMAS.get)["errors"]
+    assert errors == [
+        "Connection at index 0 references unknown node: missing.model",
+        "Connection at index 1 'to' must name an input: 'agent.<input>'",
+    ]
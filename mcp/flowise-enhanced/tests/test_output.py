@@ -0,0 +1,35 @@
+"""Tests for output rendering options."""
+
+import json
+
+from mcp_flowise_enhanced.output import OutputOptions, render
+
+DATA = {"name": "Déjà vu ☃", "items": list(range(100)), "text": "x" * 5000}
+
+
+def test_compact_and_pretty_encode_text_alike():
+    for compact in (True, False):
+        text = render({"name": DATA["name"]}, OutputOptions(compact=compact))
+        assert "Déjà vu ☃" in text
+        assert json.loads(text) == {"name": DATA["name"]}
+
+
+def test_max_chars_keeps_valid_json():
+    for compact in (True, False):
+        text = render(DATA, OutputOptions(compact=compact, max_chars=600))
+        assert len(text) <= 600
+        json.loads(text)
+
+
+def test_fields_and_select():
+    assert json.loads(render(DATA, OutputOptions(fields=("name",)))) == {"name": DATA["name"]}
+    selected = json.loads(render(DATA, OutputOptions(select="$.items[0]")))
+    assert selected["select"] == "$.items[0]"
+
+
+def test_output_file_holds_full_result(tmp_path):
+    path = tmp_path / "result.json"
+    descriptor = json.loads(render(DATA, OutputOptions(file=str(path), max_chars=100)))
+    assert descriptor["output_file"] == str(path)
+    assert json.loads(path.read_text(encoding="utf-8")) == DATA
+    assert descriptor["bytes"] == path.stat().st_size
@@ -0,0 +1,124 @@
+"""Tests for sync.patch node/edge operations."""
+
+from mcp_flowise_enhanced.sync.patch import apply_patch, diff_workflows
+
+AGENT_TOOLS = "agent-input-tools-Tool"
+AGENT_MODEL = "agent-input-model-BaseChatModel"
+
+
+def _node(node_id: str, anchors: list[dict] | None = None, inputs: dict | None = None) -> dict:
+    return {
+        "id": node_id,
+        "type": "customNode",
+        "position": {"x": 0, "y": 0},
+        "data": {
+            "id": node_id,
+            "name": node_id,
+            "inputAnchors": anchors or [],
+            "inputs": inputs or {},
+            "outputAnchors": [{"id": f"{node_id}-output-{node_id}-X", "name": node_id}],
+        },
+    }
+
+
+def _edge(source: str, handle: str) -> dict:
+    return {
+        "id": f"{source}->{handle}",
+        "source": source,
+        "sourceHandle": f"{source}-output-{source}-X",
+        "target": "agent",
+        "targetHandle": handle,
+    }
+
+
+def _workflow() -> dict:
+    agent = _node(
+        "agent",
+        anchors=[
+            {"id": AGENT_TOOLS, "name": "tools", "list": True},
+            {"id": AGENT_MODEL, "name": "model"},
+        ],
+        inputs={
+            "tools": ["{{calc.data.instance}}"],
+            "model": "{{llm.data.instance}}",
+            "systemMessage": "hi",
+        },
+    )
+    return {
+        "nodes": [_node("llm"), _node("calc"), _node("search"), agent],
+        "edges": [_edge("llm", AGENT_MODEL), _edge("calc", AGENT_TOOLS)],
+    }
+
+
+def _inputs(workflow: dict, node_id: str = "agent") -> dict:
+    return next(n for n in workflow["nodes"] if n["id"] == node_id)["data"]["inputs"]
+
+
+def test_add_edge_links_list_input():
+    patched, errors = apply_patch(
+        _workflow(), [{"op": "add_edge", "edge": _edge("search", AGENT_TOOLS)}]
+    )
+    assert errors == []
+    assert _inputs(patched)["tools"] == ["{{calc.data.instance}}", "{{search.data.instance}}"]
+
+
+def test_add_edge_replaces_single_input():
+    patched, errors = apply_patch(
+        _workflow(), [{"op": "add_edge", "edge": _edge("search", AGENT_MODEL)}]
+    )
+    assert errors == []
+    assert _inputs(patched)["model"] == "{{search.data.instance}}"
+
+
+def test_remove_edge_unlinks_input():
+    workflow = _workflow()
+    patched, errors = apply_patch(
+        workflow,
+        [
+            {"op": "remove_edge", "edge": f"calc->{AGENT_TOOLS}"},
+            {"op": "remove_edge", "edge": f"llm->{AGENT_MODEL}"},
+        ],
+    )
+    assert errors == []
+    assert patched["edges"] == []
+    assert _inputs(patched)["tools"] == []
+    assert _inputs(patched)["model"] == ""
+    assert _inputs(patched)["systemMessage"] == "hi"
+    # The input workflow is left untouched
+    assert _inputs(workflow)["model"] == "{{llm.data.instance}}"
+
+
+def test_remove_node_unlinks_its_edges():
+    patched, errors = apply_patch(_workflow(), [{"op": "remove_node", "node": "calc"}])
+    assert errors == []
+    assert [n["id"] for n in patched["nodes"]] == ["llm", "search", "agent"]
+    assert [e["source"] for e in patched["edges"]] == ["llm"]
+    assert _inputs(patched)["tools"] == []
+    assert _inputs(patched)["model"] == "{{llm.data.instance}}"
+
+
+def test_unknown_references_are_errors():
+    _, errors = apply_patch(
+        _workflow(),
+        [
+            {"op": "remove_node", "node": "ghost"},
+            {"op": "remove_edge", "edge": "ghost"},
+            {"op": "bogus"},
+        ],
+    )
+    assert len(errors) == 3
+    assert "unknown node 'ghost'" in errors[0]
+    assert "unknown edge 'ghost'" in errors[1]
+    assert "unsupported op" in errors[2]
+
+
+def test_set_input_and_diff():
+    workflow = _workflow()
+    patched, errors = apply_patch(
+        workflow, [{"op": "set_input", "node": "agent", "input": "systemMessage", "value": "yo"}]
+    )
+    assert errors == []
+    diff = diff_workflows(workflow, patched)
+    assert diff["nodes_changed"] == ["agent"]
+    assert diff["delta_bytes"] > 0
+    assert diff_workflows(workflow, workflow)["delta_bytes"] == 0
@@ -0,0 +1,76 @@
+"""Tests for api.resilience retry decisions and the circuit breaker."""
+
+import pytest
+
+from mcp_flowise_enhanced.api.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+    RetryPolicy,
+)
+
+
+def _resilience(threshold: int = 2, reset: float = 60.0) -> Resilience:
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.5, backoff_max=4.0)
+    return Resilience(policy, CircuitBreaker(failure_threshold=threshold, reset_timeout=reset))
+
+
+def test_retries_only_what_is_safe():
+    resilience = _resilience()
+    assert resilience.retry_delay("GET", 1, status=503) is not None
+    assert resilience.retry_delay("GET", 1, status=404) is None
+    assert resilience.retry_delay("POST", 1, status=503) is None
+    assert resilience.retry_delay("POST", 1, connect_error=True) is not None
+    assert resilience.retry_delay("GET", 3, status=503) is None
+    assert resilience.metrics()["retries"] == 2
+
+
+def test_backoff_is_bounded_and_honours_retry_after():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=4.0)
+    assert all(0 <= policy.backoff(attempt) <= 4.0 for attempt in range(1, 10))
+    assert policy.backoff(1, retry_after="2") == 2.0
+    assert policy.backoff(1, retry_after="120") == 4.0
+    assert 0 <= policy.backoff(1, retry_after="soon") <= 0.5
+
+
+def test_circuit_opens_after_consecutive_failures():
+    resilience = _resilience(threshold=2)
+    resilience.before_request()
+    resilience.after_response(503)
+    resilience.before_request()
+    resilience.after_error()
+    assert resilience.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        resilience.before_request()
+    assert resilience.metrics()["short_circuited"] == 1
+
+
+def test_half_open_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.metrics()["times_opened"] == 1
+
+
+def test_zero_threshold_disables_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.CLOSED
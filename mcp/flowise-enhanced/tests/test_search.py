@@ -0,0 +1,72 @@
+"""Tests for nodes.search.NodeSearchIndex ranking and fuzzy matching."""
+
+from mcp_flowise_enhanced.nodes.search import NodeSearchIndex, tokenize
+
+SCHEMAS = [
+    {
+        "name": "chatOllama",
+        "label": "ChatOllama",
+        "category": "Chat Models",
+        "description": "Chat completion using open-source LLM on Ollama",
+    },
+    {
+        "name": "chatOpenAI",
+        "label": "ChatOpenAI",
+        "category": "Chat Models",
+        "description": "Wrapper around OpenAI large language models that use the Chat endpoint",
+    },
+    {
+        "name": "ollamaEmbedding",
+        "label": "Ollama Embeddings",
+        "category": "Embeddings",
+        "description": "Generate embeddings for a given text using open source model on Ollama",
+    },
+    {
+        "name": "bufferMemory",
+        "label": "Buffer Memory",
+        "category": "Memory",
+        "description": "Retrieve chat messages stored in database",
+    },
+]
+
+
+def _names(results) -> list[str]:
+    return [schema["name"] for schema, _ in results]
+
+
+def test_tokenize_splits_camel_case():
+    assert tokenize("chatOllama") == ["chat", "ollama", "chatollama"]
+
+
+def test_name_hits_rank_above_description_hits():
+    names = _names(NodeSearchIndex(SCHEMAS).search("open"))
+    assert names[0] == "chatOpenAI"
+    assert set(names[1:]) == {"chatOllama", "ollamaEmbedding"}
+
+
+def test_more_matching_terms_rank_higher():
+    names = _names(NodeSearchIndex(SCHEMAS).search("chat ollama"))
+    assert names[0] == "chatOllama"
+
+
+def test_prefix_match():
+    results = NodeSearchIndex(SCHEMAS).search("embed")
+    assert _names(results) == ["ollamaEmbedding"]
+
+
+def test_typo_match_scores_below_exact():
+    index = NodeSearchIndex(SCHEMAS)
+    typo = index.search("bufer")
+    exact = index.search("buffer")
+    assert _names(typo) == ["bufferMemory"]
+    assert typo[0][1] < exact[0][1]
+
+
+def test_short_tokens_are_not_typo_matched():
+    assert NodeSearchIndex(SCHEMAS).search("xat") == []
+
+
+def test_limit_and_no_match():
+    index = NodeSearchIndex(SCHEMAS)
+    assert len(index.search("chat", limit=1)) == 1
+    assert index.search("nothinglikeit") == []
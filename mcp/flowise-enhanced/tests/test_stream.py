@@ -0,0 +1,82 @@
+"""Tests for converters.stream ExportData reading, writing and chunking."""
+
+import io
+import json
+
+import pytest
+
+from mcp_flowise_enhanced.converters.stream import (
+    EXPORT_ARRAY_NAMES,
+    ExportDataWriter,
+    chunk_exportdata,
+    iter_exportdata,
+    iter_exportdata_dict,
+)
+
+ITEMS = [
+    ("ChatFlow", {"id": "cf-1", "name": "Agent [v2]", "flowData": "{\"nodes\": []}"}),
+    ("ChatFlow", {"id": "cf-2", "name": "Déjà vu ☃", "deployed": False}),
+    ("ChatMessage", {"id": "m-1", "content": "a \"quoted\" } brace, and ] bracket"}),
+    ("Tool", {"id": "t-1", "schema": [1, 2.5, None, True]}),
+]
+
+
+def _write(items) -> str:
+    out = io.StringIO()
+    with ExportDataWriter(out) as writer:
+        writer.add_all(items)
+    return out.getvalue()
+
+
+def test_writer_emits_every_array():
+    exportdata = json.loads(_write(ITEMS))
+    assert tuple(exportdata) == EXPORT_ARRAY_NAMES
+    assert [item["id"] for item in exportdata["ChatFlow"]] == ["cf-1", "cf-2"]
+    assert exportdata["AgentFlow"] == []
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 1 << 16])
+def test_round_trip(read_size):
+    text = _write(ITEMS)
+    assert list(iter_exportdata(io.StringIO(text), read_size=read_size)) == ITEMS
+
+
+def test_reader_matches_dict_iteration():
+    exportdata = {"ChatFlow": [{"id": "a"}], "Tool": [], "ChatMessage": [{"id": "b"}, {"id": "c"}]}
+    text = json.dumps(exportdata, indent=2)
+    assert list(iter_exportdata(io.StringIO(text), read_size=3)) == list(
+        iter_exportdata_dict(exportdata)
+    )
+
+
+def test_reader_handles_empty_object():
+    assert list(iter_exportdata(io.StringIO(" {} "))) == []
+
+
+def test_reader_rejects_non_exportdata():
+    with pytest.raises(ValueError):
+        list(iter_exportdata(io.StringIO('{"ChatFlow": {"id": 1}}')))
+
+
+def test_writer_discards_output_on_error():
+    out = io.StringIO()
+    with pytest.raises(RuntimeError):
+        with ExportDataWriter(out) as writer:
+            writer.add("ChatFlow", {"id": "cf-1"})
+            raise RuntimeError("boom")
+    assert out.getvalue() == ""
+
+
+def test_chunks_are_bounded_and_ordered():
+    items = [("ChatMessage", {"id": str(i), "content": "x" * 20}) for i in range(10)]
+    chunks = list(chunk_exportdata(items, max_bytes=100, max_items=3))
+    assert all(len(chunk["ChatMessage"]) <= 3 for chunk in chunks)
+    assert all(len(json.dumps(chunk["ChatMessage"])) <= 100 for chunk in chunks)
+    rejoined = [item for chunk in chunks for item in iter_exportdata_dict(chunk)]
+    assert rejoined == items
+
+
+def test_oversized_item_gets_its_own_chunk():
+    items = [("ChatFlow", {"id": "big", "flowData": "x" * 500}), ("Tool", {"id": "t"})]
+    chunks = list(chunk_exportdata(items, max_bytes=100))
+    assert [sum(len(v) for v in chunk.values()) for chunk in chunks] == [1, 1]
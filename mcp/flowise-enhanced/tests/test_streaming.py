@@ -0,0 +1,63 @@
+"""Tests for api.streaming SSE parsing and prediction aggregation."""
+
+import pytest
+
+from mcp_flowise_enhanced.api.streaming import (
+    PredictionAggregator,
+    events_from_response,
+    parse_sse_line,
+)
+
+
+@pytest.mark.parametrize(
+    "line, event",
+    [
+        ('data:{"event":"token","data":"Hel"}', {"event": "token", "data": "Hel"}),
+        ('data: {"event":"end","data":"[DONE]"}\r', {"event": "end", "data": "[DONE]"}),
+        ("data:  world", {"event": "token", "data": " world"}),
+        ('data: "Hel"', {"event": "token", "data": "Hel"}),
+        ("data: 42", {"event": "token", "data": "42"}),
+    ],
+)
+def test_parse_data_lines(line, event):
+    assert parse_sse_line(line) == event
+
+
+@pytest.mark.parametrize("line", ["message:", "", ": keep-alive", "data:", "data: "])
+def test_non_data_lines_are_skipped(line):
+    assert parse_sse_line(line) is None
+
+
+def test_aggregator_rebuilds_the_response():
+    lines = [
+        "message:",
+        'data:{"event":"start","data":""}',
+        'data:{"event":"token","data":"Hello"}',
+        'data:{"event":"token","data":" world"}',
+        'data:{"event":"usedTools","data":[{"tool":"calculator"}]}',
+        'data:{"event":"end","data":"[DONE]"}',
+    ]
+    aggregator = PredictionAggregator()
+    tokens = [aggregator.add(event) for event in map(parse_sse_line, lines) if event]
+    assert [t for t in tokens if t is not None] == ["Hello", " world"]
+    assert aggregator.done
+    assert aggregator.to_response() == {
+        "text": "Hello world",
+        "usedTools": [{"tool": "calculator"}],
+    }
+
+
+def test_buffered_response_round_trips():
+    response = {"text": "Hi", "sourceDocuments": [{"pageContent": "doc"}]}
+    aggregator = PredictionAggregator()
+    for event in events_from_response(response):
+        aggregator.add(event)
+    assert aggregator.done
+    assert aggregator.to_response() == response
+
+
+def test_error_event_is_reported():
+    aggregator = PredictionAggregator()
+    aggregator.add({"event": "token", "data": "partial"})
+    aggregator.add({"event": "error", "data": {"message": "boom"}})
+    assert aggregator.to_response() == {"text": "partial", "error": '{"message": "boom"}'}
@@ -0,0 +1,151 @@
+"""Tests for validators.local graph, handle and schema checks."""
+
+from mcp_flowise_enhanced.nodes.builder import create_edge, create_node_instance
+from mcp_flowise_enhanced.nodes.compat import CompatibilityGraph
+from mcp_flowise_enhanced.validators.local import validate_workflow_local
+
+SCHEMAS = {
+    "chatOllama": {
+        "name": "chatOllama",
+        "label": "ChatOllama",
+        "version": 2,
+        "baseClasses": ["ChatOllama", "BaseChatModel"],
+        "inputs": [{"name": "modelName", "type": "string"}],
+    },
+    "calculator": {
+        "name": "calculator",
+        "label": "Calculator",
+        "version": 1,
+        "baseClasses": ["Calculator", "Tool"],
+        "inputs": [],
+    },
+    "toolAgent": {
+        "name": "toolAgent",
+        "label": "Tool Agent",
+        "version": 1,
+        "baseClasses": ["AgentExecutor"],
+        "inputs": [
+            {"name": "tools", "type": "Tool", "list": True},
+            {"name": "model", "type": "BaseChatModel"},
+        ],
+    },
+}
+
+
+class _Schemas:
+    """The slice of NodeSchemaCache the validator uses, over SCHEMAS."""
+
+    def get_compatibility_graph(self) -> CompatibilityGraph:
+        return CompatibilityGraph(list(SCHEMAS.values()))
+
+    def get_cached_schema(self, name: str) -> dict | None:
+        return SCHEMAS.get(name)
+
+
+def _chatflow() -> dict:
+    llm = create_node_instance(SCHEMAS["chatOllama"], "llm", inputs={"modelName": "qwen"})
+    calc = create_node_instance(SCHEMAS["calculator"], "calc")
+    agent = create_node_instance(SCHEMAS["toolAgent"], "agent")
+    return {
+        "nodes": [llm, calc, agent],
+        "edges": [create_edge(llm, agent, "model"), create_edge(calc, agent, "tools")],
+    }
+
+
+def _plain(node_id: str, node_type: str = "customNode", **extra) -> dict:
+    return {"id": node_id, "type": node_type, "position": {"x": 0, "y": 0}, "data": {}, **extra}
+
+
+def _link(source: str, target: str) -> dict:
+    return {"id": f"{source}-{target}", "source": source, "target": target}
+
+
+def test_valid_chatflow():
+    result = validate_workflow_local(_chatflow(), schemas=_Schemas())
+    assert result.valid, result.local_errors
+    assert result.local_warnings == []
+    assert result.flow_type == "CHATFLOW"
+
+
+def test_cycle_is_reported():
+    workflow = {
+        "nodes": [_plain("a"), _plain("b"), _plain("c"), _plain("d")],
+        "edges": [_link("a", "b"), _link("b", "c"), _link("c", "b"), _link("c", "d")],
+    }
+    result = validate_workflow_local(workflow)
+    assert result.local_errors == ["Cycle detected among nodes: b, c"]
+    assert result.summary["cycle_nodes"] == 2
+
+
+def test_disconnected_chatflow_nodes_warn():
+    workflow = {
+        "nodes": [_plain("a"), _plain("b"), _plain("c")],
+        "edges": [_link("a", "b")],
+    }
+    result = validate_workflow_local(workflow)
+    assert result.valid
+    assert result.local_warnings == ["Nodes not connected to the main flow: c"]
+
+
+def test_agentflow_reachability_from_start():
+    start = _plain("start", "agentFlow", data={"name": "startAgentflow"})
+    workflow = {
+        "nodes": [start, _plain("llm", "agentFlow"), _plain("orphan", "agentFlow")],
+        "edges": [_link("start", "llm"), _link("orphan", "llm")],
+    }
+    result = validate_workflow_local(workflow)
+    assert result.flow_type == "AGENTFLOW"
+    assert result.local_warnings == ["Nodes unreachable from the Start node: orphan"]
+
+
+def test_unknown_handles_are_errors():
+    workflow = _chatflow()
+    workflow["edges"][0]["sourceHandle"] = "llm-output-missing-X"
+    workflow["edges"][1]["targetHandle"] = "agent-input-memory-BaseMemory"
+    errors = validate_workflow_local(workflow).local_errors
+    assert len(errors) == 2
+    assert "unknown sourceHandle 'llm-output-missing-X'" in errors[0]
+    assert "unknown targetHandle 'agent-input-memory-BaseMemory'" in errors[1]
+
+
+def test_fan_in_limits():
+    workflow = _chatflow()
+    llm2 = create_node_instance(SCHEMAS["chatOllama"], "llm2", inputs={"modelName": "qwen"})
+    calc2 = create_node_instance(SCHEMAS["calculator"], "calc2")
+    agent = workflow["nodes"][2]
+    workflow["nodes"] += [llm2, calc2]
+    workflow["edges"] += [create_edge(llm2, agent, "model"), create_edge(calc2, agent, "tools")]
+
+    errors = validate_workflow_local(workflow, max_fan_in=1).local_errors
+    model, tools = (anchor["id"] for anchor in sorted(
+        agent["data"]["inputAnchors"], key=lambda a: a["name"]
+    ))
+    assert errors == [
+        f"Input '{model}' on node 'agent' accepts one connection but has 2",
+        f"Input '{tools}' on node 'agent' has 2 connections (limit 1)",
+    ]
+
+
+def test_schema_checks():
+    workflow = _chatflow()
+    llm, calc, agent = workflow["nodes"]
+    llm["data"]["inputs"]["modelName"] = ""
+    llm["data"]["version"] = 1
+    workflow["edges"] = [create_edge(calc, agent, "tools")]
+    workflow["edges"][0]["targetHandle"] = agent["data"]["inputAnchors"][1]["id"]
+
+    result = validate_workflow_local(workflow, schemas=_Schemas())
+    assert result.local_errors == [
+        "Node 'llm' is missing required input 'modelName'",
+        "Edge '" + workflow["edges"][0]["id"] + "' connects incompatible anchors: "
+        "calc.calculator (calculator) -> agent.model (toolAgent)",
+        "Node 'agent' requires a connection to input 'tools'",
+    ]
+    assert "Node 'llm' uses chatOllama version 1; the server has version 2" in result.local_warnings
+
+
+def test_unknown_node_type():
+    workflow = _chatflow()
+    workflow["nodes"][1]["data"]["name"] = "retired"
+    errors = validate_workflow_local(workflow, schemas=_Schemas()).local_errors
+    assert errors == ["Node 'calc' uses unknown node type 'retired'"]
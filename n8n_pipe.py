@@ -2,16 +2,20 @@
 title: n8n Pipe Function
 author: Cole Medin
 author_url: https://www.youtube.com/@ColeMedin
-version: 0.1.0
+version: 0.2.0
 
 This module defines a Pipe class that utilizes N8N for an Agent
 """
 
-from typing import Optional, Callable, Awaitable
+from typing import Optional, Callable, Awaitable, AsyncGenerator
 from pydantic import BaseModel, Field
-import os
+import asyncio
+import hashlib
+import json
 import time
-import requests
+import weakref
+from collections import OrderedDict
+import aiohttp
 
 def extract_event_info(event_emitter) -> tuple[Optional[str], Optional[str]]:
     if not event_emitter or not event_emitter.__closure__:
@@ -23,6 +27,178 @@ def extract_event_info(event_emitter) -> tuple[Optional[str], Optional[str]]:
             return chat_id, message_id
     return None, None
 
+# Chunk types sent by n8n webhooks set to respond with "Streaming"
+STREAM_EVENT_TYPES = {"begin", "item", "end", "error"}
+
+
+def parse_stream_event(line: str) -> Optional[dict]:
+    # One NDJSON line (or SSE data payload) from a streaming n8n webhook
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(event, dict) and event.get("type") in STREAM_EVENT_TYPES:
+        return event
+    return None
+
+
+def stream_event_text(event: dict) -> str:
+    if event["type"] == "error":
+        raise Exception(f"n8n workflow error: {event.get('content', '')}")
+    if event["type"] == "item":
+        content = event.get("content")
+        return content if isinstance(content, str) else ""
+    return ""
+
+class MemoryCache:
+    # In-process LRU cache with per-entry expiry
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: str, ttl: float):
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+# Close tasks for resources left behind on another event loop
+_closing: set = set()
+
+
+def close_later(close: Callable[[], Awaitable[None]], owner: asyncio.AbstractEventLoop):
+    # Close a resource bound to another event loop. While that loop is
+    # running the close runs on it; a stopped or closed loop would never pick
+    # the coroutine up, so the close is awaited on the current loop instead
+    async def quietly():
+        try:
+            await close()
+        except Exception:
+            pass
+
+    if owner.is_running():
+        asyncio.run_coroutine_threadsafe(quietly(), owner)
+    else:
+        task = asyncio.get_running_loop().create_task(quietly())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+
+class RedisCache:
+    # Shared cache in Redis/Valkey: values expire by TTL, and a sorted set of
+    # last-use times evicts the least recently used keys beyond max_entries
+    def __init__(self, url: str, max_entries: int, prefix: str = "n8n_pipe:"):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        # redis.asyncio connections belong to the loop that opened them
+        self.loop = asyncio.get_running_loop()
+        self.max_entries = max_entries
+        self.prefix = prefix
+        self.index = f"{prefix}lru"
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            await self.client.zrem(self.index, key)
+            return None
+        await self.client.zadd(self.index, {key: time.time()})
+        return value.decode("utf-8")
+
+    async def set(self, key: str, value: str, ttl: float):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(self.prefix + key, value, ex=max(int(ttl), 1))
+            pipe.zadd(self.index, {key: time.time()})
+            pipe.zcard(self.index)
+            size = (await pipe.execute())[-1]
+        if size > self.max_entries:
+            evicted = await self.client.zpopmin(self.index, size - self.max_entries)
+            if evicted:
+                await self.client.delete(
+                    *[self.prefix + member.decode("utf-8") for member, _ in evicted]
+                )
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.split()).casefold()
+
+
+class RequestStatus:
+    # Status state for one pipe call, so concurrent chats never throttle
+    # each other's updates
+    def __init__(
+        self,
+        valves,
+        event_emitter: Optional[Callable[[dict], Awaitable[None]]],
+    ):
+        self.valves = valves
+        self.event_emitter = event_emitter
+        self.started = time.monotonic()
+        self.last_emit_time = 0.0
+        self.stage = "Calling N8N Workflow"
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    async def emit(self, level: str, message: str, done: bool):
+        current_time = time.monotonic()
+        if (
+            self.event_emitter
+            and self.valves.enable_status_indicator
+            and (
+                current_time - self.last_emit_time >= self.valves.emit_interval or done
+            )
+        ):
+            await self.event_emitter(
+                {
+                    "type": "status",
+                    "data": {
+                        "status": "complete" if done else "in_progress",
+                        "level": level,
+                        "description": message,
+                        "done": done,
+                    },
+                }
+            )
+            self.last_emit_time = current_time
+
+    async def heartbeat(self):
+        while True:
+            await asyncio.sleep(self.valves.emit_interval)
+            elapsed = time.monotonic() - self.started
+            await self.emit("info", f"{self.stage}... ({elapsed:.0f}s)", False)
+
+    def start_heartbeat(self):
+        if (
+            self.event_emitter
+            and self.valves.enable_status_indicator
+            and self.valves.emit_interval > 0
+        ):
+            self._heartbeat = asyncio.create_task(self.heartbeat())
+
+    async def stop_heartbeat(self):
+        if self._heartbeat is None:
+            return
+        self._heartbeat.cancel()
+        try:
+            await self._heartbeat
+        except (asyncio.CancelledError, Exception):
+            # A failing emitter only ends the heartbeat, never the reply
+            pass
+        self._heartbeat = None
+
 class Pipe:
     class Valves(BaseModel):
         n8n_url: str = Field(
@@ -37,42 +213,316 @@ class Pipe:
         enable_status_indicator: bool = Field(
             default=True, description="Enable or disable status indicator emissions"
         )
+        connect_timeout: float = Field(
+            default=10.0, description="Seconds to wait for a connection to n8n"
+        )
+        read_timeout: float = Field(
+            default=300.0,
+            description="Seconds to wait for data from n8n before giving up (0 = no limit)",
+        )
+        max_concurrent_requests: int = Field(
+            default=8, description="Maximum n8n calls in flight at once from this pipe"
+        )
+        enable_streaming: bool = Field(
+            default=True,
+            description="Pass streamed n8n output through as it arrives (buffered workflows still work)",
+        )
+        enable_cache: bool = Field(
+            default=False,
+            description="Reuse answers to repeated questions instead of re-running the workflow",
+        )
+        cache_backend: str = Field(
+            default="memory", description="Cache backend: 'memory' or 'redis'"
+        )
+        cache_redis_url: str = Field(
+            default="redis://redis:6379/0",
+            description="Redis/Valkey URL for the 'redis' cache backend",
+        )
+        cache_ttl: float = Field(
+            default=3600.0, description="Seconds a cached answer stays valid"
+        )
+        cache_max_entries: int = Field(
+            default=1000, description="Cached answers kept before evicting the least recently used"
+        )
+        cache_per_session: bool = Field(
+            default=False,
+            description="Only reuse answers within the same chat (for workflows with memory)",
+        )
 
     def __init__(self):
         self.type = "pipe"
         self.id = "n8n_pipe"
         self.name = "N8N Pipe"
         self.valves = self.Valves()
-        self.last_emit_time = 0
-        pass
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_limit = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cache = None
+        self._cache_config: Optional[tuple] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.coalesced_requests = 0
+
+    def get_session(self) -> aiohttp.ClientSession:
+        # One pooled session per pipe and event loop, so keep-alive
+        # connections to n8n are reused across chats
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                # Left on a previous loop: release its pooled connections
+                close_later(self._session.close, self._loop)
+            self._loop = loop
+            self._semaphore = None
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=max(self.valves.max_concurrent_requests, 1)
+                )
+            )
+        return self._session
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        # Rebuilt when the valve changes; calls already waiting keep the old one
+        limit = max(self.valves.max_concurrent_requests, 1)
+        if self._semaphore is None or self._semaphore_limit != limit:
+            self._semaphore = asyncio.Semaphore(limit)
+            self._semaphore_limit = limit
+        return self._semaphore
+
+    def get_cache(self):
+        # Rebuilt when the cache valves change, and for Redis when the event
+        # loop changes, since its connections cannot be used from another loop
+        config = (
+            self.valves.cache_backend,
+            self.valves.cache_redis_url,
+            self.valves.cache_max_entries,
+        )
+        stale_loop = (
+            isinstance(self._cache, RedisCache)
+            and self._cache.loop is not asyncio.get_running_loop()
+        )
+        if self._cache is None or self._cache_config != config or stale_loop:
+            if isinstance(self._cache, RedisCache):
+                close_later(self._cache.close, self._cache.loop)
+            max_entries = max(self.valves.cache_max_entries, 1)
+            if self.valves.cache_backend == "redis":
+                self._cache = RedisCache(self.valves.cache_redis_url, max_entries)
+            else:
+                self._cache = MemoryCache(max_entries)
+            self._cache_config = config
+        return self._cache
+
+    def cache_key(self, question, chat_id: Optional[str]) -> Optional[str]:
+        if not self.valves.enable_cache or not isinstance(question, str):
+            return None
+        parts = [
+            self.valves.n8n_url,
+            self.valves.input_field,
+            self.valves.response_field,
+            f"{chat_id}" if self.valves.cache_per_session else "",
+            normalize_question(question),
+        ]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    async def cache_get(self, key: str) -> Optional[str]:
+        # A cache outage must never break the chat: treat it as a miss
+        try:
+            value = await self.get_cache().get(key)
+        except Exception:
+            value = None
+        if value is None:
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
+        return value
+
+    async def cache_set(self, key: str, value: str):
+        try:
+            await self.get_cache().set(key, value, self.valves.cache_ttl)
+        except Exception:
+            pass
+
+    def cache_stats(self) -> str:
+        return f"cache: {self.cache_hits} hits, {self.cache_misses} misses"
 
-    async def emit_status(
+    def complete_message(self, shared: bool = False) -> str:
+        details = []
+        if shared:
+            details.append(
+                f"shared an identical request; {self.coalesced_requests} coalesced so far"
+            )
+        if self.valves.enable_cache:
+            details.append(self.cache_stats())
+        return f"Complete ({'; '.join(details)})" if details else "Complete"
+
+    def flight_key(self, question, chat_id: Optional[str]) -> Optional[str]:
+        # Identical questions in the same chat share one in-flight n8n call
+        if not isinstance(question, str):
+            return None
+        parts = [self.valves.n8n_url, f"{chat_id}", normalize_question(question)]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def start_flight(self, key: Optional[str]) -> Optional[asyncio.Future]:
+        if not key:
+            return None
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def end_flight(
         self,
-        __event_emitter__: Callable[[dict], Awaitable[None]],
-        level: str,
-        message: str,
-        done: bool,
+        key: Optional[str],
+        future: Optional[asyncio.Future],
+        result: Optional[str] = None,
+        error: Optional[BaseException] = None,
     ):
-        current_time = time.time()
-        if (
-            __event_emitter__
-            and self.valves.enable_status_indicator
-            and (
-                current_time - self.last_emit_time >= self.valves.emit_interval or done
+        # Only unregister our own flight: a later request may already have
+        # started a new one under the same key
+        if future is None:
+            return
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+            # Mark retrieved so an unjoined failure does not log a warning
+            future.exception()
+        else:
+            future.set_result(result)
+
+    async def join_flight(self, future: asyncio.Future, status: RequestStatus) -> str:
+        self.coalesced_requests += 1
+        status.stage = "Waiting for an identical request"
+        status.start_heartbeat()
+        try:
+            # Shielded: a follower going away must not cancel the shared call
+            return await asyncio.wait_for(
+                asyncio.shield(future), self.valves.read_timeout or None
             )
-        ):
-            await __event_emitter__(
-                {
-                    "type": "status",
-                    "data": {
-                        "status": "complete" if done else "in_progress",
-                        "level": level,
-                        "description": message,
-                        "done": done,
-                    },
-                }
+        except asyncio.TimeoutError:
+            raise Exception(
+                f"Identical request did not finish within {self.valves.read_timeout:g}s"
             )
-            self.last_emit_time = current_time
+        finally:
+            await status.stop_heartbeat()
+
+    async def iter_n8n(
+        self, payload: dict, status: Optional[RequestStatus] = None
+    ) -> AsyncGenerator[str, None]:
+        # Yields text as n8n sends it: item by item for streaming webhooks
+        # (NDJSON or SSE), or the whole response_field for buffered ones
+        headers = {
+            "Authorization": f"Bearer {self.valves.n8n_bearer_token}",
+            "Content-Type": "application/json",
+        }
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=self.valves.connect_timeout,
+            sock_read=self.valves.read_timeout or None,
+        )
+        session = self.get_session()
+        semaphore = self.get_semaphore()
+        if status and semaphore.locked():
+            status.stage = "Waiting for a free n8n slot"
+        async with semaphore:
+            if status:
+                status.stage = "Running N8N Workflow"
+            try:
+                async with session.post(
+                    self.valves.n8n_url, json=payload, headers=headers, timeout=timeout
+                ) as response:
+                    if response.status != 200:
+                        raise Exception(
+                            f"Error: {response.status} - {await response.text()}"
+                        )
+                    if status:
+                        status.stage = "Receiving n8n response"
+
+                    if "text/event-stream" in response.headers.get("Content-Type", ""):
+                        async for raw in response.content:
+                            # Keep token whitespace: drop only the line end and
+                            # the one optional space after "data:"
+                            line = raw.decode("utf-8").rstrip("\r\n")
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[5:]
+                            if data.startswith(" "):
+                                data = data[1:]
+                            if data == "[DONE]":
+                                break
+                            event = parse_stream_event(data)
+                            text = stream_event_text(event) if event else data
+                            if text:
+                                yield text
+                        return
+
+                    # NDJSON if the first line is a stream event, else buffered JSON
+                    first = await response.content.readline()
+                    event = parse_stream_event(first.decode("utf-8").strip())
+                    if event is None:
+                        body = first + await response.read()
+                        yield json.loads(body)[self.valves.response_field]
+                        return
+
+                    text = stream_event_text(event)
+                    if text:
+                        yield text
+                    async for raw in response.content:
+                        line = raw.decode("utf-8").strip()
+                        event = parse_stream_event(line) if line else None
+                        if event is not None:
+                            text = stream_event_text(event)
+                            if text:
+                                yield text
+            except asyncio.TimeoutError:
+                raise Exception(
+                    f"n8n request timed out (connect {self.valves.connect_timeout:g}s, "
+                    f"read {self.valves.read_timeout:g}s)"
+                )
+
+    async def call_n8n(
+        self, payload: dict, status: Optional[RequestStatus] = None
+    ) -> str:
+        return "".join([text async for text in self.iter_n8n(payload, status)])
+
+    async def stream_reply(
+        self,
+        body: dict,
+        payload: dict,
+        status: RequestStatus,
+        cache_key: Optional[str] = None,
+        flight_key: Optional[str] = None,
+        flight: Optional[asyncio.Future] = None,
+    ) -> AsyncGenerator[str, None]:
+        parts = []
+        status.start_heartbeat()
+        try:
+            async for text in self.iter_n8n(payload, status):
+                parts.append(text)
+                yield text
+            n8n_response = "".join(parts)
+            self.end_flight(flight_key, flight, result=n8n_response)
+        except Exception as e:
+            self.end_flight(flight_key, flight, error=e)
+            await status.stop_heartbeat()
+            await status.emit(
+                "error", f"Error during sequence execution: {str(e)}", True
+            )
+            yield f"Error during sequence execution: {str(e)}"
+            return
+        finally:
+            # Closed before the end: release requests waiting on this one
+            self.end_flight(
+                flight_key, flight, error=Exception("The original request was cancelled")
+            )
+            await status.stop_heartbeat()
+
+        body["messages"].append({"role": "assistant", "content": n8n_response})
+        if cache_key:
+            await self.cache_set(cache_key, n8n_response)
+        await status.emit("info", self.complete_message(), True)
 
     async def pipe(
         self,
@@ -81,9 +531,8 @@ class Pipe:
         __event_emitter__: Callable[[dict], Awaitable[None]] = None,
         __event_call__: Callable[[dict], Awaitable[dict]] = None,
     ) -> Optional[dict]:
-        await self.emit_status(
-            __event_emitter__, "info", "/Calling N8N Workflow...", False
-        )
+        status = RequestStatus(self.valves, __event_emitter__)
+        await status.emit("info", "/Calling N8N Workflow...", False)
         chat_id, _ = extract_event_info(__event_emitter__)
         messages = body.get("messages", [])
 
@@ -92,38 +541,77 @@ class Pipe:
             question = messages[-1]["content"]
             try:
                 # Invoke N8N workflow
-                headers = {
-                    "Authorization": f"Bearer {self.valves.n8n_bearer_token}",
-                    "Content-Type": "application/json",
-                }
                 payload = {"sessionId": f"{chat_id}"}
                 payload[self.valves.input_field] = question
-                response = requests.post(
-                    self.valves.n8n_url, json=payload, headers=headers
-                )
-                if response.status_code == 200:
-                    n8n_response = response.json()[self.valves.response_field]
-                else:
-                    raise Exception(f"Error: {response.status_code} - {response.text}")
+
+                cache_key = self.cache_key(question, chat_id)
+                if cache_key:
+                    cached = await self.cache_get(cache_key)
+                    if cached is not None:
+                        body["messages"].append({"role": "assistant", "content": cached})
+                        await status.emit(
+                            "info", f"Answered from cache ({self.cache_stats()})", True
+                        )
+                        return cached
+
+                flight_key = self.flight_key(question, chat_id)
+                shared = self._inflight.get(flight_key) if flight_key else None
+                if shared is not None:
+                    n8n_response = await self.join_flight(shared, status)
+                    body["messages"].append({"role": "assistant", "content": n8n_response})
+                    await status.emit("info", self.complete_message(shared=True), True)
+                    return n8n_response
+
+                # Registered before any await so an identical request arriving
+                # meanwhile joins this call instead of starting its own
+                flight = self.start_flight(flight_key)
+                if self.valves.enable_streaming and body.get("stream"):
+                    # Open WebUI relays each yielded chunk to the chat as it arrives
+                    reply = self.stream_reply(
+                        body, payload, status, cache_key, flight_key, flight
+                    )
+                    # The generator's finally only runs once it is iterated;
+                    # release the flight too if it is dropped unconsumed
+                    weakref.finalize(
+                        reply,
+                        self.end_flight,
+                        flight_key,
+                        flight,
+                        None,
+                        Exception("The original request was cancelled"),
+                    )
+                    return reply
+                status.start_heartbeat()
+                try:
+                    n8n_response = await self.call_n8n(payload, status)
+                except asyncio.CancelledError:
+                    # Only this request was cancelled; waiters get a plain error
+                    self.end_flight(
+                        flight_key,
+                        flight,
+                        error=Exception("The original request was cancelled"),
+                    )
+                    raise
+                except Exception as e:
+                    self.end_flight(flight_key, flight, error=e)
+                    raise
+                finally:
+                    await status.stop_heartbeat()
+                self.end_flight(flight_key, flight, result=n8n_response)
+                if cache_key:
+                    await self.cache_set(cache_key, n8n_response)
 
                 # Set assitant message with chain reply
                 body["messages"].append({"role": "assistant", "content": n8n_response})
             except Exception as e:
-                await self.emit_status(
-                    __event_emitter__,
-                    "error",
-                    f"Error during sequence execution: {str(e)}",
-                    True,
+                await status.emit(
+                    "error", f"Error during sequence execution: {str(e)}", True
                 )
                 return {"error": str(e)}
         # If no message is available alert user
         else:
-            await self.emit_status(
-                __event_emitter__,
-                "error",
-                "No messages found in the request body",
-                True,
-            )
+            n8n_response = "No messages found in the request body"
+            await status.emit("error", "No messages found in the request body", True)
             body["messages"].append(
                 {
                     "role": "assistant",
@@ -131,5 +619,5 @@ class Pipe:
                 }
             )
 
-        await self.emit_status(__event_emitter__, "info", "Complete", True)
+        await status.emit("info", self.complete_message(), True)
         return n8n_response
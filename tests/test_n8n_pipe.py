@@ -0,0 +1,114 @@
+"""Tests for n8n_pipe request coalescing (in-flight sharing)."""
+
+import asyncio
+import gc
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from n8n_pipe import Pipe  # noqa: E402
+
+
+def _pipe(delay: float = 0.05) -> tuple[Pipe, list]:
+    pipe = Pipe()
+    pipe.valves.enable_cache = False
+    calls: list = []
+
+    async def iter_n8n(payload, status=None):
+        calls.append(payload)
+        await asyncio.sleep(delay)
+        yield "echo: "
+        yield payload[pipe.valves.input_field]
+
+    pipe.iter_n8n = iter_n8n
+    return pipe, calls
+
+
+def _body(question: str, stream: bool = False) -> dict:
+    return {"messages": [{"role": "user", "content": question}], "stream": stream}
+
+
+def test_identical_requests_share_one_call():
+    async def main():
+        pipe, calls = _pipe()
+        replies = await asyncio.gather(
+            pipe.pipe(_body("Same  question")),
+            pipe.pipe(_body("same question")),
+            pipe.pipe(_body("other")),
+        )
+        return pipe, calls, replies
+
+    pipe, calls, replies = asyncio.run(main())
+    assert replies == ["echo: Same  question", "echo: Same  question", "echo: other"]
+    assert len(calls) == 2
+    assert pipe.coalesced_requests == 1
+    assert pipe._inflight == {}
+
+
+def test_streaming_leader_is_registered_before_iteration():
+    async def main():
+        pipe, calls = _pipe()
+        pipe.valves.enable_streaming = True
+        leader = await pipe.pipe(_body("q", stream=True))
+        follower = asyncio.create_task(pipe.pipe(_body("q", stream=True)))
+        await asyncio.sleep(0)
+        chunks = [chunk async for chunk in leader]
+        return calls, chunks, await follower
+
+    calls, chunks, shared = asyncio.run(main())
+    assert len(calls) == 1
+    assert chunks == ["echo: ", "q"]
+    assert shared == "echo: q"
+
+
+def test_dropped_stream_releases_followers():
+    async def main():
+        pipe, calls = _pipe()
+        pipe.valves.enable_streaming = True
+        leader = await pipe.pipe(_body("q", stream=True))
+        follower = asyncio.create_task(pipe.pipe(_body("q")))
+        await asyncio.sleep(0)
+        del leader
+        gc.collect()
+        return pipe, calls, await follower
+
+    pipe, calls, reply = asyncio.run(main())
+    assert calls == []
+    assert reply == {"error": "The original request was cancelled"}
+    assert pipe._inflight == {}
+
+
+def test_end_flight_keeps_a_newer_flight():
+    async def main():
+        pipe, _ = _pipe()
+        old = pipe.start_flight("key")
+        new = pipe.start_flight("key")
+        pipe.end_flight("key", old, result="stale")
+        return pipe, old, new
+
+    pipe, old, new = asyncio.run(main())
+    assert old.result() == "stale"
+    assert pipe._inflight == {"key": new}
+
+
+def test_session_left_on_stopped_loop_is_closed():
+    pipe, _ = _pipe()
+
+    async def session():
+        return pipe.get_session()
+
+    old_loop = asyncio.new_event_loop()
+    try:
+        # Stopped but not closed: nothing would ever run a close scheduled on it
+        old = old_loop.run_until_complete(session())
+
+        async def main():
+            new = pipe.get_session()
+            await asyncio.sleep(0)
+            await new.close()
+
+        asyncio.run(main())
+        assert old.closed
+    finally:
+        old_loop.close()